@@ -0,0 +1,24 @@
+from django import template
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+from todoBoard.management.commands.build_assets import BUNDLES
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/bundle.html')
+def bundle(name):
+    """
+    Load a bundle built by build_assets once collectstatic put it in the manifest,
+    else its source files one by one (runserver without collectstatic, tests)
+    """
+    return {'stylesheet': name.endswith('.css'), 'urls': bundle_urls(name)}
+
+
+def bundle_urls(name) -> list:
+    path = f'bundles/{name}'
+    if path in getattr(staticfiles_storage, 'hashed_files', {}):
+        # Fingerprinted even while DEBUG is on, WhiteNoise caches those for good
+        return [staticfiles_storage.url(path, force=True)]
+    return [static(source) for source in BUNDLES[name]]
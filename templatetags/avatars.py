@@ -0,0 +1,23 @@
+from django import template
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/avatar.html')
+def avatar(profile, width, css_class='user-avatar', alt='Avatar'):
+    """
+    Render the avatar of profile displayed width CSS pixels wide, with thumbnails for 1x and 2x screens
+    """
+    return {
+        'profile': profile,
+        'width': width,
+        'css_class': css_class,
+        'alt': alt,
+        'webp': (profile.avatar_url(width, 'webp'), profile.avatar_url(width * 2, 'webp')),
+        'png': (profile.avatar_url(width), profile.avatar_url(width * 2)),
+    }
+
+
+@register.simple_tag
+def avatar_url(profile, width):
+    return profile.avatar_url(width)
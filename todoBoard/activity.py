@@ -0,0 +1,108 @@
+"""
+Task activity log.
+
+Views describe their changes with the record_* functions, which only queue TaskActivity rows in an
+in-process buffer once the change is committed. The buffer is written with bulk INSERTs after a
+request has been answered (see signals.py), as soon as ACTIVITY_FLUSH_SIZE rows are waiting or the
+oldest of them is ACTIVITY_FLUSH_INTERVAL seconds old, and once more when the process exits.
+Rows still in the buffer are lost when the process is killed.
+"""
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction, DatabaseError
+
+from .models import TaskActivity
+
+logger = logging.getLogger(__name__)
+
+# Task fields whose changes are recorded
+TRACKED_FIELDS = ('name', 'description', 'status', 'assignee', 'high_priority')
+
+
+class ActivityBuffer:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = []
+        # time.monotonic() of the oldest buffered entry
+        self.oldest = None
+
+    def add(self, entries):
+        with self.lock:
+            if not self.entries:
+                self.oldest = time.monotonic()
+            self.entries.extend(entries)
+
+    def is_due(self) -> bool:
+        with self.lock:
+            if not self.entries:
+                return False
+            return (len(self.entries) >= settings.ACTIVITY_FLUSH_SIZE
+                    or time.monotonic() - self.oldest >= settings.ACTIVITY_FLUSH_INTERVAL)
+
+    def flush(self) -> int:
+        """
+        Write all buffered entries, return their number
+        """
+        with self.lock:
+            entries, self.entries = self.entries, []
+        if not entries:
+            return 0
+        try:
+            TaskActivity.objects.bulk_create(entries, batch_size=settings.ACTIVITY_FLUSH_SIZE)
+        except DatabaseError:
+            logger.exception('Cannot write %s task activity entries', len(entries))
+            return 0
+        return len(entries)
+
+
+buffer = ActivityBuffer()
+atexit.register(buffer.flush)
+
+
+def snapshot(task, fields=TRACKED_FIELDS) -> dict:
+    """
+    Values of tracked fields, taken before the task is changed
+    """
+    return {field: _value(task, field) for field in fields}
+
+
+def record_created(task, actor):
+    record([_entry(task, actor, 'created', new_value=task.name)])
+
+
+def record_changes(task, actor, before):
+    """
+    Record every field of the before snapshot which has a different value now
+    """
+    entries = []
+    for field, old_value in before.items():
+        new_value = _value(task, field)
+        if new_value != old_value:
+            entries.append(_entry(task, actor, 'updated', field, old_value, new_value))
+    record(entries)
+
+
+def record_deleted(task, actor):
+    record([_entry(task, actor, 'deleted', old_value=task.name)])
+
+
+def record(entries):
+    if entries:
+        # Changes rolled back are not recorded
+        transaction.on_commit(lambda: buffer.add(entries))
+
+
+def _entry(task, actor, action, field='', old_value=None, new_value=None) -> TaskActivity:
+    return TaskActivity(board_id=task.board_id, task_id=task.pk, actor_id=actor.pk if actor else None,
+                        action=action, field=field, old_value=old_value, new_value=new_value)
+
+
+def _value(task, field):
+    if field == 'assignee':
+        return task.assignee.username if task.assignee_id else None
+    value = getattr(task, field)
+    return None if value is None else str(value)
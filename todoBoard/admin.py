@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.models import Permission
-from .models import TodoItem, TodoList
+from .models import TodoItem, TodoList, BackgroundJob
 
 admin.site.register(TodoList)
 admin.site.register(TodoItem)
+admin.site.register(BackgroundJob)
 admin.site.register(Permission)
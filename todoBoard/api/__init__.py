@@ -0,0 +1,7 @@
+"""
+JSON API for boards, tasks and board members, mounted under /api/v1/.
+
+Clients authenticate with their session (browser scripts, CSRF token required for writes)
+or with HTTP Basic credentials (CI systems). Every endpoint runs a fixed number of queries,
+no matter how many rows it returns or changes.
+"""
@@ -0,0 +1,128 @@
+"""
+Task changes applied to many tasks at once with a fixed number of queries.
+Invalid input raises ValueError before anything is written.
+"""
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from todoBoard import activity, events, metrics
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.ranking import rank_sequence
+
+
+def board_members(board) -> dict:
+    """
+    Return {id: user} of users who can be assigned tasks of the board, profiles loaded
+    """
+    return {user.pk: user for user in board.members().select_related('profile')}
+
+
+def create_tasks(board, author, items, members) -> list:
+    """
+    Create tasks from validated TaskSchema data, each appended to the end of its column
+    """
+    _check_assignees(items, members)
+    default_status = TodoItem.taskStatus[0][0]
+    statuses = [item.get('status', default_status) for item in items]
+    ranks = _column_end_ranks(board, Counter(statuses))
+
+    tasks = []
+    for item, status in zip(items, statuses):
+        fields = {field: value for field, value in item.items() if field not in ('status', 'assignee_id')}
+        tasks.append(TodoItem(board=board, author=author, status=status, rank=next(ranks[status]),
+                              assignee=members.get(item.get('assignee_id')), **fields))
+
+    with transaction.atomic():
+        TodoItem.objects.bulk_create(tasks)
+        TodoList.objects.filter(pk=board.pk).bump_version()
+        metrics.apply_status_deltas(board.pk, Counter(statuses))
+    for task in tasks:
+        events.task_saved(task)
+        activity.record_created(task, author)
+    return tasks
+
+
+def update_tasks(board, items, members, actor=None) -> list:
+    """
+    Apply validated TaskUpdateSchema data to tasks of the board.
+    Tasks changing their column are appended to the end of the new one.
+    """
+    _check_assignees(items, members)
+    tasks = {task.pk: task for task in (board.todoitem_set
+                                        .filter(pk__in=[item['id'] for item in items])
+                                        .select_related('assignee__profile'))}
+    missing = {item['id'] for item in items} - tasks.keys()
+    if missing:
+        raise ValueError(f'Tasks {sorted(missing)} do not belong to the board.')
+
+    before = {task.pk: activity.snapshot(task) for task in tasks.values()}
+    fields = {'updated_at'}
+    for item in items:
+        task = tasks[item['id']]
+        for field, value in item.items():
+            if field == 'assignee_id':
+                task.assignee = members.get(value)
+                fields.add('assignee')
+            elif field != 'id':
+                setattr(task, field, value)
+                fields.add(field)
+
+    moved = [task for task in tasks.values() if task.status != before[task.pk]['status']]
+    ranks = _column_end_ranks(board, Counter(task.status for task in moved))
+    for task in moved:
+        task.rank = next(ranks[task.status])
+        fields.add('rank')
+
+    now = timezone.now()
+    for task in tasks.values():
+        task.updated_at = now
+    with transaction.atomic():
+        TodoItem.objects.bulk_update(tasks.values(), sorted(fields))
+        TodoList.objects.filter(pk=board.pk).bump_version()
+        deltas = Counter(task.status for task in moved)
+        deltas.subtract(before[task.pk]['status'] for task in moved)
+        metrics.apply_status_deltas(board.pk, deltas)
+    for task in tasks.values():
+        events.task_saved(task)
+        activity.record_changes(task, actor, before[task.pk])
+    return list(tasks.values())
+
+
+def delete_tasks(board, task_ids, actor=None) -> list:
+    """
+    Delete tasks of the board, return ids of the deleted ones
+    """
+    tasks = list(board.todoitem_set.filter(pk__in=task_ids).only('pk', 'board_id', 'name', 'status'))
+    task_ids = [task.pk for task in tasks]
+    with transaction.atomic():
+        TodoItem.objects.filter(pk__in=task_ids).delete()
+        TodoList.objects.filter(pk=board.pk).bump_version()
+        deltas = Counter()
+        deltas.subtract(task.status for task in tasks)
+        metrics.apply_status_deltas(board.pk, deltas)
+    for task in tasks:
+        events.task_deleted(board.pk, task.pk)
+        activity.record_deleted(task, actor)
+    return task_ids
+
+
+def _check_assignees(items, members):
+    assignees = {item['assignee_id'] for item in items if item.get('assignee_id') is not None}
+    if assignees - members.keys():
+        raise ValueError(f'Users {sorted(assignees - members.keys())} are not members of the board.')
+
+
+def _column_end_ranks(board, counts) -> dict:
+    """
+    Return {status: iterator of counts[status] ranks after the last card of the column}
+    """
+    ranks = {}
+    for status, count in counts.items():
+        last_rank = (TodoItem.objects.filter(board=board, status=status)
+                     .order_by('-rank')
+                     .values_list('rank', flat=True)
+                     .first())
+        ranks[status] = iter(rank_sequence(count, before=last_rank or ''))
+    return ranks
@@ -0,0 +1,52 @@
+from marshmallow import Schema, fields, validate
+
+from todoBoard.models import TodoItem
+
+TASK_STATUSES = [status for status, _ in TodoItem.taskStatus]
+
+
+class UserSchema(Schema):
+    id = fields.Int(dump_only=True)
+    username = fields.Str(dump_only=True)
+    # Users must be loaded with their profile (select_related)
+    avatar = fields.Function(lambda user: user.profile.avatar_url(64), dump_only=True)
+
+
+class BoardSchema(Schema):
+    id = fields.Int(dump_only=True)
+    title = fields.Str(required=True, validate=validate.Length(min=1, max=150))
+    description = fields.Str(allow_none=True, validate=validate.Length(max=200))
+    owner_id = fields.Int(dump_only=True)
+    is_archived = fields.Bool(dump_only=True)
+    version = fields.Int(dump_only=True)
+    # Only present on boards annotated with_task_stats()
+    task_count = fields.Int(dump_only=True)
+
+
+class TaskSchema(Schema):
+    id = fields.Int(dump_only=True)
+    board_id = fields.Int(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=150))
+    description = fields.Str(allow_none=True)
+    status = fields.Str(validate=validate.OneOf(TASK_STATUSES))
+    high_priority = fields.Bool()
+    assignee_id = fields.Int(allow_none=True)
+    author_id = fields.Int(dump_only=True)
+    rank = fields.Str(dump_only=True)
+    created_at = fields.DateTime(dump_only=True)
+    updated_at = fields.DateTime(dump_only=True)
+
+
+class TaskUpdateSchema(TaskSchema):
+    """
+    Item of a bulk update, which names the task it changes
+    """
+    id = fields.Int(required=True)
+
+
+class MembersSchema(Schema):
+    user_ids = fields.List(fields.Int(), required=True, validate=validate.Length(min=1))
+
+
+class TaskIdsSchema(Schema):
+    ids = fields.List(fields.Int(), required=True, validate=validate.Length(min=1))
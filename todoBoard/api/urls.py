@@ -0,0 +1,14 @@
+from django.urls import path
+
+from .views import BoardListView, BoardView, BoardMembersView, BoardMemberView, BoardTasksView, TaskView
+
+app_name = 'api'
+
+urlpatterns = [
+    path('boards/', BoardListView.as_view(), name='boards'),
+    path('boards/<int:pk>/', BoardView.as_view(), name='board'),
+    path('boards/<int:pk>/members/', BoardMembersView.as_view(), name='board_members'),
+    path('boards/<int:pk>/members/<int:user_id>/', BoardMemberView.as_view(), name='board_member'),
+    path('boards/<int:pk>/tasks/', BoardTasksView.as_view(), name='board_tasks'),
+    path('tasks/<int:pk>/', TaskView.as_view(), name='task'),
+]
@@ -0,0 +1,344 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from django.contrib.auth import authenticate
+from django.db import transaction
+from django.http import HttpResponse, Http404, JsonResponse
+from django.middleware.csrf import CsrfViewMiddleware
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from marshmallow import ValidationError
+
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.pagination import keyset_page
+from todoBoard.permissions import board_access
+from users.models import CustomUser
+from .bulk import board_members, create_tasks, update_tasks, delete_tasks
+from .schemas import UserSchema, BoardSchema, TaskSchema, TaskUpdateSchema, MembersSchema, TaskIdsSchema, \
+    TASK_STATUSES
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Largest number of tasks a single bulk request may create, update or delete
+MAX_BULK_SIZE = 500
+
+
+class ApiError(Exception):
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+
+# CSRF is checked in authenticate(), only for requests authenticated by the session cookie
+@method_decorator(csrf_exempt, name='dispatch')
+class ApiView(View):
+    """
+    Base of all API views: authenticates the request and turns errors into JSON responses.
+    Responses carry their payload under "data", errors a message under "error".
+    """
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            self.authenticate(request)
+            return super().dispatch(request, *args, **kwargs)
+        except Http404:
+            return JsonResponse({'error': 'Not found.'}, status=404)
+        except ApiError as e:
+            response = JsonResponse({'error': e.message, **e.details}, status=e.status)
+            if e.status == 401:
+                response['WWW-Authenticate'] = 'Basic realm="api"'
+            return response
+
+    def http_method_not_allowed(self, request, *args, **kwargs):
+        response = JsonResponse({'error': f'{request.method} method is not allowed for this action'}, status=405)
+        response['Allow'] = ', '.join(self._allowed_methods())
+        return response
+
+    def authenticate(self, request):
+        if request.user.is_authenticated:
+            if CsrfViewMiddleware(lambda request: None).process_view(request, None, (), {}) is not None:
+                raise ApiError(403, 'CSRF check failed.')
+            return
+
+        user = self.basic_auth_user(request)
+        if user is None:
+            raise ApiError(401, 'Authentication required.')
+        request.user = user
+
+    @staticmethod
+    def basic_auth_user(request):
+        scheme, _, credentials = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'basic':
+            return None
+        try:
+            username, _, password = base64.b64decode(credentials, validate=True).decode('utf-8').partition(':')
+        except (binascii.Error, UnicodeDecodeError):
+            return None
+        return authenticate(request, username=username, password=password)
+
+    def get_board(self, pk):
+        board = get_object_or_404(TodoList, pk=pk)
+        if not board_access(self.request).can_access(board):
+            raise ApiError(403, "You don't have access to this board.")
+        return board
+
+    def check_owner(self, board):
+        user = self.request.user
+        if board.owner_id != user.pk and not user.is_superuser:
+            raise ApiError(403, 'Only the board owner can do this.')
+
+    @staticmethod
+    def check_not_archived(board):
+        if board.is_archived:
+            raise ApiError(409, 'Archived boards cannot be changed.')
+
+    def parse_body(self):
+        try:
+            return json.loads(self.request.body)
+        except (ValueError, UnicodeDecodeError):
+            raise ApiError(400, 'Invalid JSON format.')
+
+    @staticmethod
+    def load(schema, data, **kwargs):
+        try:
+            return schema.load(data, **kwargs)
+        except ValidationError as e:
+            raise ApiError(400, 'Invalid data.', errors=e.messages)
+
+    def load_bulk(self, schema_class, data, **kwargs) -> list:
+        if not isinstance(data, list):
+            raise ApiError(400, 'Expected a list.')
+        if len(data) > MAX_BULK_SIZE:
+            raise ApiError(400, f'At most {MAX_BULK_SIZE} items can be sent at once.')
+        return self.load(schema_class(many=True), data, **kwargs)
+
+    def dump_schema(self, schema_class, **kwargs):
+        """
+        Schema for responses, limited to the fields requested with ?fields=a,b
+        """
+        fields = self.request.GET.get('fields')
+        if fields:
+            kwargs['only'] = [field for field in fields.split(',') if field]
+        try:
+            return schema_class(**kwargs)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+    def includes(self, allowed) -> set:
+        include = {name for name in self.request.GET.get('include', '').split(',') if name}
+        if include - set(allowed):
+            raise ApiError(400, f'Only {", ".join(allowed)} can be included.')
+        return include
+
+    def page(self, queryset, fields):
+        """
+        Return (rows, URL of the next page or None) for ?cursor=&limit=
+        """
+        try:
+            limit = min(max(int(self.request.GET.get('limit', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        except ValueError:
+            raise ApiError(400, 'limit must be a number.')
+        try:
+            rows, cursor = keyset_page(queryset, fields, self.request.GET.get('cursor'), limit)
+        except ValueError:
+            raise ApiError(400, 'Invalid cursor.')
+
+        next_url = None
+        if cursor:
+            query = self.request.GET.copy()
+            query['cursor'] = cursor
+            next_url = self.request.build_absolute_uri(f'{self.request.path}?{query.urlencode()}')
+        return rows, next_url
+
+    def conditional(self, board, build_response):
+        """
+        Answer with 304 when the client has the response for the current board version, else build it
+        """
+        key = f'{board.pk}:{board.version}:{self.request.get_full_path()}'
+        etag = quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+        response = get_conditional_response(self.request, etag=etag) or build_response()
+        response['ETag'] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class BoardListView(ApiView):
+    def get(self, request):
+        user = request.user
+        boards = TodoList.objects.all() if user.is_superuser else TodoList.objects.accessible_to(user)
+        rows, next_url = self.page(boards.with_task_stats(), ['id'])
+        return JsonResponse({'data': self.dump_schema(BoardSchema, many=True).dump(rows), 'next': next_url})
+
+    def post(self, request):
+        data = self.load(BoardSchema(), self.parse_body())
+        board = TodoList.objects.create(owner=request.user, **data)
+        return JsonResponse({'data': BoardSchema().dump(board)}, status=201)
+
+
+class BoardView(ApiView):
+    def get(self, request, pk):
+        board = self.get_board(pk)
+        return self.conditional(board, lambda: JsonResponse({'data': self.dump_schema(BoardSchema).dump(board)}))
+
+    def patch(self, request, pk):
+        board = self.get_board(pk)
+        data = self.load(BoardSchema(), self.parse_body(), partial=True)
+        for field, value in data.items():
+            setattr(board, field, value)
+        with transaction.atomic():
+            board.save()
+            TodoList.objects.filter(pk=board.pk).bump_version()
+        board.version += 1
+        return JsonResponse({'data': BoardSchema().dump(board)})
+
+    def delete(self, request, pk):
+        board = self.get_board(pk)
+        self.check_owner(board)
+        board.delete()
+        return HttpResponse(status=204)
+
+
+class BoardMembersView(ApiView):
+    def get(self, request, pk):
+        board = self.get_board(pk)
+        return self.conditional(board, lambda: self.members_response(board))
+
+    def post(self, request, pk):
+        board = self.get_board(pk)
+        self.check_owner(board)
+        user_ids = set(self.load(MembersSchema(), self.parse_body())['user_ids'])
+        missing = user_ids - set(CustomUser.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+        if missing:
+            raise ApiError(400, f'Users {sorted(missing)} do not exist.')
+
+        with transaction.atomic():
+            board.allowed_users.add(*user_ids)
+            TodoList.objects.filter(pk=board.pk).bump_version()
+        return self.members_response(board)
+
+    def members_response(self, board):
+        members = sorted(board_members(board).values(), key=lambda user: user.username.lower())
+        return JsonResponse({'data': self.dump_schema(UserSchema, many=True).dump(members)})
+
+
+class BoardMemberView(ApiView):
+    def delete(self, request, pk, user_id):
+        board = self.get_board(pk)
+        self.check_owner(board)
+        with transaction.atomic():
+            board.allowed_users.remove(user_id)
+            TodoList.objects.filter(pk=board.pk).bump_version()
+        return HttpResponse(status=204)
+
+
+class TaskResponseMixin:
+    """
+    Serialize tasks with ?fields= and ?include=assignee, which lists their assignees once under "included"
+    """
+    def task_queryset(self, queryset):
+        if 'assignee' in self.includes(['assignee']):
+            return queryset.select_related('assignee__profile')
+        return queryset
+
+    def tasks_payload(self, tasks, many=True) -> dict:
+        payload = {'data': self.dump_schema(TaskSchema, many=many).dump(tasks)}
+        if 'assignee' in self.includes(['assignee']):
+            assignees = {task.assignee_id: task.assignee for task in (tasks if many else [tasks]) if task.assignee}
+            payload['included'] = {'users': UserSchema(many=True).dump(assignees.values())}
+        return payload
+
+
+class BoardTasksView(TaskResponseMixin, ApiView):
+    """
+    Tasks of a board, oldest first. Writes take a list of tasks (or a single task to create one).
+    """
+    def get(self, request, pk):
+        board = self.get_board(pk)
+        tasks = self.task_queryset(board.todoitem_set.all())
+        status = request.GET.get('status')
+        if status:
+            if status not in TASK_STATUSES:
+                raise ApiError(400, f'status must be one of {", ".join(TASK_STATUSES)}.')
+            tasks = tasks.filter(status=status)
+        assignee = request.GET.get('assignee')
+        if assignee:
+            tasks = tasks.filter(assignee=None if assignee == 'none' else self.parse_id(assignee))
+
+        def build_response():
+            rows, next_url = self.page(tasks, ['created_at', 'id'])
+            return JsonResponse({**self.tasks_payload(rows), 'next': next_url})
+        return self.conditional(board, build_response)
+
+    def post(self, request, pk):
+        board = self.get_board(pk)
+        self.check_not_archived(board)
+        body = self.parse_body()
+        items = self.load_bulk(TaskSchema, body if isinstance(body, list) else [body])
+        try:
+            tasks = create_tasks(board, request.user, items, board_members(board))
+        except ValueError as e:
+            raise ApiError(400, str(e))
+
+        data = TaskSchema(many=True).dump(tasks) if isinstance(body, list) else TaskSchema().dump(tasks[0])
+        return JsonResponse({'data': data}, status=201)
+
+    def patch(self, request, pk):
+        board = self.get_board(pk)
+        self.check_not_archived(board)
+        # Only the id is required, every other field is optional
+        items = self.load_bulk(TaskUpdateSchema, self.parse_body(), partial=('name',))
+        try:
+            tasks = update_tasks(board, items, board_members(board), request.user)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        return JsonResponse({'data': TaskSchema(many=True).dump(tasks)})
+
+    def delete(self, request, pk):
+        board = self.get_board(pk)
+        self.check_not_archived(board)
+        task_ids = self.load(TaskIdsSchema(), self.parse_body())['ids']
+        if len(task_ids) > MAX_BULK_SIZE:
+            raise ApiError(400, f'At most {MAX_BULK_SIZE} items can be sent at once.')
+        return JsonResponse({'deleted': delete_tasks(board, task_ids, request.user)})
+
+    @staticmethod
+    def parse_id(value) -> int:
+        try:
+            return int(value)
+        except ValueError:
+            raise ApiError(400, f'Invalid id "{value}".')
+
+
+class TaskView(TaskResponseMixin, ApiView):
+    def get_task(self, pk):
+        task = get_object_or_404(self.task_queryset(TodoItem.objects.select_related('board')), pk=pk)
+        if not board_access(self.request).can_access(task.board):
+            raise ApiError(403, "You don't have access to this board.")
+        return task
+
+    def get(self, request, pk):
+        task = self.get_task(pk)
+        return self.conditional(task.board, lambda: JsonResponse(self.tasks_payload(task, many=False)))
+
+    def patch(self, request, pk):
+        task = self.get_task(pk)
+        self.check_not_archived(task.board)
+        item = self.load(TaskSchema(), self.parse_body(), partial=True)
+        try:
+            task, = update_tasks(task.board, [{**item, 'id': task.pk}], board_members(task.board), request.user)
+        except ValueError as e:
+            raise ApiError(400, str(e))
+        return JsonResponse({'data': TaskSchema().dump(task)})
+
+    def delete(self, request, pk):
+        task = self.get_task(pk)
+        self.check_not_archived(task.board)
+        delete_tasks(task.board, [task.pk], request.user)
+        return HttpResponse(status=204)
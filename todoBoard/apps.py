@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TodoboardConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'todoBoard'
+
+    def ready(self):
+        import todoBoard.signals
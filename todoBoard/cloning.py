@@ -0,0 +1,82 @@
+"""
+Board cloning and board templates.
+
+A clone is a new board with the title, description, members and tasks of another one. Templates are
+clones flagged with is_template, meant to be cloned again for every new sprint. Tasks are copied with
+bulk inserts of CLONE_CHUNK_SIZE rows read from a values_list iterator, never saved one by one.
+"""
+from django.db import transaction
+
+from . import metrics
+from .models import TodoList, TodoItem
+from .ranking import iter_rank_sequence, rank_after
+
+CLONE_CHUNK_SIZE = 2000
+
+
+def create_board_copy(source, owner, title, as_template=False) -> TodoList:
+    """
+    Create an empty board with the description and members of source, owned by owner
+    """
+    board = TodoList.objects.create(title=title, description=source.description, owner=owner,
+                                    is_template=as_template)
+    board.allowed_users.set(source.members().exclude(pk=owner.pk))
+    return board
+
+
+def copy_tasks(source, target, author, reset_status=False, clear_assignees=False,
+               chunk_size=CLONE_CHUNK_SIZE, progress=None) -> int:
+    """
+    Copy all tasks of source to target, which must be empty, and return their number.
+    reset_status moves every task into the first column, keeping the board order.
+    Assignees who are not members of target are cleared.
+    progress is called with the number of tasks of every inserted chunk.
+    """
+    first_status = TodoItem.taskStatus[0][0]
+    member_ids = set() if clear_assignees else set(target.members().values_list('pk', flat=True))
+    # One column gets the tasks of all columns, which need new ranks
+    ranks = iter_rank_sequence(source.todoitem_set.count()) if reset_status else None
+    rank = ''
+
+    rows = (source.todoitem_set
+            .order_by('status', 'rank', 'pk')
+            .values_list('name', 'description', 'status', 'assignee_id', 'high_priority', 'rank')
+            .iterator(chunk_size=chunk_size))
+    copied = 0
+    batch = []
+    for name, description, status, assignee_id, high_priority, source_rank in rows:
+        if reset_status:
+            # Tasks added to source after it was counted are appended after the last key
+            rank = next(ranks, None) or rank_after(rank)
+        else:
+            rank = source_rank
+        batch.append(TodoItem(
+            board=target, author=author, name=name, description=description, high_priority=high_priority,
+            status=first_status if reset_status else status,
+            assignee_id=assignee_id if assignee_id in member_ids else None,
+            rank=rank,
+        ))
+        if len(batch) >= chunk_size:
+            copied += _insert(batch, progress)
+            batch = []
+    copied += _insert(batch, progress)
+    return copied
+
+
+def clone_board(source, owner, title, as_template=False, reset_status=False, clear_assignees=False) -> TodoList:
+    """
+    Copy source with all its tasks in one transaction
+    """
+    with transaction.atomic():
+        board = create_board_copy(source, owner, title, as_template)
+        copy_tasks(source, board, owner, reset_status, clear_assignees)
+        metrics.refresh_snapshot(board.pk)
+    return board
+
+
+def _insert(tasks, progress) -> int:
+    if tasks:
+        TodoItem.objects.bulk_create(tasks)
+        if progress:
+            progress(len(tasks))
+    return len(tasks)
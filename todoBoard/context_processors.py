@@ -0,0 +1,12 @@
+from functools import partial
+
+from .user_boards import accessible_boards
+
+
+def sidebar_boards(request):
+    """
+    Boards listed in the sidebar. Passed as a callable, so only pages showing the sidebar load them.
+    """
+    if not request.user.is_authenticated:
+        return {}
+    return {'sidebar_boards': partial(accessible_boards, request.user)}
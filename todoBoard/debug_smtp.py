@@ -0,0 +1,98 @@
+"""
+Minimal SMTP server keeping received messages in memory, a local stand-in for the mail relay in tests
+and development. It speaks plain SMTP only, without TLS or authentication, so use it with
+EMAIL_USE_TLS=False and no EMAIL_HOST_USER.
+"""
+import email
+import email.policy
+import re
+import socketserver
+import threading
+
+ADDRESS = re.compile(r'<([^>]*)>')
+
+
+class DebugSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host='127.0.0.1', port=0, on_message=None):
+        super().__init__((host, port), SMTPHandler)
+        self.lock = threading.Lock()
+        # (sender, recipients, email.message.EmailMessage)
+        self.messages = []
+        # Number of client connections so far
+        self.connections = 0
+        self.on_message = on_message
+
+    @property
+    def port(self) -> int:
+        return self.server_address[1]
+
+    def start(self):
+        """
+        Serve in a background thread
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def received(self, sender, recipients, data):
+        message = email.message_from_bytes(data, policy=email.policy.default)
+        with self.lock:
+            self.messages.append((sender, recipients, message))
+        if self.on_message:
+            self.on_message(sender, recipients, message)
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply('220 localhost debug SMTP server')
+        sender, recipients = None, []
+
+        while line := self.rfile.readline():
+            command, _, argument = line.decode('utf-8', 'replace').strip().partition(' ')
+            command = command.upper()
+            if command == 'EHLO':
+                self.reply('250-localhost', '250 8BITMIME')
+            elif command == 'HELO':
+                self.reply('250 localhost')
+            elif command == 'MAIL':
+                sender, recipients = self.address(argument), []
+                self.reply('250 OK')
+            elif command == 'RCPT':
+                recipients.append(self.address(argument))
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                self.server.received(sender, recipients, self.read_data())
+                sender, recipients = None, []
+                self.reply('250 OK')
+            elif command in ('RSET', 'NOOP'):
+                if command == 'RSET':
+                    sender, recipients = None, []
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('502 Command not implemented')
+
+    def read_data(self) -> bytes:
+        lines = []
+        while (line := self.rfile.readline()) not in (b'.\r\n', b'.\n', b''):
+            # Undo dot stuffing
+            lines.append(line[1:] if line.startswith(b'..') else line)
+        return b''.join(lines)
+
+    def address(self, argument) -> str:
+        match = ADDRESS.search(argument)
+        return match.group(1) if match else argument.partition(':')[2].strip()
+
+    def reply(self, *lines):
+        self.wfile.write(''.join(f'{line}\r\n' for line in lines).encode('ascii'))
@@ -0,0 +1,172 @@
+"""
+Live board updates.
+
+Task views publish small deltas once their transaction commits, BoardEventsView streams them
+to every open board page as server-sent events. The broker is picked with BOARD_EVENTS_BROKER:
+InProcessBroker for a single node, PostgresBroker to relay events between nodes.
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.template.loader import render_to_string
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Keeps a single NOTIFY payload well below the PostgreSQL limit of 8000 bytes
+MOVES_PER_EVENT = 50
+
+
+class InProcessBroker:
+    """
+    Delivers events to subscribers living in this process
+    """
+    queue_size = 100
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def publish(self, board_id, event):
+        """
+        Can be called from any thread, subscribers are asyncio queues owned by their event loops
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.get(board_id, ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, event)
+            except RuntimeError:
+                # The loop is closed, the subscription goes away with it
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, board_id):
+        """
+        Yield a queue receiving events of the board until the block exits
+        """
+        queue = asyncio.Queue(self.queue_size)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(board_id, set()).add(subscriber)
+        try:
+            yield queue
+        finally:
+            with self._lock:
+                subscribers = self._subscribers[board_id]
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[board_id]
+
+    @staticmethod
+    def _deliver(queue, event):
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The viewer is too far behind to catch up with deltas, make the page reload instead
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({'type': 'resync'})
+
+
+class PostgresBroker(InProcessBroker):
+    """
+    Relays events through PostgreSQL LISTEN/NOTIFY, so viewers connected to any node receive them.
+    Each process keeps one listening connection and fans notifications out to its own subscribers.
+    """
+    channel = 'todoboard_events'
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, board_id, event):
+        payload = json.dumps({'board_id': board_id, 'event': event})
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, payload])
+
+    @asynccontextmanager
+    async def subscribe(self, board_id):
+        self._ensure_listener()
+        async with super().subscribe(board_id) as queue:
+            yield queue
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(target=self._listen, daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                self._listen_once()
+            except Exception:
+                logger.exception('Board events listener lost its database connection')
+                time.sleep(1)
+            finally:
+                connections['default'].close()
+
+    def _listen_once(self):
+        # Database connections are per thread, this one belongs to the listener only
+        db = connections['default']
+        db.ensure_connection()
+        with db.cursor() as cursor:
+            cursor.execute(f'LISTEN {self.channel}')
+
+        raw_connection = db.connection
+        while True:
+            if select.select([raw_connection], [], [], 60) == ([], [], []):
+                continue
+            raw_connection.poll()
+            while raw_connection.notifies:
+                notification = json.loads(raw_connection.notifies.pop(0).payload)
+                super().publish(notification['board_id'], notification['event'])
+
+
+@lru_cache
+def get_broker():
+    return import_string(settings.BOARD_EVENTS_BROKER)()
+
+
+def publish(board_id, event):
+    """
+    Send event to viewers of the board once the current transaction commits
+    """
+    transaction.on_commit(lambda: get_broker().publish(board_id, event))
+
+
+def task_saved(task):
+    """
+    Publish a created or updated task along with its rendered card
+    """
+    def send():
+        get_broker().publish(task.board_id, {
+            'type': 'task_saved',
+            'task_id': task.pk,
+            'status': task.status,
+            'rank': task.rank,
+            'html': render_to_string('includes/task_card.html', {'task': task}),
+        })
+    transaction.on_commit(send)
+
+
+def tasks_moved(board_id, tasks):
+    """
+    Publish new columns and ranks of tasks, their cards are already on the page
+    """
+    moves = [{'task_id': task.pk, 'status': task.status, 'rank': task.rank} for task in tasks]
+    for start in range(0, len(moves), MOVES_PER_EVENT):
+        publish(board_id, {'type': 'tasks_moved', 'moves': moves[start:start + MOVES_PER_EVENT]})
+
+
+def task_deleted(board_id, task_id):
+    publish(board_id, {'type': 'task_deleted', 'task_id': task_id})
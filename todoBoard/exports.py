@@ -0,0 +1,147 @@
+"""
+Streaming task export as CSV, JSON Lines or a zip archive of the whole board.
+
+Tasks are read with QuerySet.iterator() and written out a chunk at a time, so memory use stays the same
+whatever the size of the board. CSV and JSON Lines files have the columns todoBoard.imports reads,
+so an export can be imported into another board. The zip archive holds board.json, members.json,
+tasks.jsonl and the avatars of the members.
+"""
+import csv
+import io
+import json
+import posixpath
+import zipfile
+
+from django.core.files.storage import default_storage
+
+from .models import TodoItem
+
+FORMATS = ('csv', 'jsonl', 'zip')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'jsonl': 'application/x-ndjson',
+    'zip': 'application/zip',
+}
+EXPORT_CHUNK_SIZE = 2000
+# Bytes collected before a chunk is handed to the response
+BUFFER_SIZE = 64 * 1024
+
+COLUMNS = ('id', 'name', 'description', 'status', 'assignee', 'high_priority', 'author', 'created_at', 'updated_at')
+
+
+def export_filename(board, file_format) -> str:
+    return f'board-{board.pk}.{file_format}'
+
+
+def export_board(board, file_format):
+    """
+    Return an iterator of bytes chunks of the board exported in file_format
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f'Unknown export format "{file_format}".')
+    chunks = {'csv': iter_csv, 'jsonl': iter_jsonl, 'zip': iter_zip}[file_format](board)
+    return (chunk for chunk in chunks if chunk)
+
+
+def iter_tasks(board):
+    """
+    Yield a dict of COLUMNS of every task of the board, in board order
+    """
+    rows = (TodoItem.objects.filter(board=board)
+            .order_by('status', 'rank', 'pk')
+            .values_list('id', 'name', 'description', 'status', 'assignee__username', 'high_priority',
+                         'author__username', 'created_at', 'updated_at')
+            .iterator(chunk_size=EXPORT_CHUNK_SIZE))
+    for row in rows:
+        task = dict(zip(COLUMNS, row))
+        task['created_at'] = task['created_at'].isoformat()
+        task['updated_at'] = task['updated_at'].isoformat()
+        yield task
+
+
+def iter_csv(board):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, COLUMNS)
+    writer.writeheader()
+    for task in iter_tasks(board):
+        writer.writerow(task)
+        if buffer.tell() >= BUFFER_SIZE:
+            yield _drain(buffer).encode()
+    yield _drain(buffer).encode()
+
+
+def iter_jsonl(board):
+    buffer = io.StringIO()
+    for task in iter_tasks(board):
+        buffer.write(json.dumps(task) + '\n')
+        if buffer.tell() >= BUFFER_SIZE:
+            yield _drain(buffer).encode()
+    yield _drain(buffer).encode()
+
+
+def iter_zip(board):
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        members = list(board.members().select_related('profile').order_by('pk'))
+        avatars = {}
+        for user in members:
+            name = user.profile.avatar.name
+            if name and name not in avatars and default_storage.exists(name):
+                avatars[name] = posixpath.join('avatars', f'{len(avatars) + 1}-{posixpath.basename(name)}')
+
+        archive.writestr('board.json', json.dumps({
+            'id': board.pk,
+            'title': board.title,
+            'description': board.description,
+            'owner': board.owner.username,
+            'is_archived': board.is_archived,
+        }, indent=2))
+        archive.writestr('members.json', json.dumps([{
+            'id': user.pk,
+            'username': user.username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_owner': user.pk == board.owner_id,
+            'avatar': avatars.get(user.profile.avatar.name),
+        } for user in members], indent=2))
+        yield stream.read()
+
+        with archive.open('tasks.jsonl', 'w') as entry:
+            for chunk in iter_jsonl(board):
+                entry.write(chunk)
+                yield stream.read()
+
+        for name, path in avatars.items():
+            with default_storage.open(name) as file, archive.open(path, 'w') as entry:
+                for chunk in file.chunks():
+                    entry.write(chunk)
+                    yield stream.read()
+    yield stream.read()
+
+
+def _drain(buffer) -> str:
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
+
+
+class _ZipStream(io.RawIOBase):
+    """
+    Write-only stream zipfile writes an archive into, read back piece by piece as it grows.
+    It cannot seek, so zipfile puts the sizes of entries after their data instead of patching headers.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def read(self, size=-1) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
@@ -10,17 +10,21 @@ class CreateTaskForm(forms.ModelForm):
         model = TodoItem
         fields = '__all__'
 
-    def __init__(self, *args, init_board_id, user_id, **kwargs):
+    def __init__(self, *args, init_board_id, user_id, board=None, **kwargs):
+        """
+        board is the already loaded board of init_board_id, which saves querying it again
+        """
         if not init_board_id or not user_id:
             raise ValueError("Missing required argument 'init_board_id' or 'user_id'")
 
         super(CreateTaskForm, self).__init__(*args, **kwargs)
 
-        board = TodoList.objects.get(id=init_board_id)
+        board = board or TodoList.objects.get(id=init_board_id)
 
-        self.fields['assignee'].queryset = CustomUser.objects.filter(
-            Q(allowed_boards=board) | Q(pk=board.owner.pk)
-        ).distinct()
+        self.fields['assignee'].queryset = board.members()
+        # Tasks are only ever created on this board by the current user, no need to list everything else
+        self.fields['board'].queryset = TodoList.objects.filter(pk=board.pk)
+        self.fields['author'].queryset = CustomUser.objects.filter(pk=user_id)
 
         self.fields['board'].initial = init_board_id
         self.fields['author'].initial = user_id
@@ -29,7 +33,13 @@ class CreateTaskForm(forms.ModelForm):
 class CreateBoardForm(forms.ModelForm):
     class Meta:
         model = TodoList
-        exclude = ('is_archived', 'owner',)
+        exclude = ('is_archived', 'is_template', 'owner',)
+
+
+class CloneBoardForm(forms.Form):
+    title = forms.CharField(max_length=TodoList._meta.get_field('title').max_length)
+    reset_status = forms.BooleanField(required=False, label='Move all tasks back to "Not started"')
+    clear_assignees = forms.BooleanField(required=False, label='Clear assignees')
 
 
 class ManageBoardForm(forms.ModelForm):
@@ -44,3 +54,49 @@ class ManageBoardForm(forms.ModelForm):
     class Meta:
         model = TodoList
         fields = ['allowed_users',]
+
+
+class BacklogFilterForm(forms.Form):
+    """
+    Server side filters of the board backlog
+    """
+    status = forms.ChoiceField(choices=[('', 'Any status')] + TodoItem.taskStatus, required=False,
+                               widget=forms.Select(attrs={'class': 'form-control form-control-sm'}))
+    assignee = forms.ChoiceField(required=False, widget=forms.Select(attrs={'class': 'form-control form-control-sm'}))
+    high_priority = forms.BooleanField(required=False, label='High priority only')
+
+    def __init__(self, *args, board, **kwargs):
+        super().__init__(*args, **kwargs)
+        members = CustomUser.objects.filter(
+            Q(allowed_boards=board) | Q(pk=board.owner_id)
+        ).distinct().order_by('username')
+        self.fields['assignee'].choices = [('', 'Anyone'), ('unassigned', 'Unassigned')] + [
+            (str(member.pk), member.username) for member in members
+        ]
+
+    def filter_tasks(self, tasks):
+        # Invalid filters are ignored rather than reported, the backlog is still shown
+        if not self.is_valid():
+            return tasks
+
+        status = self.cleaned_data.get('status')
+        assignee = self.cleaned_data.get('assignee')
+        if status:
+            tasks = tasks.filter(status=status)
+        if assignee == 'unassigned':
+            tasks = tasks.filter(assignee__isnull=True)
+        elif assignee:
+            tasks = tasks.filter(assignee_id=int(assignee))
+        if self.cleaned_data.get('high_priority'):
+            tasks = tasks.filter(high_priority=True)
+        return tasks
+
+
+class TaskImportForm(forms.Form):
+    file = forms.FileField(help_text='CSV with a header row or JSON Lines. '
+                                     'Columns: name, description, status, assignee (username), high_priority.')
+    file_format = forms.ChoiceField(label='Format', required=False, choices=[
+        ('', 'Detect from file name'),
+        ('csv', 'CSV'),
+        ('jsonl', 'JSON Lines'),
+    ])
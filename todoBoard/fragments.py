@@ -0,0 +1,52 @@
+"""
+Cached task cards and rows.
+
+Every fragment is keyed on everything it renders, so a changed task simply gets a new key
+and stale entries age out of the cache. Fragments of a whole page are fetched and stored
+with one cache round trip each, which keeps shared cache backends cheap as well.
+"""
+import hashlib
+
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+FRAGMENT_CACHE = 'fragments'
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+
+def fragment_key(template_name, task, context) -> str:
+    assignee = task.assignee
+    parts = [
+        template_name, task.pk, task.updated_at.isoformat(), task.status, task.rank,
+        assignee.pk if assignee else '',
+        assignee.username if assignee else '',
+        assignee.profile.avatar.name if assignee else '',
+        assignee.profile.has_thumbnails if assignee else '',
+        sorted(context.items()),
+    ]
+    return 'fragment:' + hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+
+def render_task_fragments(tasks, template_name, **context):
+    """
+    Render template_name for each task into task.html, reusing cached fragments.
+    The template gets only the task and context, it must not depend on the current user or request.
+    Tasks need their assignee and assignee profile loaded (select_related).
+    """
+    cache = caches[FRAGMENT_CACHE]
+    keys = {task.pk: fragment_key(template_name, task, context) for task in tasks}
+    cached = cache.get_many(keys.values())
+
+    template = None
+    rendered = {}
+    for task in tasks:
+        html = cached.get(keys[task.pk])
+        if html is None:
+            template = template or get_template(template_name)
+            html = rendered[keys[task.pk]] = template.render({**context, 'task': task})
+        task.html = mark_safe(html)
+
+    if rendered:
+        cache.set_many(rendered, FRAGMENT_TIMEOUT)
+    return tasks
@@ -0,0 +1,192 @@
+"""
+Task import from CSV or JSON Lines files.
+
+Files are streamed twice: the first pass counts valid rows per column, so every column gets one evenly
+spaced run of short rank keys, the second one validates rows and inserts them in batches, each batch
+in its own transaction. Memory use depends on the batch size only, not on the size of the file.
+Rows have the columns name, description, status (code or label), assignee (username) and high_priority.
+"""
+import csv
+import io
+import json
+from collections import Counter
+
+from django.db import transaction
+
+from . import events, metrics
+from .models import TodoList, TodoItem
+from .ranking import iter_rank_sequence
+
+FORMATS = ('csv', 'jsonl')
+IMPORT_BATCH_SIZE = 1000
+# Rows reported individually, the rest of the errors is only counted
+MAX_REPORTED_ERRORS = 1000
+
+NAME_MAX_LENGTH = TodoItem._meta.get_field('name').max_length
+STATUSES = {key.lower(): key for key, _ in TodoItem.taskStatus} | {label.lower(): key for key, label in TodoItem.taskStatus}
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n'}
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.error_count = 0
+        # (line number, message) of the first MAX_REPORTED_ERRORS invalid rows
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def format_of(filename) -> str:
+    """
+    Guess the import format from a file name, CSV unless it looks like JSON Lines
+    """
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def import_tasks(board, author, file, file_format='csv', batch_size=IMPORT_BATCH_SIZE) -> ImportReport:
+    """
+    Create tasks of board from a binary file object, which must be seekable.
+    Invalid rows are skipped and listed in the returned report, a file that cannot be read at all
+    raises ValueError before any task is created.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f'Unknown import format "{file_format}".')
+
+    assignees = _assignees_by_username(board)
+
+    counts = Counter()
+    for line, row in _read_rows(file, file_format):
+        try:
+            counts[_parse_row(row, assignees)['status']] += 1
+        except ValueError:
+            pass
+    ranks = {status: iter_rank_sequence(count, before=_last_rank(board, status)) for status, count in counts.items()}
+
+    report = ImportReport()
+    file.seek(0)
+    batch = []
+    for line, row in _read_rows(file, file_format):
+        try:
+            fields = _parse_row(row, assignees)
+        except ValueError as e:
+            report.add_error(line, str(e))
+            continue
+        batch.append(TodoItem(board=board, author=author, rank=next(ranks[fields['status']]), **fields))
+        if len(batch) >= batch_size:
+            report.created += _insert(batch)
+            batch = []
+    report.created += _insert(batch)
+
+    if report.created:
+        TodoList.objects.filter(pk=board.pk).bump_version()
+        metrics.refresh_snapshot(board.pk)
+        # Far too many changes to send one by one, open boards reload instead
+        events.publish(board.pk, {'type': 'resync'})
+    return report
+
+
+def _insert(tasks) -> int:
+    if tasks:
+        with transaction.atomic():
+            TodoItem.objects.bulk_create(tasks)
+    return len(tasks)
+
+
+def _read_rows(file, file_format):
+    """
+    Yield (line number, row dict) of every data row of the file.
+    Raise ValueError when the file is not UTF-8 text or not valid CSV.
+    """
+    lines = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        if file_format == 'csv':
+            reader = csv.DictReader(lines)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line, text in enumerate(lines, start=1):
+            if not text.strip():
+                continue
+            try:
+                yield line, json.loads(text)
+            except ValueError:
+                # Reported by _parse_row
+                yield line, None
+    except UnicodeDecodeError:
+        raise ValueError('The file is not UTF-8 encoded text.')
+    except csv.Error as e:
+        # line_num only counts the lines read before the failing one
+        raise ValueError(f'Line {reader.line_num + 1}: {e}.')
+    finally:
+        # Closing the wrapper would close the file as well
+        lines.detach()
+
+
+def _parse_row(row, assignees) -> dict:
+    """
+    Return TodoItem fields of a row, raise ValueError when it is invalid
+    """
+    if not isinstance(row, dict):
+        raise ValueError('Not a JSON object.')
+    if any('\x00' in _text(value) for value in row.values()):
+        raise ValueError('Values must not contain NUL characters.')
+
+    name = _text(row.get('name')).strip()
+    if not name:
+        raise ValueError('Name is required.')
+    if len(name) > NAME_MAX_LENGTH:
+        raise ValueError(f'Name is longer than {NAME_MAX_LENGTH} characters.')
+
+    status = _text(row.get('status')).strip()
+    if status:
+        status = STATUSES.get(status.lower())
+        if status is None:
+            raise ValueError(f'Unknown status "{row.get("status")}".')
+    else:
+        status = TodoItem.taskStatus[0][0]
+
+    username = _text(row.get('assignee')).strip()
+    assignee = None
+    if username:
+        assignee = assignees.get(username.lower())
+        if assignee is None:
+            raise ValueError(f'User "{username}" is not a member of the board.')
+
+    high_priority = row.get('high_priority')
+    if not isinstance(high_priority, bool):
+        value = _text(high_priority).strip().lower()
+        if value not in TRUE_VALUES | FALSE_VALUES:
+            raise ValueError(f'Invalid high_priority value "{high_priority}".')
+        high_priority = value in TRUE_VALUES
+
+    return {
+        'name': name,
+        'description': _text(row.get('description')) or None,
+        'status': status,
+        'assignee': assignee,
+        'high_priority': high_priority,
+    }
+
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _assignees_by_username(board) -> dict:
+    """
+    Board members by lowercased username, loaded once per import
+    """
+    return {user.username.lower(): user for user in board.members()}
+
+
+def _last_rank(board, status) -> str:
+    return (board.todoitem_set.filter(status=status)
+            .order_by('-rank')
+            .values_list('rank', flat=True)
+            .first()) or ''
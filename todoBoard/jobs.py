@@ -0,0 +1,266 @@
+"""
+Background jobs.
+
+Slow work is queued as a BackgroundJob row with a JSON payload and run by the handler registered for
+its kind. Without a broker the jobs table is the queue: `manage.py run_jobs` claims due jobs and runs
+them in a pool of worker processes. Unless JOBS_RUN_IN_WORKER is set, a job is instead started in a
+thread of the web process as soon as the request which queued it commits.
+
+Failed jobs are queued again until they have been tried max_attempts times, waiting JOB_RETRY_DELAY
+seconds after the first failure and twice as long after every further one. Handlers must therefore
+be safe to run again after a partial run.
+"""
+import datetime
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import events, mail, metrics
+from .cloning import copy_tasks, CLONE_CHUNK_SIZE
+from .models import BackgroundJob, TodoList, TodoItem
+
+logger = logging.getLogger(__name__)
+
+CLOSE_BOARD_CHUNK_SIZE = 1000
+DELETE_BOARD_CHUNK_SIZE = 1000
+
+# kind: (handler, max_attempts)
+HANDLERS = {}
+
+
+def handler(kind, max_attempts=3):
+    """
+    Register the decorated function as the handler of jobs of kind, called with the job
+    """
+    def register(func):
+        HANDLERS[kind] = (func, max_attempts)
+        return func
+    return register
+
+
+def enqueue(kind, board=None, user=None, total=0, payload=None) -> BackgroundJob:
+    if kind not in HANDLERS:
+        raise ValueError(f'Unknown job kind "{kind}".')
+    job = BackgroundJob.objects.create(kind=kind, board=board, created_by=user, total=total, payload=payload or {},
+                                       max_attempts=HANDLERS[kind][1])
+    if not settings.JOBS_RUN_IN_WORKER:
+        transaction.on_commit(lambda: _start_in_thread(job.pk))
+    return job
+
+
+def claim_jobs(limit) -> list:
+    """
+    Mark up to limit due jobs as running and return their ids
+    """
+    now = timezone.now()
+    candidates = (BackgroundJob.objects.filter(status="QU", run_after__lte=now)
+                  .order_by('run_after', 'pk').values_list('pk', flat=True)[:limit])
+    # Another worker may claim the same job first, only one UPDATE changes the row
+    return [job_id for job_id in list(candidates) if _claim(job_id, now)]
+
+
+def requeue_stale_jobs(timeout) -> int:
+    """
+    Queue again jobs running for longer than timeout seconds, assumed lost with their worker
+    """
+    now = timezone.now()
+    stale = BackgroundJob.objects.filter(status="RU", started_at__lt=now - datetime.timedelta(seconds=timeout))
+    failed = stale.filter(attempts__gte=F('max_attempts')).update(
+        status="ER", error='The job did not finish in time.', finished_at=now)
+    return failed + stale.update(status="QU", run_after=now)
+
+
+def run_job(job_id) -> BackgroundJob:
+    """
+    Run a claimed job and record its outcome, queueing it again when it can be retried
+    """
+    job = BackgroundJob.objects.select_related('board', 'created_by').get(pk=job_id)
+    try:
+        func, _ = HANDLERS[job.kind]
+        func(job)
+        job.status = "OK"
+        job.error = ''
+    except Exception as e:
+        logger.exception('Background job %s failed (attempt %s of %s)', job_id, job.attempts, job.max_attempts)
+        job.error = str(e)
+        if job.kind in HANDLERS and job.attempts < job.max_attempts:
+            job.status = "QU"
+            job.run_after = timezone.now() + datetime.timedelta(seconds=retry_delay(job.attempts))
+        else:
+            job.status = "ER"
+
+    if job.status != "QU":
+        job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'run_after', 'finished_at'])
+    return job
+
+
+def run_queued_job(job_id):
+    """
+    Claim and run one job, returns None when it is not queued (anymore)
+    """
+    if not _claim(job_id, timezone.now()):
+        return None
+    return run_job(job_id)
+
+
+def run_job_in_worker(job_id) -> str:
+    """
+    Entry point of worker processes, which must not keep connections between jobs
+    """
+    try:
+        return run_job(job_id).status
+    finally:
+        connection.close()
+
+
+def retry_delay(attempts) -> int:
+    return settings.JOB_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def close_board(board) -> int:
+    """
+    Mark all unfinished tasks as done and archive the board in one transaction.
+    Returns number of updated tasks.
+    """
+    with transaction.atomic():
+        updated = board.todoitem_set.exclude(status="DN").update(status="DN", updated_at=timezone.now())
+        TodoList.objects.filter(pk=board.pk).update(is_archived=True, version=F('version') + 1)
+        metrics.refresh_snapshot(board.pk)
+        board.is_archived = True
+    return updated
+
+
+def start_close_board_job(board, user, open_tasks) -> BackgroundJob:
+    return enqueue('board.close', board=board, user=user, total=open_tasks)
+
+
+@handler('board.close')
+def close_board_job(job):
+    """
+    Close a board in chunks so the client can follow the progress.
+    The board is archived first, which freezes its tasks for the rest of the job.
+    """
+    board = job.board
+    chunk_size = job.payload.get('chunk_size', CLOSE_BOARD_CHUNK_SIZE)
+    TodoList.objects.filter(pk=board.pk).update(is_archived=True, version=F('version') + 1)
+
+    open_tasks = board.todoitem_set.exclude(status="DN")
+    while True:
+        with transaction.atomic():
+            chunk = list(open_tasks.values_list('pk', flat=True)[:chunk_size])
+            if not chunk:
+                break
+            board.todoitem_set.filter(pk__in=chunk).update(status="DN", updated_at=timezone.now())
+            TodoList.objects.filter(pk=board.pk).bump_version()
+
+        job.processed += len(chunk)
+        job.save(update_fields=['processed'])
+
+    metrics.refresh_snapshot(board.pk)
+
+
+def start_clone_board_job(source, target, user, reset_status=False, clear_assignees=False) -> BackgroundJob:
+    """
+    Copy tasks of source into target, an empty copy made by cloning.create_board_copy
+    """
+    return enqueue('board.clone', board=target, user=user, total=source.todoitem_set.count(), payload={
+        'source_id': source.pk,
+        'reset_status': reset_status,
+        'clear_assignees': clear_assignees,
+    })
+
+
+@handler('board.clone')
+def clone_board_job(job):
+    """
+    Copy tasks in chunks, every chunk shows up on the new board as soon as it is inserted
+    """
+    payload = job.payload
+
+    def progress(count):
+        TodoList.objects.filter(pk=job.board_id).bump_version()
+        job.processed += count
+        job.save(update_fields=['processed'])
+
+    try:
+        if job.attempts > 1:
+            # Start over, the copy must be empty
+            job.board.todoitem_set.all().delete()
+            job.processed = 0
+        source = TodoList.objects.get(pk=payload['source_id'])
+        copy_tasks(source, job.board, job.created_by, payload.get('reset_status', False),
+                   payload.get('clear_assignees', False), payload.get('chunk_size', CLONE_CHUNK_SIZE), progress)
+        metrics.refresh_snapshot(job.board_id)
+    finally:
+        events.publish(job.board_id, {'type': 'resync'})
+
+
+def start_delete_board_job(board, user, task_count) -> BackgroundJob:
+    """
+    Archive the board, which hides it from the boards lists, and delete it in the background.
+    The job is not linked to the board, it would be deleted with it.
+    """
+    with transaction.atomic():
+        TodoList.objects.filter(pk=board.pk).update(is_archived=True, version=F('version') + 1)
+        return enqueue('board.delete', user=user, total=task_count, payload={'board_id': board.pk})
+
+
+@handler('board.delete')
+def delete_board_job(job):
+    """
+    Delete the tasks of a board in chunks, then the board itself
+    """
+    board_id = job.payload['board_id']
+    chunk_size = job.payload.get('chunk_size', DELETE_BOARD_CHUNK_SIZE)
+    tasks = TodoItem.objects.filter(board_id=board_id)
+    while True:
+        chunk = list(tasks.values_list('pk', flat=True)[:chunk_size])
+        if not chunk:
+            break
+        TodoItem.objects.filter(pk__in=chunk).delete()
+        job.processed += len(chunk)
+        job.save(update_fields=['processed'])
+
+    TodoList.objects.filter(pk=board_id).delete()
+
+
+@handler('mail.send', max_attempts=5)
+def send_mail_job(job):
+    """
+    Send the messages queued by mail.QueuedEmailBackend, a retry skips the ones already sent
+    """
+    def sent():
+        job.processed += 1
+        job.save(update_fields=['processed'])
+
+    messages = [mail.deserialize(data) for data in job.payload['messages'][job.processed:]]
+    mail.connection.send(messages, sent)
+    # Sent messages are not kept, they may hold password reset links
+    job.payload = {}
+    job.save(update_fields=['payload'])
+
+
+def _claim(job_id, now) -> bool:
+    return BackgroundJob.objects.filter(pk=job_id, status="QU").update(
+        status="RU", attempts=F('attempts') + 1, started_at=now) == 1
+
+
+def _start_in_thread(job_id):
+    def target():
+        try:
+            job = run_queued_job(job_id)
+            # Retries wait in the same thread
+            while job is not None and job.status == "QU":
+                time.sleep(max(0.0, (job.run_after - timezone.now()).total_seconds()))
+                job = run_queued_job(job_id)
+        finally:
+            # the thread owns its own connection, make sure it doesn't leak
+            connection.close()
+
+    threading.Thread(target=target, daemon=True).start()
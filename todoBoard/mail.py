@@ -0,0 +1,122 @@
+"""
+Queued outbound email.
+
+QueuedEmailBackend (EMAIL_BACKEND) only stores the messages of every send_messages() call as one
+"mail.send" background job and returns. The job sends them with QUEUED_EMAIL_BACKEND, usually SMTP,
+over a connection kept open by the process running the job: it is reused by all following jobs and
+opened again only once the server has dropped it.
+"""
+import atexit
+import base64
+import logging
+import smtplib
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from . import jobs
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        try:
+            messages = [serialize(message) for message in email_messages if message.recipients()]
+        except TypeError:
+            if not self.fail_silently:
+                raise
+            return 0
+        if messages:
+            jobs.enqueue('mail.send', total=len(messages), payload={'messages': messages})
+        return len(messages)
+
+
+class PersistentConnection:
+    """
+    A QUEUED_EMAIL_BACKEND connection shared by the jobs of a process, one message at a time
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.backend = None
+        self.connection = None
+
+    def send(self, messages, sent=None) -> int:
+        """
+        Send messages in order, calling sent after each one. Returns their number.
+        A dropped connection is opened again once, any other error stops the batch.
+        """
+        with self.lock:
+            for message in messages:
+                try:
+                    self._send(message)
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    logger.info('Mail connection lost, reconnecting')
+                    self.close()
+                    self._send(message)
+                if sent:
+                    sent()
+        return len(messages)
+
+    def close(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+        self.connection = None
+
+    def _send(self, message):
+        if self.connection is None or self.backend != settings.QUEUED_EMAIL_BACKEND:
+            self.close()
+            self.backend = settings.QUEUED_EMAIL_BACKEND
+            self.connection = get_connection(self.backend)
+            # Opened here, send_messages() keeps it open
+            self.connection.open()
+        self.connection.send_messages([message])
+
+
+connection = PersistentConnection()
+atexit.register(connection.close)
+
+
+def serialize(message) -> dict:
+    """
+    JSON serializable form of an EmailMessage, attachments must be (filename, content, mimetype)
+    """
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise TypeError('Queued email attachments must be (filename, content, mimetype) tuples.')
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        attachments.append([filename, base64.b64encode(content).decode('ascii'), mimetype])
+
+    return {
+        'subject': str(message.subject),
+        'body': str(message.body),
+        'content_subtype': message.content_subtype,
+        'from_email': message.from_email,
+        'to': list(message.to),
+        'cc': list(message.cc),
+        'bcc': list(message.bcc),
+        'reply_to': list(message.reply_to),
+        'headers': message.extra_headers,
+        'alternatives': [list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        'attachments': attachments,
+    }
+
+
+def deserialize(data) -> EmailMultiAlternatives:
+    message = EmailMultiAlternatives(
+        data['subject'], data['body'], data['from_email'], data['to'], bcc=data['bcc'], cc=data['cc'],
+        reply_to=data['reply_to'], headers=data['headers'],
+        alternatives=[tuple(alternative) for alternative in data['alternatives']],
+    )
+    message.content_subtype = data['content_subtype']
+    for filename, content, mimetype in data['attachments']:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
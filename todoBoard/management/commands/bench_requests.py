@@ -0,0 +1,133 @@
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todoBoard.models import TodoList, TodoItem
+from users.models import CustomUser
+
+CONFIGURATIONS = {
+    'db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    },
+    'cached_db': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.fallback.FallbackStorage',
+    },
+    'cached_db+cookie_msg': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.cached_db',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+    'signed_cookies': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.signed_cookies',
+        'MESSAGE_STORAGE': 'django.contrib.messages.storage.cookie.CookieStorage',
+    },
+}
+
+SESSION_TABLE = 'django_session'
+
+# Sessions and fragments written by the benchmark must not end up in the shared cache
+BENCH_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench_requests'},
+    'fragments': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench_requests_fragments'},
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Report database round trips per request (and how many of them hit the session table) '
+            'for every session and message storage configuration. Development only (DEBUG=True): '
+            'all data is rolled back afterwards and caches are replaced by local memory ones.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=50, help='Number of tasks on the benchmark board')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG:
+            raise CommandError('bench_requests writes to the database, run it with DEBUG=True '
+                               'against a development database.')
+
+        results = {}
+        try:
+            with transaction.atomic(), override_settings(CACHES=BENCH_CACHES):
+                user, board = self.seed(options['tasks'])
+                for name, config in CONFIGURATIONS.items():
+                    with override_settings(ALLOWED_HOSTS=['testserver', *settings.ALLOWED_HOSTS], **config):
+                        results[name] = self.run(user, board)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.report(results)
+
+    @staticmethod
+    def seed(tasks):
+        suffix = uuid.uuid4().hex[:8]
+        user = CustomUser.objects.create_user(username=f'bench_{suffix}', password=uuid.uuid4().hex)
+        board = TodoList.objects.create(title='Benchmark board', owner=user)
+        TodoItem.objects.bulk_create([
+            TodoItem(name=f'Task {i}', author=user, board=board, status=TodoItem.taskStatus[i % 4][0],
+                     rank=f'{i + 1:06d}')
+            for i in range(tasks)
+        ])
+        return user, board
+
+    @staticmethod
+    def requests(user, board):
+        """
+        Return (label, method, url, data) of the benchmarked requests
+        """
+        task = board.todoitem_set.first()
+        # Every configuration deletes a task of its own
+        deleted_task = TodoItem.objects.create(name='Deleted task', author=user, board=board)
+        return [
+            ('GET boards list', 'GET', reverse('boards_list'), None),
+            ('GET board', 'GET', reverse('board_detail', args=(board.pk,)), None),
+            ('GET backlog', 'GET', reverse('board_backlog', args=(board.pk,)), None),
+            ('GET task', 'GET', reverse('task_detail', args=(task.pk,)), None),
+            ('GET search', 'GET', reverse('task_search'), {'q': 'task'}),
+            ('POST change status', 'POST', reverse('task_change_status', args=(task.pk,)), {'new_status': 'PR'}),
+            ('POST create task', 'POST', reverse('task_create', args=(board.pk,)),
+             {'name': 'New task', 'board': board.pk, 'author': user.pk, 'status': 'NS'}),
+            ('POST delete task', 'POST', reverse('task_delete', args=(deleted_task.pk,)), None),
+            # Reads the messages queued by the requests above
+            ('GET boards list (messages)', 'GET', reverse('boards_list'), None),
+        ]
+
+    def run(self, user, board):
+        """
+        Return {label: (queries, session table queries)} for one configuration
+        """
+        client = Client()
+        client.force_login(user)
+        # The first request warms up caches, it is not part of the results
+        client.get(reverse('boards_list'))
+
+        counts = {}
+        for label, method, url, data in self.requests(user, board):
+            with CaptureQueriesContext(connection) as queries:
+                response = getattr(client, method.lower())(url, data)
+            if response.status_code >= 400:
+                raise CommandError(f'{label} failed with status {response.status_code}')
+            session_queries = sum(SESSION_TABLE in query['sql'] for query in queries)
+            counts[label] = (len(queries), session_queries)
+        return counts
+
+    def report(self, results):
+        labels = list(next(iter(results.values())))
+        width = max(len(label) for label in labels) + 2
+        self.stdout.write('Queries per request (session table queries in brackets)')
+        self.stdout.write(' ' * width + ''.join(f'{name:>22}' for name in results))
+        for label in labels:
+            self.stdout.write(label.ljust(width) + ''.join(
+                f'{"%d (%d)" % counts[label]:>22}' for counts in results.values()))
+        self.stdout.write('Total'.ljust(width) + ''.join(
+            f'{"%d (%d)" % tuple(map(sum, zip(*counts.values()))):>22}' for counts in results.values()))
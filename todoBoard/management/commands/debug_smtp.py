@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from todoBoard.debug_smtp import DebugSMTPServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local SMTP server printing every message it receives instead of delivering it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=1025)
+
+    def handle(self, *args, **options):
+        server = DebugSMTPServer(options['host'], options['port'], on_message=self.print_message)
+        self.stdout.write(f'Listening on {options["host"]}:{server.port}, '
+                          f'use EMAIL_PORT={server.port} EMAIL_USE_TLS=false')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    def print_message(self, sender, recipients, message):
+        self.stdout.write(f'From {sender} to {", ".join(recipients)}')
+        self.stdout.write(message.as_string())
+        self.stdout.flush()
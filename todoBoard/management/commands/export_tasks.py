@@ -0,0 +1,33 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from todoBoard.exports import export_board, FORMATS
+from todoBoard.models import TodoList
+
+
+class Command(BaseCommand):
+    help = 'Export the tasks of a board as CSV, JSON Lines or a zip archive of the whole board'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_id', type=int)
+        parser.add_argument('path', help='File to write, - for standard output')
+        parser.add_argument('--format', choices=FORMATS, default='csv')
+
+    def handle(self, *args, **options):
+        try:
+            board = TodoList.objects.get(pk=options['board_id'])
+        except TodoList.DoesNotExist as e:
+            raise CommandError(e)
+
+        if options['path'] == '-':
+            self.write(board, options['format'], sys.stdout.buffer)
+            return
+        with open(options['path'], 'wb') as file:
+            self.write(board, options['format'], file)
+        self.stdout.write(f'Exported board {board.pk} to {options["path"]}')
+
+    @staticmethod
+    def write(board, file_format, file):
+        for chunk in export_board(board, file_format):
+            file.write(chunk)
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from todoBoard.imports import import_tasks, format_of, FORMATS, IMPORT_BATCH_SIZE
+from todoBoard.models import TodoList
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = 'Create tasks of a board from a CSV or JSON Lines file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('board_id', type=int)
+        parser.add_argument('path', help='CSV file with a header row or JSON Lines file')
+        parser.add_argument('--author', required=True, help='Username of the user the tasks are created by')
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the format the file name suggests')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE, help='Tasks inserted per transaction')
+
+    def handle(self, *args, **options):
+        try:
+            board = TodoList.objects.get(pk=options['board_id'])
+            author = CustomUser.objects.get(username=options['author'])
+        except (TodoList.DoesNotExist, CustomUser.DoesNotExist) as e:
+            raise CommandError(e)
+
+        file_format = options['format'] or format_of(options['path'])
+        with open(options['path'], 'rb') as file:
+            try:
+                report = import_tasks(board, author, file, file_format, options['batch_size'])
+            except ValueError as e:
+                raise CommandError(e)
+
+        for line, message in report.errors:
+            self.stderr.write(f'Line {line}: {message}')
+        if report.error_count > len(report.errors):
+            self.stderr.write(f'... and {report.error_count - len(report.errors)} more')
+        self.stdout.write(f'Imported {report.created} tasks, skipped {report.error_count} rows')
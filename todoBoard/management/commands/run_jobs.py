@@ -0,0 +1,66 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from todoBoard.jobs import claim_jobs, requeue_stale_jobs, run_job, run_job_in_worker
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.JOB_WORKER_PROCESSES,
+                            help='Jobs run at the same time, 0 runs them one by one in this process')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between looks for new jobs')
+        parser.add_argument('--once', action='store_true', help='Exit once no job is due')
+
+    def handle(self, *args, **options):
+        if options['processes'] < 1:
+            self.run_inline(options)
+            return
+
+        processes = options['processes']
+        # Workers are forks of this process, with the Django setup already done
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('fork')) as pool:
+            running = {}
+            while True:
+                requeue_stale_jobs(settings.JOB_TIMEOUT)
+                job_ids = claim_jobs(processes - len(running))
+                if job_ids:
+                    # Forked workers must not share the database connection of this process
+                    connections.close_all()
+                for job_id in job_ids:
+                    running[pool.submit(run_job_in_worker, job_id)] = job_id
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, _ = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        self.report(job_id, future.result())
+                    except Exception as e:
+                        # The job stays running until requeue_stale_jobs queues it again
+                        self.stderr.write(f'Job {job_id}: worker failed, {e!r}')
+
+    def run_inline(self, options):
+        while True:
+            requeue_stale_jobs(settings.JOB_TIMEOUT)
+            job_ids = claim_jobs(1)
+            for job_id in job_ids:
+                self.report(job_id, run_job(job_id).status)
+            if not job_ids:
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+
+    def report(self, job_id, status):
+        self.stdout.write(f'Job {job_id}: {status}')
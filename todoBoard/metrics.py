@@ -0,0 +1,179 @@
+"""
+Board analytics: cumulative flow and cycle/lead times.
+
+Cumulative flow is read from BoardSnapshot rows, which every status change updates by a delta
+(apply_status_deltas). The first change of a day, and bulk operations, recount the board instead
+(refresh_snapshot), so a snapshot never drifts from the tasks for longer than a day.
+
+Cycle time (first move to "In Progress" until the last move to "Done") and lead time (creation until
+"Done") come from the status transitions of the task activity log. Percentiles are computed with NumPy
+and cached per board and day, covering the tasks finished before today.
+"""
+import datetime
+from collections import Counter
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Case, When, F, Q, Min, Max, Count, Value
+from django.utils import timezone
+
+from .models import BoardSnapshot, TaskActivity, TodoItem
+
+STATUSES = [status for status, _ in TodoItem.taskStatus]
+IN_PROGRESS = 'PR'
+DONE = 'DN'
+PERCENTILES = (50, 85, 95)
+CYCLE_TIMES_TIMEOUT = 60 * 60 * 24
+
+
+def record_transition(board_id, old_status=None, new_status=None):
+    """
+    Count a task moving from old_status to new_status, None for created and deleted tasks
+    """
+    deltas = Counter()
+    if old_status:
+        deltas[old_status] -= 1
+    if new_status:
+        deltas[new_status] += 1
+    apply_status_deltas(board_id, deltas)
+
+
+def apply_status_deltas(board_id, deltas):
+    """
+    Add {status: change of the number of tasks} to today's snapshot of the board.
+    Called once the changes are saved, the first call of a day recounts the board instead.
+    """
+    deltas = {status: delta for status, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    today = timezone.localdate()
+    updated = BoardSnapshot.objects.filter(board_id=board_id, date=today, status__in=deltas).update(
+        count=Case(*[When(status=status, then=F('count') + Value(delta)) for status, delta in deltas.items()],
+                   default=F('count')))
+    if not updated:
+        refresh_snapshot(board_id, today)
+
+
+def refresh_snapshot(board_id, date=None):
+    """
+    Recount today's (or date's) snapshot of the board from its tasks
+    """
+    counts = dict(TodoItem.objects.filter(board_id=board_id).order_by()
+                  .values_list('status').annotate(Count('pk')))
+    rows = [BoardSnapshot(board_id=board_id, date=date or timezone.localdate(), status=status,
+                          count=counts.get(status, 0))
+            for status in STATUSES]
+    BoardSnapshot.objects.bulk_create(rows, update_conflicts=True, unique_fields=['board', 'date', 'status'],
+                                      update_fields=['count'])
+
+
+def cumulative_flow(board, days=30) -> list:
+    """
+    Return [(date, {status: count})] of the last days, from the first snapshot of the board on
+    """
+    today = timezone.localdate()
+    start = today - datetime.timedelta(days=days - 1)
+    counts = {}
+    # The last snapshot before the period tells what the first days of it looked like
+    previous = (BoardSnapshot.objects.filter(board=board, date__lt=start)
+                .order_by('-date').values_list('date', flat=True).first())
+    for date, status, count in (BoardSnapshot.objects.filter(board=board, date__gte=previous or start)
+                                .values_list('date', 'status', 'count')):
+        counts.setdefault(date, {})[status] = count
+
+    series = []
+    last = None
+    day = previous or start
+    while day <= today:
+        last = counts.get(day, last)
+        if last is not None and day >= start:
+            series.append((day, {status: last.get(status, 0) for status in STATUSES}))
+        day += datetime.timedelta(days=1)
+    return series
+
+
+def cycle_time_stats(board, days=90) -> dict:
+    """
+    Cycle and lead time percentiles in hours of tasks finished during the days before today
+    """
+    today = timezone.localdate()
+    key = f'board_cycle_times:{board.pk}:{today.isoformat()}:{days}'
+    stats = cache.get(key)
+    if stats is None:
+        stats = _cycle_time_stats(board, today, days)
+        cache.set(key, stats, CYCLE_TIMES_TIMEOUT)
+    return stats
+
+
+def _cycle_time_stats(board, today, days) -> dict:
+    tz = timezone.get_current_timezone()
+    until = datetime.datetime.combine(today, datetime.time(), tzinfo=tz)
+    since = until - datetime.timedelta(days=days)
+
+    # One row per task still done, grouped by the database
+    rows = list(TaskActivity.objects
+                .filter(board_id=board.pk, action='updated', field='status', task__status=DONE)
+                .values('task_id')
+                .annotate(started=Min('created_at', filter=Q(new_value=IN_PROGRESS)),
+                          done=Max('created_at', filter=Q(new_value=DONE)),
+                          created=Min('task__created_at'))
+                .filter(done__gte=since, done__lt=until)
+                .values_list('created', 'started', 'done'))
+
+    lead_times, cycle_times = _durations(rows)
+    return {
+        'tasks': len(rows),
+        'percentiles': PERCENTILES,
+        'lead_time': percentiles(lead_times),
+        'cycle_time': percentiles(cycle_times),
+    }
+
+
+def _durations(rows):
+    """
+    Return (lead times, cycle times) in hours of (created, started, done) rows.
+    Tasks never moved to "In Progress" have no cycle time.
+    """
+    created = np.array([row[0].timestamp() for row in rows], dtype=float)
+    started = np.array([row[1].timestamp() if row[1] else np.nan for row in rows], dtype=float)
+    done = np.array([row[2].timestamp() for row in rows], dtype=float)
+    cycle_times = (done - started) / 3600
+    return (done - created) / 3600, cycle_times[cycle_times >= 0]
+
+
+def percentiles(values, qs=PERCENTILES) -> list:
+    """
+    Linearly interpolated percentiles, None for no values
+    """
+    if not len(values):
+        return [None] * len(qs)
+    return [float(value) for value in np.percentile(values, qs)]
+
+
+def cumulative_flow_chart(series, width=720, height=240) -> list:
+    """
+    SVG polygon points of every status band of a stacked cumulative flow chart, "Done" at the bottom
+    """
+    if not series:
+        return []
+    top = max(sum(counts.values()) for _, counts in series) or 1
+    step = width / max(len(series) - 1, 1)
+
+    bands = []
+    below = [0] * len(series)
+    for status in reversed(STATUSES):
+        above = [base + counts[status] for base, (_, counts) in zip(below, series)]
+        upper = [(i * step, height - value * height / top) for i, value in enumerate(above)]
+        lower = [(i * step, height - value * height / top) for i, value in enumerate(below)]
+        if len(series) == 1:
+            # A single day is drawn as a full width bar
+            upper.append((width, upper[0][1]))
+            lower.append((width, lower[0][1]))
+        points = upper + lower[::-1]
+        bands.append({
+            'status': status,
+            'label': dict(TodoItem.taskStatus)[status],
+            'points': ' '.join(f'{x:.1f},{y:.1f}' for x, y in points),
+        })
+        below = above
+    return bands
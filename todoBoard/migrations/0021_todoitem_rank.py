@@ -0,0 +1,55 @@
+# Generated by Django 4.2.1 on 2026-10-18 19:27
+
+from django.db import migrations, models
+
+# Copy of todoBoard.ranking as of this migration, later changes there must not alter it
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+KEY_WIDTH = 6
+
+
+def _encode(number, width):
+    digits = []
+    for _ in range(width):
+        number, remainder = divmod(number, BASE)
+        digits.append(DIGITS[remainder])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def rank_sequence(count):
+    width = KEY_WIDTH
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [_encode(step * (index + 1), width) for index in range(count)]
+
+
+def set_initial_ranks(apps, schema_editor):
+    TodoItem = apps.get_model('todoBoard', 'TodoItem')
+    columns = TodoItem.objects.values_list('board_id', 'status').distinct().order_by()
+    for board_id, status in columns:
+        # Keep the order cards had so far (creation order)
+        tasks = list(TodoItem.objects.filter(board_id=board_id, status=status).order_by('pk').only('pk', 'rank'))
+        for task, rank in zip(tasks, rank_sequence(len(tasks))):
+            task.rank = rank
+        TodoItem.objects.bulk_update(tasks, ['rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0020_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todoitem',
+            name='rank',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['board', 'status', 'rank'], name='todoitem_board_status_rank'),
+        ),
+        migrations.RunPython(set_initial_ranks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.1 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0021_todoitem_rank'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['board', 'created_at', 'id'], name='todoitem_board_created'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['board', 'status', 'created_at', 'id'], name='todoitem_board_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['board', 'assignee', 'created_at', 'id'], name='todoitem_board_assignee_crt'),
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(condition=models.Q(('high_priority', True)), fields=['board', 'created_at', 'id'], name='todoitem_board_priority_crt'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.1 on 2026-10-18 19:36
+
+from django.db import migrations, models
+
+# allowed_users has an auto-created through model, so its extra index cannot be declared on a Meta
+ALLOWED_USERS_INDEX = models.Index(fields=['customuser', 'todolist'], name='todolist_allowed_user_board')
+
+
+def add_allowed_users_index(apps, schema_editor):
+    through = apps.get_model('todoBoard', 'TodoList').allowed_users.through
+    schema_editor.add_index(through, ALLOWED_USERS_INDEX)
+
+
+def remove_allowed_users_index(apps, schema_editor):
+    through = apps.get_model('todoBoard', 'TodoList').allowed_users.through
+    schema_editor.remove_index(through, ALLOWED_USERS_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0022_todoitem_backlog_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['assignee', 'status'], name='todoitem_assignee_status'),
+        ),
+        migrations.AddIndex(
+            model_name='todolist',
+            index=models.Index(fields=['owner', 'is_archived'], name='todolist_owner_archived'),
+        ),
+        migrations.AddIndex(
+            model_name='todolist',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['id'], name='todolist_archived'),
+        ),
+        # Boards shared with a user, answered from the index alone
+        migrations.RunPython(add_allowed_users_index, remove_allowed_users_index),
+    ]
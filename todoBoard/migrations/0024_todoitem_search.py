@@ -0,0 +1,65 @@
+# Generated by Django 4.2.1 on 2026-10-18 19:52
+
+from django.db import migrations
+
+# The SQL is spelled out here, later changes to todoBoard.search must not alter this migration
+
+POSTGRESQL_CREATE = [
+    'ALTER TABLE "todoBoard_todoitem" ADD COLUMN "search_vector" tsvector GENERATED ALWAYS AS ('
+    "setweight(to_tsvector('english', coalesce(\"name\", '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(\"description\", '')), 'B')"
+    ') STORED',
+    'CREATE INDEX "todoitem_search_vector" ON "todoBoard_todoitem" USING GIN ("search_vector")',
+]
+
+# Dropping the column drops its index as well
+POSTGRESQL_DROP = ['ALTER TABLE "todoBoard_todoitem" DROP COLUMN "search_vector"']
+
+# The FTS5 table is filled from the existing tasks and kept in sync by triggers, bulk queries included
+SQLITE_CREATE = [
+    'CREATE VIRTUAL TABLE "todoBoard_todoitem_fts" USING fts5(name, description)',
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'SELECT "id", "name", coalesce("description", \'\') FROM "todoBoard_todoitem"',
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_insert" AFTER INSERT ON "todoBoard_todoitem" BEGIN '
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'VALUES (new."id", new."name", coalesce(new."description", \'\')); END',
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_update" AFTER UPDATE OF "name", "description" '
+    'ON "todoBoard_todoitem" BEGIN '
+    'DELETE FROM "todoBoard_todoitem_fts" WHERE rowid = old."id"; '
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'VALUES (new."id", new."name", coalesce(new."description", \'\')); END',
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_delete" AFTER DELETE ON "todoBoard_todoitem" BEGIN '
+    'DELETE FROM "todoBoard_todoitem_fts" WHERE rowid = old."id"; END',
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER IF EXISTS "todoitem_fts_insert"',
+    'DROP TRIGGER IF EXISTS "todoitem_fts_update"',
+    'DROP TRIGGER IF EXISTS "todoitem_fts_delete"',
+    'DROP TABLE "todoBoard_todoitem_fts"',
+]
+
+
+def create_search_index(apps, schema_editor):
+    run(schema_editor, {'postgresql': POSTGRESQL_CREATE, 'sqlite': SQLITE_CREATE})
+
+
+def drop_search_index(apps, schema_editor):
+    run(schema_editor, {'postgresql': POSTGRESQL_DROP, 'sqlite': SQLITE_DROP})
+
+
+def run(schema_editor, statements_by_vendor):
+    # Other databases have no index, search falls back to icontains there
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0023_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0024_todoitem_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todolist',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.1 on 2026-10-18 20:41
+
+from django.db import migrations, models
+from django.db.models import F
+import django.utils.timezone
+
+
+def copy_created_at(apps, schema_editor):
+    TodoItem = apps.get_model('todoBoard', 'TodoItem')
+    TodoItem.objects.update(updated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0025_todolist_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todoitem',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(copy_created_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.1 on 2026-10-18 21:05
+
+from django.db import migrations
+
+# Copy of the triggers created by 0024_todoitem_search, for databases which applied it before it created them.
+# Their index was kept in sync by signals, which bulk queries bypassed, so it is rebuilt as well.
+SQLITE_STATEMENTS = [
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_insert" AFTER INSERT ON "todoBoard_todoitem" BEGIN '
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'VALUES (new."id", new."name", coalesce(new."description", \'\')); END',
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_update" AFTER UPDATE OF "name", "description" '
+    'ON "todoBoard_todoitem" BEGIN '
+    'DELETE FROM "todoBoard_todoitem_fts" WHERE rowid = old."id"; '
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'VALUES (new."id", new."name", coalesce(new."description", \'\')); END',
+    'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_delete" AFTER DELETE ON "todoBoard_todoitem" BEGIN '
+    'DELETE FROM "todoBoard_todoitem_fts" WHERE rowid = old."id"; END',
+    'DELETE FROM "todoBoard_todoitem_fts"',
+    'INSERT INTO "todoBoard_todoitem_fts" (rowid, name, description) '
+    'SELECT "id", "name", coalesce("description", \'\') FROM "todoBoard_todoitem"',
+]
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_STATEMENTS:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0026_todoitem_updated_at'),
+    ]
+
+    operations = [
+        # The triggers belong to 0024_todoitem_search and are dropped when it is reversed
+        migrations.RunPython(create_triggers, migrations.RunPython.noop),
+    ]
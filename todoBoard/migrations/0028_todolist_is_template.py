@@ -0,0 +1,18 @@
+# Generated by Django 4.2.1 on 2026-10-18 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0027_todoitem_search_triggers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='todolist',
+            name='is_template',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.1 on 2026-10-18 20:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0029_taskactivity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('status', models.CharField(choices=[('NS', 'Not started'), ('BL', 'Blocked'), ('PR', 'In Progress'), ('DN', 'Done')], max_length=15)),
+                ('count', models.IntegerField(default=0)),
+                ('board', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='todoBoard.todolist')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='boardsnapshot',
+            constraint=models.UniqueConstraint(fields=('board', 'date', 'status'), name='boardsnapshot_board_date_status'),
+        ),
+    ]
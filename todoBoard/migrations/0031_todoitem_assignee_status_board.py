@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2026-10-18 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0030_boardsnapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='todoitem',
+            name='todoitem_assignee_status',
+        ),
+        migrations.AddIndex(
+            model_name='todoitem',
+            index=models.Index(fields=['assignee', 'status', 'board'], name='todoitem_assignee_status_board'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 4.2.1 on 2026-10-18 22:03
+
+import django.core.validators
+from django.db import migrations, models
+
+# Copy of todoBoard.ranking as of this migration, later changes there must not alter it
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+KEY_WIDTH = 6
+
+
+def _encode(number, width):
+    digits = []
+    for _ in range(width):
+        number, remainder = divmod(number, BASE)
+        digits.append(DIGITS[remainder])
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def rank_sequence(count):
+    width = KEY_WIDTH
+    while BASE ** width <= count * 2:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [_encode(step * (index + 1), width) for index in range(count)]
+
+
+def repair_ranks(apps, schema_editor):
+    """
+    Rebalance columns holding keys typed into the task form, which the rank functions cannot read.
+    Valid keys keep their order, the others follow in creation order.
+    """
+    TodoItem = apps.get_model('todoBoard', 'TodoItem')
+    columns = (TodoItem.objects.exclude(rank__regex=r'^[0-9a-z]*$')
+               .values_list('board_id', 'status').distinct().order_by())
+    for board_id, status in columns:
+        tasks = list(TodoItem.objects.filter(board_id=board_id, status=status).only('pk', 'rank'))
+        tasks.sort(key=lambda task: (task.rank.strip(DIGITS) != '', task.rank, task.pk))
+        for task, rank in zip(tasks, rank_sequence(len(tasks))):
+            task.rank = rank
+        TodoItem.objects.bulk_update(tasks, ['rank'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todoBoard', '0032_backgroundjob_queue'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='todoitem',
+            name='rank',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, validators=[django.core.validators.RegexValidator('^[0123456789abcdefghijklmnopqrstuvwxyz]*$', 'Ranks may only contain 0-9 and a-z.')]),
+        ),
+        migrations.RunPython(repair_ranks, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,83 @@
+import hashlib
+
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import render, get_object_or_404
 from django.http import HttpResponseRedirect
 from django.contrib import messages
 from django.contrib.messages.views import SuccessMessageMixin
-from django.db.models import Q
+from django.middleware.csrf import get_token
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from . import user_boards
+from .permissions import board_access
 
-from .models import TodoList
 
+class SingleObjectCacheMixin:
+    """
+    Fetch the view object only once per request, no matter how many times get_object is called
+    """
+    def get_object(self, queryset=None):
+        if getattr(self, '_cached_object', None) is None:
+            self._cached_object = super().get_object(queryset)
+        return self._cached_object
 
-class UserAllowedRequiredMixin(LoginRequiredMixin, SuccessMessageMixin):
+
+class BoardViewerRequiredMixin(LoginRequiredMixin, SingleObjectCacheMixin):
+    model = None  # always set in the view
+
+    def dispatch(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        board = self.get_object()
+        if not board_access(request).can_access(board):
+            return render(request, 'forbidden.html')
+        return super().dispatch(request, *args, **kwargs)
+
+
+class BoardConditionalGetMixin:
+    """
+    Answer repeated GETs of an unchanged board page with 304, without loading its tasks.
+    Must come after BoardViewerRequiredMixin, which checks access and loads the board.
+    """
+    def get_etag(self, board):
+        user = self.request.user
+        role = 'superuser' if user.is_superuser else 'owner' if board.owner_id == user.pk else 'member'
+        # The page embeds a CSRF token, which only stays valid as long as the CSRF secret is the same.
+        # get_token makes sure the secret exists before anything is rendered.
+        get_token(self.request)
+        csrf_secret = self.request.META['CSRF_COOKIE']
+        # The sidebar lists the user's boards, which change with memberships on other boards too
+        boards_version = user_boards.version(user.pk)
+        key = f'{type(self).__name__}:{board.pk}:{board.version}:{user.pk}:{role}:{csrf_secret}:{boards_version}'
+        return quote_etag(hashlib.sha256(key.encode()).hexdigest()[:32])
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag(self.get_object())
+        # Pending messages are shown on the page, so it must be rendered
+        response = None
+        if not len(messages.get_messages(request)):
+            response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        # Browsers may keep the page, but have to revalidate it every time
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class UserAllowedRequiredMixin(LoginRequiredMixin, SingleObjectCacheMixin, SuccessMessageMixin):
     model = None  # always set in the view
     success_message = None
 
+    def get_queryset(self):
+        # The assignee is part of the task activity snapshot
+        return super().get_queryset().select_related('board', 'assignee')
+
     def dispatch(self, request, *args, **kwargs):
         task = self.get_object()
-        if not task.is_user_allowed(request.user):
+        if not board_access(request).can_access(task.board):
             messages.error(request, "You don't have permissions to edit tasks. Please contact board administrator.")
             return render(request, 'forbidden.html')
         return super().dispatch(request, *args, **kwargs)
@@ -27,7 +90,7 @@ class BoardAdminRequiredMixin(LoginRequiredMixin):
         board = get_board_from_kwargs(self.model, **kwargs)
         user = request.user
 
-        is_user_board_admin = TodoList.objects.filter(Q(pk=board.pk) & Q(owner=user)).exists()
+        is_user_board_admin = board.owner_id == user.pk
         if is_user_board_admin or user.is_superuser:
             return super().dispatch(request, *args, **kwargs)
         else:
@@ -41,11 +104,8 @@ class BoardEditorRequiredMixin(LoginRequiredMixin):
 
     def dispatch(self, request, *args, **kwargs):
         board = get_board_from_kwargs(self.model, **kwargs)
-        user = request.user
-
-        is_user_board_editor = TodoList.objects.filter(Q(pk=board.pk) & Q(allowed_users=user) | Q(owner=user)).exists()
 
-        if not (is_user_board_editor or user.is_superuser):
+        if not board_access(request).can_access(board):
             return render(request, template_name='forbidden.html')
 
         return super().dispatch(request, *args, **kwargs)
@@ -1,5 +1,40 @@
 from django.db import models
+from django.db.models import Count, F, Q
 from django.conf import settings
+from django.core.validators import RegexValidator
+from django.utils import timezone
+
+from .ranking import rank_after, DIGITS
+
+
+class TodoListQuerySet(models.QuerySet):
+    def with_task_stats(self):
+        """
+        Annotate each board with its total and per-status task counts in one aggregate query
+        """
+        # distinct=True keeps the counts correct when the queryset is also joined with allowed_users
+        return self.annotate(
+            task_count=Count('todoitem', distinct=True),
+            ns_count=Count('todoitem', filter=Q(todoitem__status='NS'), distinct=True),
+            bl_count=Count('todoitem', filter=Q(todoitem__status='BL'), distinct=True),
+            pr_count=Count('todoitem', filter=Q(todoitem__status='PR'), distinct=True),
+            dn_count=Count('todoitem', filter=Q(todoitem__status='DN'), distinct=True),
+        )
+
+    def accessible_to(self, user):
+        """
+        Boards owned by the user or shared with them. Membership is checked with an IN subquery
+        on the allowed_users through table, so no DISTINCT is needed and both sides of the OR
+        are read from indexes.
+        """
+        shared = self.model.allowed_users.through.objects.filter(customuser=user.pk).values('todolist')
+        return self.filter(Q(owner=user.pk) | Q(pk__in=shared))
+
+    def bump_version(self) -> int:
+        """
+        Mark boards as changed, which invalidates ETags of their pages
+        """
+        return self.update(version=F('version') + 1)
 
 #TODO: use django-guardian for more robust and enhanced permissions system (object level)
 class TodoList(models.Model):
@@ -9,22 +44,43 @@ class TodoList(models.Model):
             ("edit_board", "Allow user to edit board details"),
             ("delete_board", "Allow user to delete board"),
         ]
+        indexes = [
+            # Boards of a user, optionally split into active and archived ones
+            models.Index(fields=['owner', 'is_archived'], name='todolist_owner_archived'),
+            # Archived boards list only ever reads the (usually few) archived rows
+            models.Index(fields=['id'], name='todolist_archived', condition=Q(is_archived=True)),
+        ]
 
     title = models.CharField(max_length=150)
     description = models.CharField(max_length=200, null=True, blank=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     allowed_users = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name='allowed_boards', blank=True)
     is_archived = models.BooleanField(default=False)
+    # Templates are copied into new boards, see todoBoard.cloning
+    is_template = models.BooleanField(default=False)
+    # Increased on every change of the board or its tasks
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = TodoListQuerySet.as_manager()
 
     def __str__(self):
         return self.title
 
     def is_user_allowed(self, user) -> bool:
-        return user == self.owner or user in self.allowed_users.all() or user.is_superuser
+        if user.is_superuser or self.owner_id == user.pk:
+            return True
+        return self.allowed_users.filter(pk=user.pk).exists()
 
     def show_delete_button(self, user) -> bool:
         return self.is_user_allowed(user)
 
+    def members(self):
+        """
+        Owner and allowed users of the board, the users its tasks can be assigned to
+        """
+        shared = self.allowed_users.through.objects.filter(todolist=self.pk).values('customuser')
+        return self.allowed_users.model.objects.filter(Q(pk=self.owner_id) | Q(pk__in=shared))
+
 class TodoItem(models.Model):
     class Meta:
         permissions = [
@@ -32,6 +88,18 @@ class TodoItem(models.Model):
             ("edit_task", "Allow user to edit task details"),
             ("delete_task", "Allow user to delete task"),
         ]
+        indexes = [
+            # Kanban columns are read straight from this index, already in card order
+            models.Index(fields=['board', 'status', 'rank'], name='todoitem_board_status_rank'),
+            # Backlog pages are keyset-paginated on (created_at, id), optionally filtered
+            models.Index(fields=['board', 'created_at', 'id'], name='todoitem_board_created'),
+            models.Index(fields=['board', 'status', 'created_at', 'id'], name='todoitem_board_status_created'),
+            models.Index(fields=['board', 'assignee', 'created_at', 'id'], name='todoitem_board_assignee_crt'),
+            models.Index(fields=['board', 'created_at', 'id'], name='todoitem_board_priority_crt',
+                         condition=Q(high_priority=True)),
+            # Tasks assigned to a user, per status and board ("My tasks" pages are range scans of it)
+            models.Index(fields=['assignee', 'status', 'board'], name='todoitem_assignee_status_board'),
+        ]
 
     taskStatus = [
         ("NS", "Not started"),
@@ -47,11 +115,166 @@ class TodoItem(models.Model):
                                  related_name="assignee")
     board = models.ForeignKey(TodoList, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bulk updates bypass auto_now and have to set it themselves
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=15, choices=taskStatus, default=taskStatus[0][0])
     high_priority = models.BooleanField(default=False)
+    # Position inside the kanban column, see todoBoard.ranking. Only ever set by the app, never by forms.
+    rank = models.CharField(max_length=64, blank=True, default='', editable=False,
+                            validators=[RegexValidator(f'^[{DIGITS}]*$', 'Ranks may only contain 0-9 and a-z.')])
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.rank:
+            self.move_to_column_end()
+        super().save(*args, **kwargs)
+
+    def move_to_column_end(self):
+        """
+        Give the task a rank placing it after the last card of its current column
+        """
+        last_rank = (TodoItem.objects.filter(board_id=self.board_id, status=self.status)
+                     .exclude(pk=self.pk)
+                     .order_by('-rank')
+                     .values_list('rank', flat=True)
+                     .first())
+        self.rank = rank_after(last_rank or '')
+
     def is_user_allowed(self, user) -> bool:
-        return user == self.board.owner or user in self.board.allowed_users.all() or user.is_superuser
+        if user.is_superuser:
+            return True
+        return TodoList.objects.accessible_to(user).filter(pk=self.board_id).exists()
+
+    @classmethod
+    def group_by_status(cls, tasks) -> dict:
+        """
+        Split already loaded tasks into kanban columns in a single pass
+        """
+        grouped = {status: [] for status, _ in cls.taskStatus}
+        for task in tasks:
+            grouped.setdefault(task.status, []).append(task)
+        return grouped
+
+
+class BackgroundJob(models.Model):
+    """
+    Work running outside the request, polled by the client for progress.
+    Jobs are run by todoBoard.jobs, either in a thread of the web process or by `manage.py run_jobs`.
+    """
+    class Meta:
+        indexes = [
+            # Workers look for queued jobs which are due
+            models.Index(fields=['status', 'run_after'], name='backgroundjob_status_run_after'),
+        ]
+
+    jobStatus = [
+        ("QU", "Queued"),
+        ("RU", "Running"),
+        ("OK", "Finished"),
+        ("ER", "Failed"),
+    ]
+    kind = models.CharField(max_length=50)
+    board = models.ForeignKey(TodoList, on_delete=models.CASCADE, null=True, blank=True)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    status = models.CharField(max_length=2, choices=jobStatus, default=jobStatus[0][0])
+    processed = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    # Arguments of the job handler, JSON serializable
+    payload = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=1)
+    # Failed jobs are retried once this time has passed
+    run_after = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f'{self.kind} #{self.pk}'
+
+    @property
+    def progress(self) -> int:
+        if not self.total:
+            return 100 if self.status == "OK" else 0
+        return min(100, self.processed * 100 // self.total)
+
+
+class TaskActivity(models.Model):
+    """
+    Append-only history of task changes, one row per changed field.
+    Rows are written in batches by todoBoard.activity and outlive the tasks they describe,
+    so the foreign keys have no database constraints.
+    """
+    class Meta:
+        indexes = [
+            # Board history, newest first
+            models.Index(fields=['board', 'created_at'], name='taskactivity_board_created'),
+            # Task history, newest first
+            models.Index(fields=['task', 'created_at'], name='taskactivity_task_created'),
+        ]
+
+    actions = [
+        ("created", "Created"),
+        ("updated", "Updated"),
+        ("deleted", "Deleted"),
+    ]
+    # History is only read through the indexes above, single column ones would just slow down writes
+    board = models.ForeignKey(TodoList, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+                              related_name='+')
+    task = models.ForeignKey(TodoItem, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False,
+                             related_name='+')
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+                              db_index=False, null=True, blank=True, related_name='+')
+    action = models.CharField(max_length=10, choices=actions)
+    # Changed field of updates, empty otherwise
+    field = models.CharField(max_length=20, blank=True, default='')
+    old_value = models.TextField(null=True, blank=True)
+    new_value = models.TextField(null=True, blank=True)
+    # Time of the change, not of the write
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f'{self.action} {self.field or "task"} of task #{self.task_id}'
+
+    @property
+    def old_display(self):
+        return self._display(self.old_value)
+
+    @property
+    def new_display(self):
+        return self._display(self.new_value)
+
+    def _display(self, value):
+        if self.field == 'status':
+            return dict(TodoItem.taskStatus).get(value, value)
+        if self.field == 'high_priority':
+            return 'yes' if value == 'True' else 'no'
+        return value
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError('Task activity is append-only.')
+        super().save(*args, **kwargs)
+
+
+class BoardSnapshot(models.Model):
+    """
+    Number of tasks of a board per status at the end of a day, kept up to date by todoBoard.metrics.
+    Days without changes have no rows, they are the same as the day before.
+    """
+    class Meta:
+        constraints = [
+            # Also the index cumulative flow reads a board's days from
+            models.UniqueConstraint(fields=['board', 'date', 'status'], name='boardsnapshot_board_date_status'),
+        ]
+
+    board = models.ForeignKey(TodoList, on_delete=models.CASCADE, db_index=False)
+    date = models.DateField()
+    status = models.CharField(max_length=15, choices=TodoItem.taskStatus)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.board_id} {self.date} {self.status}: {self.count}'
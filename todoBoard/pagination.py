@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values) -> str:
+    """
+    Turn the ordering values of the last row on a page into an opaque URL-safe token
+    """
+    # isoformat keeps microseconds, which the cursor needs to be exact
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid cursor.')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def keyset_page(queryset, fields, cursor=None, page_size=50, descending=False):
+    """
+    Return (rows, next_cursor) for the page following cursor.
+    Rows are ordered by fields, which must end with a unique field (usually id) and
+    should be backed by a composite index, so every page is an index range scan.
+    """
+    ordering = [f'-{field}' if descending else field for field in fields]
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        values = _cursor_values(queryset.model, fields, decode_cursor(cursor))
+        queryset = queryset.filter(_after(fields, values, descending))
+
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    return rows, encode_cursor([getattr(rows[-1], field) for field in fields])
+
+
+def _cursor_values(model, fields, values) -> list:
+    """
+    Convert cursor values to the types of fields, a tampered cursor raises ValueError
+    """
+    if len(values) != len(fields):
+        raise ValueError('Invalid cursor.')
+    try:
+        values = [model._meta.get_field(field).to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError):
+        raise ValueError('Invalid cursor.')
+    if None in values:
+        raise ValueError('Invalid cursor.')
+    return values
+
+
+def _after(fields, values, descending):
+    """
+    Lexicographic "row comes after values" condition, e.g. for (created_at, id):
+    created_at > x OR (created_at = x AND id > y)
+    """
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for position, field in enumerate(fields):
+        equal_prefix = {f: v for f, v in zip(fields[:position], values[:position])}
+        condition |= Q(**equal_prefix, **{f'{field}__{lookup}': values[position]})
+
+    # Redundant bound on the leading column lets the database turn this into a plain index range
+    return Q(**{f'{fields[0]}__{lookup}e': values[0]}) & condition
@@ -0,0 +1,73 @@
+from .models import TodoList
+
+
+class BoardAccessResolver:
+    """
+    Answers "can this user access that board" and remembers every answer,
+    so a single request never asks the database twice about the same board.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._allowed = {}
+
+    def can_access(self, board) -> bool:
+        """
+        board can be either a TodoList instance or a board id
+        """
+        board_id = getattr(board, 'pk', board)
+        if board_id not in self._allowed:
+            self._allowed[board_id] = self._resolve(board, board_id)
+        return self._allowed[board_id]
+
+    def accessible_board_ids(self, boards) -> set:
+        """
+        Bulk form of can_access: return ids of the given boards (instances or ids) the user may access
+        """
+        board_ids = set()
+        unresolved = set()
+        for board in boards:
+            board_id = getattr(board, 'pk', board)
+            board_ids.add(board_id)
+            if board_id in self._allowed:
+                continue
+            allowed = self._resolve_without_query(board)
+            if allowed is None:
+                unresolved.add(board_id)
+            else:
+                self._allowed[board_id] = allowed
+
+        if unresolved:
+            allowed_ids = set(TodoList.objects.accessible_to(self.user)
+                              .filter(pk__in=unresolved)
+                              .values_list('pk', flat=True))
+            for board_id in unresolved:
+                self._allowed[board_id] = board_id in allowed_ids
+
+        return {board_id for board_id in board_ids if self._allowed[board_id]}
+
+    def _resolve(self, board, board_id) -> bool:
+        allowed = self._resolve_without_query(board)
+        if allowed is None:
+            allowed = TodoList.objects.accessible_to(self.user).filter(pk=board_id).exists()
+        return allowed
+
+    def _resolve_without_query(self, board):
+        if not self.user.is_authenticated:
+            return False
+        if self.user.is_superuser:
+            return True
+        if isinstance(board, TodoList) and board.owner_id == self.user.pk:
+            return True
+        return None
+
+
+def board_access(request) -> BoardAccessResolver:
+    """
+    Return the resolver bound to this request, creating it on first use
+    """
+    resolver = getattr(request, '_board_access', None)
+    if resolver is None or resolver.user is not request.user:
+        resolver = BoardAccessResolver(request.user)
+        request._board_access = resolver
+    return resolver
@@ -0,0 +1,151 @@
+"""
+Lexicographic rank keys used to order kanban cards inside a column.
+
+Keys are short strings over DIGITS compared character by character, so a key can always
+be generated between two neighbours and moving a card never renumbers the rest of the column.
+The first KEY_WIDTH characters act as a spaced integer, which keeps appends short.
+"""
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+
+KEY_WIDTH = 6
+STEP = BASE ** 3
+
+# Keys longer than this are a sign of many inserts at the same spot, the column gets rebalanced
+REBALANCE_LENGTH = 48
+
+
+def rank_between(before='', after='') -> str:
+    """
+    Return a key strictly between before and after.
+    Empty before means the start of the column, empty after means its end.
+    """
+    if after and before >= after:
+        raise ValueError(f'Rank "{before}" must be lower than "{after}".')
+
+    result = ''
+    position = 0
+    while True:
+        low = DIGITS.index(before[position]) if position < len(before) else 0
+        high = DIGITS.index(after[position]) if position < len(after) else BASE
+        middle = (low + high) // 2
+        if middle > low:
+            return result + DIGITS[middle]
+
+        result += DIGITS[low]
+        if high > low:
+            # result is already below after, only the lower bound matters from now on
+            after = ''
+        position += 1
+
+
+def rank_after(before='') -> str:
+    """
+    Key for a card appended at the end of a column
+    """
+    if not before:
+        return _encode(BASE ** KEY_WIDTH // 2)
+
+    number = _decode(before) + STEP
+    if number < BASE ** KEY_WIDTH:
+        return _encode(number)
+    return rank_between(before, '')
+
+
+def rank_before(after='') -> str:
+    """
+    Key for a card put at the top of a column
+    """
+    if not after:
+        return rank_after('')
+
+    number = _decode(after) - STEP
+    if number > 0:
+        return _encode(number)
+    return rank_between('', after)
+
+
+def rank_for_position(above='', below='') -> str:
+    """
+    Key for a card dropped between the cards ranked above and below (either may be empty)
+    """
+    if above and below and above < below:
+        return rank_between(above, below)
+    if above:
+        return rank_after(above)
+    return rank_before(below)
+
+
+def rank_sequence(count, before='', after='') -> list:
+    """
+    Return count ordered keys between before and after, evenly spaced where possible.
+    Used for bulk inserts and for rebalancing a column.
+    """
+    return list(iter_rank_sequence(count, before, after))
+
+
+def iter_rank_sequence(count, before='', after=''):
+    """
+    Lazy form of rank_sequence, for inserts too large to hold all keys in memory
+    """
+    if count <= 0:
+        return
+
+    if not before and not after:
+        width = KEY_WIDTH
+        while BASE ** width <= count * 2:
+            width += 1
+        step = BASE ** width // (count + 1)
+        for index in range(count):
+            yield _encode(step * (index + 1), width)
+        return
+
+    if not after and _decode(before) + STEP * count < BASE ** KEY_WIDTH:
+        start = _decode(before)
+        for index in range(count):
+            yield _encode(start + STEP * (index + 1))
+        return
+
+    # Every key starting with prefix sorts between before and after
+    prefix = rank_between(before, after)
+    yield prefix
+    for key in iter_rank_sequence(count - 1):
+        yield prefix + key
+
+
+def _encode(number, width=KEY_WIDTH) -> str:
+    digits = []
+    for _ in range(width):
+        number, remainder = divmod(number, BASE)
+        digits.append(DIGITS[remainder])
+    # Trailing zeros carry no ordering information and would leave no room below the key
+    return ''.join(reversed(digits)).rstrip('0')
+
+
+def _decode(key) -> int:
+    number = 0
+    for char in key[:KEY_WIDTH].ljust(KEY_WIDTH, '0'):
+        number = number * BASE + DIGITS.index(char)
+    return number
+
+
+def respace(tasks) -> list:
+    """
+    Give tasks evenly spaced keys in their current (rank, pk) order, without saving them.
+    Return the tasks in that order.
+    """
+    tasks = sorted(tasks, key=lambda task: (task.rank, task.pk))
+    for task, rank in zip(tasks, rank_sequence(len(tasks))):
+        task.rank = rank
+    return tasks
+
+
+def rebalance_column(tasks):
+    """
+    Rewrite ranks of a single column queryset with evenly spaced keys, keeping the current order.
+    Return the rewritten tasks.
+    """
+    model = tasks.model
+    tasks = respace(tasks.only('pk', 'rank', 'board', 'status'))
+    model.objects.bulk_update(tasks, ['rank'], batch_size=1000)
+    return tasks
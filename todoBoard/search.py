@@ -0,0 +1,90 @@
+"""
+Full-text search over task name and description.
+
+PostgreSQL keeps a generated tsvector column with a GIN index on the tasks table,
+SQLite keeps a separate FTS5 table in sync through triggers.
+Other databases fall back to plain icontains filtering.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+TASK_TABLE = 'todoBoard_todoitem'
+FTS_TABLE = 'todoBoard_todoitem_fts'
+
+# Text search configuration of the PostgreSQL search vector
+SEARCH_CONFIG = 'english'
+
+# Matches in the task name weigh more than matches in its description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+
+def search_tasks(tasks, query):
+    """
+    Filter a TodoItem queryset down to tasks matching query, best matches first
+    """
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(tasks, query)
+    if connection.vendor == 'sqlite':
+        return _search_sqlite(tasks, query)
+    return tasks.filter(Q(name__icontains=query) | Q(description__icontains=query)).order_by('-pk')
+
+
+def _search_postgresql(tasks, query):
+    ts_query = f"websearch_to_tsquery('{SEARCH_CONFIG}', %s)"
+    vector = f'"{TASK_TABLE}"."search_vector"'
+    return (tasks
+            .filter(RawSQL(f'{vector} @@ {ts_query}', (query,), output_field=BooleanField()))
+            .annotate(search_rank=RawSQL(f'ts_rank({vector}, {ts_query})', (query,), output_field=FloatField()))
+            .order_by('-search_rank', '-pk'))
+
+
+def _search_sqlite(tasks, query):
+    match = fts_match_expression(query)
+    if not match:
+        return tasks.none()
+
+    # Joined rather than filtered with a subquery, so bm25() is computed once per matching task.
+    # bm25() is lower for better matches.
+    return (tasks
+            .extra(tables=[FTS_TABLE],
+                   where=[f'"{FTS_TABLE}".rowid = "{TASK_TABLE}"."id"', f'"{FTS_TABLE}" MATCH %s'],
+                   params=[match],
+                   select={'search_rank': f'bm25("{FTS_TABLE}", {NAME_WEIGHT}, {DESCRIPTION_WEIGHT})'})
+            .order_by('search_rank', '-pk'))
+
+
+def fts_match_expression(query) -> str:
+    """
+    Turn free text typed by a user into a safe FTS5 query: every word must appear, the last one as a prefix
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def sqlite_trigger_statements() -> list:
+    """
+    Triggers keeping the SQLite FTS5 table in sync with the tasks table, bulk queries included
+    """
+    insert = (f'INSERT INTO "{FTS_TABLE}" (rowid, name, description) '
+              f'VALUES (new."id", new."name", coalesce(new."description", \'\'));')
+    delete = f'DELETE FROM "{FTS_TABLE}" WHERE rowid = old."id";'
+    return [
+        f'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_insert" AFTER INSERT ON "{TASK_TABLE}" BEGIN {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_update" AFTER UPDATE OF "name", "description" '
+        f'ON "{TASK_TABLE}" BEGIN {delete} {insert} END',
+        f'CREATE TRIGGER IF NOT EXISTS "todoitem_fts_delete" AFTER DELETE ON "{TASK_TABLE}" BEGIN {delete} END',
+    ]
+
+
+def install_sqlite_triggers(connection):
+    with connection.cursor() as cursor:
+        for statement in sqlite_trigger_statements():
+            cursor.execute(statement)
@@ -0,0 +1,59 @@
+from django.core.signals import request_finished
+from django.db import connections, transaction
+from django.db.models.signals import post_save, pre_delete, m2m_changed, post_migrate
+from django.dispatch import receiver
+from . import activity
+from .models import TodoList
+from .search import FTS_TABLE, install_sqlite_triggers
+from .user_boards import invalidate_user_boards
+
+
+# SQLite drops triggers whenever a migration rebuilds the tasks table, so they are put back after every migrate,
+# unless it went back to before the search index
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    connection = connections[using]
+    if (sender.name == 'todoBoard' and connection.vendor == 'sqlite'
+            and FTS_TABLE in connection.introspection.table_names()):
+        install_sqlite_triggers(connection)
+
+
+def board_user_ids(board) -> set:
+    return {board.owner_id, *board.allowed_users.values_list('pk', flat=True)}
+
+
+def invalidate_boards_of(user_ids):
+    # Right away for the rest of this transaction, and again once the change is visible to others
+    invalidate_user_boards(user_ids)
+    transaction.on_commit(lambda: invalidate_user_boards(user_ids))
+
+
+@receiver(post_save, sender=TodoList)
+def board_saved(sender, instance, created, **kwargs):
+    invalidate_boards_of({instance.owner_id} if created else board_user_ids(instance))
+
+
+# Members are read before the delete cascades to the allowed_users rows
+@receiver(pre_delete, sender=TodoList)
+def board_deleted(sender, instance, **kwargs):
+    invalidate_boards_of(board_user_ids(instance))
+
+
+@receiver(m2m_changed, sender=TodoList.allowed_users.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if reverse:
+        # user.allowed_boards was changed, only that user's list is affected
+        invalidate_boards_of({instance.pk})
+    elif action == 'pre_clear':
+        invalidate_boards_of(board_user_ids(instance))
+    else:
+        invalidate_boards_of(pk_set)
+
+
+# Sent once the response has been handed to the client, so writing the activity log never delays it
+@receiver(request_finished)
+def flush_task_activity(sender, **kwargs):
+    if activity.buffer.is_due():
+        activity.buffer.flush()
@@ -1,6 +1,12 @@
-from django.test import TestCase
+from unittest.mock import patch
+
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.test import TestCase, SimpleTestCase, override_settings
+from templatetags.assets import bundle_urls
 from templatetags.custom_filters import filter_status
 
+from todoBoard.management.commands.build_assets import BUNDLES
 from todoBoard.models import TodoItem, TodoList
 from users.models import CustomUser
 
@@ -30,3 +36,20 @@ class FilterStatusTemplateTagTest(TestCase):
         self.assertEqual(done_tasks.count(), 1)
 
 
+
+
+class BundleTemplateTagTest(SimpleTestCase):
+    def test_source_files_while_bundle_is_not_collected(self):
+        self.assertEqual(bundle_urls('app.css'), ['/static/vendor/bootstrap/bootstrap.min.css',
+                                                  '/static/css/todoPlanner/style.css'])
+        self.assertIn('/static/vendor/jquery/jquery.min.js', bundle_urls('app.js'))
+
+    def test_vendor_files_are_committed(self):
+        for sources in BUNDLES.values():
+            for source in sources:
+                self.assertIsNotNone(finders.find(source), source)
+
+    @override_settings(DEBUG=True)
+    def test_collected_bundle(self):
+        with patch.dict(staticfiles_storage.hashed_files, {'bundles/app.css': 'bundles/app.0123456789ab.css'}):
+            self.assertEqual(bundle_urls('app.css'), ['/static/bundles/app.0123456789ab.css'])
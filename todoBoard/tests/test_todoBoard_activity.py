@@ -0,0 +1,162 @@
+import json
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from todoBoard import activity
+from todoBoard.models import TodoList, TodoItem, TaskActivity
+from todoBoard.pagination import encode_cursor
+from users.models import CustomUser
+
+
+class ActivityTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.member = CustomUser.objects.create_user(username='memberUser', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.board.allowed_users.add(self.member)
+        self.task = TodoItem.objects.create(name='Task', board=self.board, author=self.user, status='NS')
+        self.client.force_login(self.user)
+        self.addCleanup(activity.buffer.flush)
+
+    def history(self, task=None):
+        activity.buffer.flush()
+        return list(TaskActivity.objects.filter(task=task or self.task).order_by('id')
+                    .values_list('action', 'field', 'old_value', 'new_value', 'actor'))
+
+
+class ActivityBufferTest(ActivityTestCase):
+    def test_changes_are_buffered_until_flushed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            before = activity.snapshot(self.task)
+            self.task.name = 'Renamed'
+            self.task.assignee = self.member
+            activity.record_changes(self.task, self.user, before)
+
+        self.assertFalse(TaskActivity.objects.exists())
+        self.assertEqual(self.history(), [
+            ('updated', 'name', 'Task', 'Renamed', self.user.pk),
+            ('updated', 'assignee', None, 'memberUser', self.user.pk),
+        ])
+
+    def test_rolled_back_changes_are_not_recorded(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            activity.record_created(self.task, self.user)
+
+        self.assertEqual(self.history(), [])
+
+    def test_flush_writes_one_insert(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                activity.record_created(self.task, self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(activity.buffer.flush(), 5)
+        self.assertEqual(len(queries), 1)
+
+    @override_settings(ACTIVITY_FLUSH_SIZE=2, ACTIVITY_FLUSH_INTERVAL=60)
+    def test_request_finished_flushes_full_buffer(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record_created(self.task, self.user)
+        self.client.get(reverse('index'))
+        self.assertFalse(TaskActivity.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record_deleted(self.task, self.user)
+        self.client.get(reverse('index'))
+        self.assertEqual(TaskActivity.objects.count(), 2)
+
+    def test_rows_are_append_only(self):
+        entry = TaskActivity.objects.create(board=self.board, task=self.task, action='created')
+
+        with self.assertRaises(ValueError):
+            entry.save()
+
+
+class TaskViewsActivityTest(ActivityTestCase):
+    def test_change_status(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_change_status', kwargs={'pk': self.task.pk}), {'new_status': 'PR'})
+
+        self.assertEqual(self.history(), [('updated', 'status', 'NS', 'PR', self.user.pk)])
+
+    def test_batch_move(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_batch_move'),
+                             json.dumps({'moves': [{'task_id': self.task.pk, 'new_status': 'DN'}]}),
+                             content_type='application/json')
+
+        self.assertEqual(self.history(), [('updated', 'status', 'NS', 'DN', self.user.pk)])
+
+    def test_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_update', kwargs={'pk': self.task.pk}), json.dumps({
+                'taskName': 'Renamed', 'taskAssignee': self.member.pk, 'taskStatus': 'NS', 'taskDescription': None,
+            }), content_type='application/json')
+
+        self.assertEqual(self.history(), [
+            ('updated', 'name', 'Task', 'Renamed', self.user.pk),
+            ('updated', 'assignee', None, 'memberUser', self.user.pk),
+        ])
+
+    def test_delete(self):
+        task_id = self.task.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_delete', kwargs={'pk': task_id}))
+
+        self.assertEqual(TaskActivity.objects.filter(task_id=task_id).count(), 0)
+        activity.buffer.flush()
+        self.assertEqual(TaskActivity.objects.get(task_id=task_id).old_value, 'Task')
+
+    def test_api_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('api:task', kwargs={'pk': self.task.pk}), {'high_priority': True},
+                              content_type='application/json')
+
+        self.assertEqual(self.history(), [('updated', 'high_priority', 'False', 'True', self.user.pk)])
+
+
+class TaskDetailActivityTest(ActivityTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        TaskActivity.objects.bulk_create([
+            TaskActivity(board=self.board, task=self.task, actor=self.member, action='updated', field='status',
+                         old_value='NS', new_value='PR', created_at=now - timedelta(minutes=i))
+            for i in range(25)
+        ])
+
+    def test_detail_shows_recent_activity(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            activity.record_created(self.task, self.user)
+
+        response = self.client.get(reverse('task_detail', kwargs={'pk': self.task.pk}))
+
+        entries = response.context['activity']
+        self.assertEqual(len(entries), 20)
+        self.assertEqual(entries[0].action, 'created')
+        self.assertContains(response, 'In Progress')
+        self.assertIsNotNone(response.context['activity_next_page_url'])
+
+    def test_older_pages(self):
+        response = self.client.get(reverse('task_detail', kwargs={'pk': self.task.pk}))
+
+        response = self.client.get(response.context['activity_next_page_url'])
+        self.assertEqual(response.json()['html'].count('activity-entry'), 5)
+        self.assertIsNone(response.json()['next_page_url'])
+
+    def test_tampered_cursor(self):
+        response = self.client.get(reverse('task_activity', kwargs={'pk': self.task.pk}),
+                                   {'cursor': encode_cursor([1, 'not an id'])})
+        self.assertEqual(response.status_code, 400)
+
+    def test_outsider_cannot_read_activity(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.client.force_login(outsider)
+
+        response = self.client.get(reverse('task_activity', kwargs={'pk': self.task.pk}))
+        self.assertRedirects(response, reverse('boards_list'))
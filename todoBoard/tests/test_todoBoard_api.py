@@ -0,0 +1,300 @@
+import base64
+import json
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from todoBoard import metrics
+from todoBoard.models import TodoList, TodoItem
+from users.models import CustomUser
+
+
+class ApiTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.member = CustomUser.objects.create_user(username='memberUser', password='testing123456')
+        self.outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.board.allowed_users.add(self.member)
+        self.client.force_login(self.user)
+
+    def send(self, method, url, data=None, **extra):
+        return getattr(self.client, method)(url, json.dumps(data), content_type='application/json', **extra)
+
+    def count_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url) if method == 'get' else self.send(method, url, data)
+        self.assertLess(response.status_code, 300, response.content)
+        return len(queries)
+
+
+class ApiAuthenticationTest(ApiTestCase):
+    def test_anonymous_request(self):
+        response = Client().get(reverse('api:boards'))
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Basic', response['WWW-Authenticate'])
+
+    def test_basic_auth(self):
+        credentials = base64.b64encode(b'memberUser:testing123456').decode()
+        response = Client().get(reverse('api:boards'), HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([board['id'] for board in response.json()['data']], [self.board.pk])
+
+    def test_wrong_basic_auth(self):
+        credentials = base64.b64encode(b'memberUser:wrong').decode()
+        response = Client().get(reverse('api:boards'), HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_session_writes_need_csrf_token(self):
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        response = client.post(reverse('api:boards'), {'title': 'New'}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_basic_auth_writes_skip_csrf(self):
+        credentials = base64.b64encode(b'testUser321:testing123456').decode()
+        response = Client(enforce_csrf_checks=True).post(reverse('api:boards'), {'title': 'New'},
+                                                         content_type='application/json',
+                                                         HTTP_AUTHORIZATION=f'Basic {credentials}')
+        self.assertEqual(response.status_code, 201)
+
+    def test_method_not_allowed(self):
+        response = self.client.put(reverse('api:boards'))
+        self.assertEqual(response.status_code, 405)
+        self.assertIn('error', response.json())
+
+
+class ApiBoardsTest(ApiTestCase):
+    def test_list_boards(self):
+        TodoList.objects.create(title='other board', owner=self.outsider)
+        TodoItem.objects.create(name='Task', author=self.user, board=self.board)
+
+        response = self.client.get(reverse('api:boards'))
+        self.assertEqual(response.json()['data'], [{
+            'id': self.board.pk, 'title': 'test_board', 'description': None, 'owner_id': self.user.pk,
+            'is_archived': False, 'version': self.board.version, 'task_count': 1,
+        }])
+
+    def test_list_boards_pages(self):
+        for i in range(3):
+            TodoList.objects.create(title=f'board {i}', owner=self.user)
+
+        response = self.client.get(reverse('api:boards'), {'limit': 3, 'fields': 'id'})
+        first_page = response.json()
+        self.assertEqual(len(first_page['data']), 3)
+        self.assertEqual(set(first_page['data'][0]), {'id'})
+
+        second_page = self.client.get(first_page['next']).json()
+        self.assertEqual(len(second_page['data']), 1)
+        self.assertIsNone(second_page['next'])
+
+    def test_unknown_fields(self):
+        response = self.client.get(reverse('api:boards'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_board(self):
+        response = self.send('post', reverse('api:boards'), {'title': 'New board', 'description': 'About'})
+        self.assertEqual(response.status_code, 201)
+        board = TodoList.objects.get(pk=response.json()['data']['id'])
+        self.assertEqual((board.title, board.owner), ('New board', self.user))
+
+    def test_create_board_invalid(self):
+        response = self.send('post', reverse('api:boards'), {'title': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.json()['errors'])
+
+    def test_update_board(self):
+        response = self.send('patch', reverse('api:board', args=(self.board.pk,)), {'title': 'Renamed'})
+        self.assertEqual(response.status_code, 200)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.title, 'Renamed')
+        self.assertEqual(response.json()['data']['version'], self.board.version)
+
+    def test_board_forbidden(self):
+        self.client.force_login(self.outsider)
+        response = self.client.get(reverse('api:board', args=(self.board.pk,)))
+        self.assertEqual(response.status_code, 403)
+
+    def test_board_not_found(self):
+        response = self.client.get(reverse('api:board', args=(self.board.pk + 100,)))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {'error': 'Not found.'})
+
+    def test_only_owner_deletes_board(self):
+        self.client.force_login(self.member)
+        self.assertEqual(self.client.delete(reverse('api:board', args=(self.board.pk,))).status_code, 403)
+
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.delete(reverse('api:board', args=(self.board.pk,))).status_code, 204)
+        self.assertFalse(TodoList.objects.filter(pk=self.board.pk).exists())
+
+    def test_conditional_get(self):
+        url = reverse('api:board', args=(self.board.pk,))
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        TodoList.objects.filter(pk=self.board.pk).bump_version()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ApiMembersTest(ApiTestCase):
+    def test_list_members(self):
+        response = self.client.get(reverse('api:board_members', args=(self.board.pk,)))
+        self.assertEqual([user['username'] for user in response.json()['data']], ['memberUser', 'testUser321'])
+
+    def test_add_and_remove_member(self):
+        url = reverse('api:board_members', args=(self.board.pk,))
+        response = self.send('post', url, {'user_ids': [self.outsider.pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.outsider, self.board.allowed_users.all())
+
+        response = self.client.delete(reverse('api:board_member', args=(self.board.pk, self.outsider.pk)))
+        self.assertEqual(response.status_code, 204)
+        self.assertNotIn(self.outsider, self.board.allowed_users.all())
+
+    def test_add_unknown_member(self):
+        response = self.send('post', reverse('api:board_members', args=(self.board.pk,)), {'user_ids': [999]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_members_managed_by_owner_only(self):
+        self.client.force_login(self.member)
+        response = self.send('post', reverse('api:board_members', args=(self.board.pk,)),
+                             {'user_ids': [self.outsider.pk]})
+        self.assertEqual(response.status_code, 403)
+
+
+class ApiTasksTest(ApiTestCase):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse('api:board_tasks', args=(self.board.pk,))
+
+    def create_tasks(self, count, **fields):
+        response = self.send('post', self.url, [{'name': f'Task {i}', **fields} for i in range(count)])
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()['data']
+
+    def test_create_single_task(self):
+        response = self.send('post', self.url, {'name': 'Single', 'status': 'PR', 'assignee_id': self.member.pk})
+        self.assertEqual(response.status_code, 201)
+        task = TodoItem.objects.get(pk=response.json()['data']['id'])
+        self.assertEqual((task.name, task.status, task.assignee, task.author), ('Single', 'PR', self.member, self.user))
+
+    def test_bulk_create_appends_to_columns(self):
+        existing = TodoItem.objects.create(name='Existing', author=self.user, board=self.board)
+        tasks = self.create_tasks(3)
+
+        ranks = [existing.rank] + [task['rank'] for task in tasks]
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), 4)
+
+    def test_bulk_create_bumps_version(self):
+        version = self.board.version
+        self.create_tasks(2)
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, version + 1)
+
+    def test_create_with_non_member_assignee(self):
+        response = self.send('post', self.url, [{'name': 'Task', 'assignee_id': self.outsider.pk}])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_create_in_archived_board(self):
+        TodoList.objects.filter(pk=self.board.pk).update(is_archived=True)
+        response = self.send('post', self.url, [{'name': 'Task'}])
+        self.assertEqual(response.status_code, 409)
+
+    def test_list_tasks_with_included_assignees(self):
+        self.create_tasks(3, assignee_id=self.member.pk)
+        self.create_tasks(1, status='DN')
+
+        response = self.client.get(self.url, {'include': 'assignee', 'fields': 'id,assignee_id', 'status': 'NS'})
+        payload = response.json()
+        self.assertEqual(len(payload['data']), 3)
+        self.assertEqual(set(payload['data'][0]), {'id', 'assignee_id'})
+        self.assertEqual([user['id'] for user in payload['included']['users']], [self.member.pk])
+
+    def test_list_tasks_pages(self):
+        created = self.create_tasks(5)
+        seen = []
+        url = self.url + '?limit=2'
+        while url:
+            payload = self.client.get(url).json()
+            seen += [task['id'] for task in payload['data']]
+            url = payload['next']
+        self.assertEqual(seen, [task['id'] for task in created])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'nope'}).status_code, 400)
+
+    def test_cursor_with_values_of_wrong_type(self):
+        cursor = base64.urlsafe_b64encode(json.dumps(['yesterday', 'one']).encode()).decode()
+        self.assertEqual(self.client.get(self.url, {'cursor': cursor}).status_code, 400)
+
+    def test_bulk_update(self):
+        first, second = self.create_tasks(2)
+        response = self.send('patch', self.url, [
+            {'id': first['id'], 'status': 'DN'},
+            {'id': second['id'], 'name': 'Renamed', 'assignee_id': self.member.pk},
+        ])
+        self.assertEqual(response.status_code, 200, response.content)
+
+        first_task, second_task = TodoItem.objects.order_by('pk')
+        self.assertEqual(first_task.status, 'DN')
+        self.assertNotEqual(first_task.rank, first['rank'])
+        self.assertEqual((second_task.name, second_task.assignee), ('Renamed', self.member))
+
+    def test_bulk_update_foreign_task(self):
+        other_board = TodoList.objects.create(title='other', owner=self.user)
+        task = TodoItem.objects.create(name='Elsewhere', author=self.user, board=other_board)
+        response = self.send('patch', self.url, [{'id': task.pk, 'name': 'Hijacked'}])
+        self.assertEqual(response.status_code, 400)
+        task.refresh_from_db()
+        self.assertEqual(task.name, 'Elsewhere')
+
+    def test_bulk_delete(self):
+        first, second = self.create_tasks(2)
+        response = self.send('delete', self.url, {'ids': [first['id'], 12345]})
+        self.assertEqual(response.json(), {'deleted': [first['id']]})
+        self.assertEqual(list(TodoItem.objects.values_list('pk', flat=True)), [second['id']])
+
+    def test_delete_in_archived_board(self):
+        first, second = self.create_tasks(2)
+        TodoList.objects.filter(pk=self.board.pk).update(is_archived=True)
+
+        self.assertEqual(self.send('delete', self.url, {'ids': [first['id']]}).status_code, 409)
+        self.assertEqual(self.client.delete(reverse('api:task', args=(second['id'],))).status_code, 409)
+        self.assertEqual(TodoItem.objects.count(), 2)
+
+    def test_task_detail(self):
+        task, = self.create_tasks(1)
+        url = reverse('api:task', args=(task['id'],))
+
+        self.assertEqual(self.client.get(url).json()['data']['name'], 'Task 0')
+        response = self.send('patch', url, {'description': 'Details'})
+        self.assertEqual(response.json()['data']['description'], 'Details')
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertFalse(TodoItem.objects.exists())
+
+    def test_task_detail_forbidden(self):
+        task, = self.create_tasks(1)
+        self.client.force_login(self.outsider)
+        self.assertEqual(self.client.get(reverse('api:task', args=(task['id'],))).status_code, 403)
+
+    def test_queries_do_not_grow_with_rows(self):
+        # The first change of a day recounts the board snapshot, later ones only update it
+        metrics.refresh_snapshot(self.board.pk)
+
+        def queries(count):
+            TodoItem.objects.all().delete()
+            created = self.count_queries('post', self.url, [{'name': f'Task {i}', 'assignee_id': self.member.pk,
+                                                             'status': ('NS', 'DN')[i % 2]} for i in range(count)])
+            ids = list(TodoItem.objects.values_list('pk', flat=True))
+            listed = self.count_queries('get', self.url + '?include=assignee')
+            updated = self.count_queries('patch', self.url, [{'id': pk, 'status': 'PR', 'name': 'Renamed'}
+                                                             for pk in ids])
+            deleted = self.count_queries('delete', self.url, {'ids': ids})
+            return created, listed, updated, deleted
+
+        self.assertEqual(queries(2), queries(20))
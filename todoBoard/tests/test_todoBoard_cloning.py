@@ -0,0 +1,113 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from todoBoard.cloning import clone_board
+from todoBoard.models import TodoList, TodoItem, BackgroundJob
+from todoBoard.ranking import iter_rank_sequence
+from users.models import CustomUser
+
+
+class CloneTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.member = CustomUser.objects.create_user(username='memberUser', password='testing123456')
+        self.former_member = CustomUser.objects.create_user(username='formerMember', password='testing123456')
+        self.board = TodoList.objects.create(title='Sprint 1', description='Two weeks', owner=self.user)
+        self.board.allowed_users.add(self.member)
+        for i, status in enumerate(['NS', 'PR', 'DN', 'NS', 'BL']):
+            TodoItem.objects.create(name=f'Task {i}', board=self.board, author=self.member, status=status,
+                                    assignee=[self.member, self.former_member][i % 2], high_priority=i == 0)
+
+    def tasks(self, board):
+        return list(board.todoitem_set.order_by('status', 'rank').values_list('name', 'status', 'assignee'))
+
+
+class CloneBoardTest(CloneTestCase):
+    def test_clone(self):
+        clone = clone_board(self.board, self.member, 'Sprint 2')
+
+        self.assertEqual((clone.title, clone.description, clone.owner), ('Sprint 2', 'Two weeks', self.member))
+        self.assertFalse(clone.is_template)
+        self.assertCountEqual(clone.allowed_users.all(), [self.user])
+        self.assertEqual([(name, status) for name, status, _ in self.tasks(clone)],
+                         [(name, status) for name, status, _ in self.tasks(self.board)])
+        self.assertTrue(clone.todoitem_set.get(name='Task 0').high_priority)
+        self.assertEqual(set(clone.todoitem_set.values_list('author', flat=True)), {self.member.pk})
+
+    def test_assignees_must_be_members(self):
+        clone = clone_board(self.board, self.user, 'Sprint 2')
+
+        self.assertEqual(clone.todoitem_set.get(name='Task 0').assignee, self.member)
+        self.assertIsNone(clone.todoitem_set.get(name='Task 1').assignee)
+
+    def test_reset_status_and_clear_assignees(self):
+        clone = clone_board(self.board, self.user, 'Sprint 2', reset_status=True, clear_assignees=True)
+
+        self.assertEqual([name for name, _, _ in self.tasks(clone)],
+                         [name for name, _, _ in self.tasks(self.board)])
+        self.assertEqual({(status, assignee) for _, status, assignee in self.tasks(clone)}, {('NS', None)})
+
+    def test_reset_status_with_task_added_after_counting(self):
+        # The source gains a task between count() and reading the rows
+        with patch('todoBoard.cloning.iter_rank_sequence', lambda count: iter_rank_sequence(count - 1)):
+            clone = clone_board(self.board, self.user, 'Sprint 2', reset_status=True)
+
+        self.assertEqual([name for name, _, _ in self.tasks(clone)],
+                         [name for name, _, _ in self.tasks(self.board)])
+
+    def test_template(self):
+        template = clone_board(self.board, self.user, 'Sprint template', as_template=True)
+
+        self.assertTrue(template.is_template)
+        self.assertFalse(clone_board(template, self.user, 'Sprint 3').is_template)
+
+    def test_source_is_unchanged(self):
+        tasks = self.tasks(self.board)
+        clone_board(self.board, self.user, 'Sprint 2', reset_status=True)
+
+        self.assertEqual(self.tasks(self.board), tasks)
+
+
+class BoardCloneViewTest(CloneTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.member)
+
+    def test_get(self):
+        response = self.client.get(reverse('board_clone', kwargs={'pk': self.board.pk}))
+        self.assertEqual(response.context['form'].initial['title'], 'Copy of Sprint 1')
+
+        response = self.client.get(reverse('board_save_template', kwargs={'pk': self.board.pk}))
+        self.assertTrue(response.context['form'].initial['reset_status'])
+
+    def test_clone(self):
+        response = self.client.post(reverse('board_clone', kwargs={'pk': self.board.pk}), {'title': 'Sprint 2'})
+
+        clone = TodoList.objects.get(title='Sprint 2')
+        self.assertRedirects(response, reverse('board_detail', kwargs={'pk': clone.pk}))
+        self.assertEqual(clone.todoitem_set.count(), 5)
+
+    def test_save_template(self):
+        self.client.post(reverse('board_save_template', kwargs={'pk': self.board.pk}),
+                         {'title': 'Sprint template', 'reset_status': 'on'})
+
+        self.assertTrue(TodoList.objects.get(title='Sprint template').is_template)
+
+    @override_settings(BOARD_CLONE_BACKGROUND_THRESHOLD=2)
+    def test_big_board_is_cloned_by_a_job(self):
+        # The job thread is started on commit, which never comes in a test case
+        self.client.post(reverse('board_clone', kwargs={'pk': self.board.pk}), {'title': 'Sprint 2'})
+
+        clone = TodoList.objects.get(title='Sprint 2')
+        job = BackgroundJob.objects.get(board=clone)
+        self.assertEqual((job.kind, job.total), ('board.clone', 5))
+        self.assertFalse(clone.todoitem_set.exists())
+
+    def test_outsider_is_forbidden(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.client.force_login(outsider)
+
+        self.client.post(reverse('board_clone', kwargs={'pk': self.board.pk}), {'title': 'Sprint 2'})
+        self.assertFalse(TodoList.objects.filter(title='Sprint 2').exists())
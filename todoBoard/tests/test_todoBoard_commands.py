@@ -0,0 +1,82 @@
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+
+from todoBoard.management.commands.bench_requests import CONFIGURATIONS
+from todoBoard.management.commands.build_assets import BUNDLES, minify_css
+from todoBoard.models import TodoList
+from users.models import CustomUser
+
+
+@override_settings(DEBUG=True)
+class BenchRequestsCommandTest(TestCase):
+    def test_reports_every_configuration(self):
+        out = StringIO()
+        call_command('bench_requests', tasks=5, stdout=out)
+
+        output = out.getvalue()
+        for name in CONFIGURATIONS:
+            self.assertIn(name, output)
+        self.assertIn('POST create task', output)
+
+    def test_leaves_no_data_behind(self):
+        users = CustomUser.objects.count()
+        call_command('bench_requests', tasks=5, stdout=StringIO())
+
+        self.assertEqual(CustomUser.objects.count(), users)
+        self.assertFalse(TodoList.objects.exists())
+
+    def test_leaves_shared_cache_alone(self):
+        cache.clear()
+        call_command('bench_requests', tasks=5, stdout=StringIO())
+
+        self.assertEqual(cache._cache, {})
+
+    @override_settings(DEBUG=False)
+    def test_refuses_to_run_without_debug(self):
+        with self.assertRaisesMessage(CommandError, 'DEBUG=True'):
+            call_command('bench_requests', tasks=5, stdout=StringIO())
+        self.assertFalse(TodoList.objects.exists())
+
+
+class BuildAssetsCommandTest(TestCase):
+    def setUp(self):
+        self.static_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.static_dir)
+        for sources in BUNDLES.values():
+            for source in sources:
+                path = self.static_dir / source
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(f'/* {source} */\n.a {{ color: red; }}\n/*# sourceMappingURL={path.name}.map */\n')
+
+    def build(self, **options):
+        with override_settings(STATICFILES_DIRS=[self.static_dir]):
+            call_command('build_assets', stdout=StringIO(), stderr=StringIO(), **options)
+
+    def test_builds_bundles(self):
+        self.build()
+
+        css = (self.static_dir / 'bundles/app.css').read_text()
+        self.assertIn('.a{color:red}', css)
+        self.assertNotIn('sourceMappingURL', css)
+        js = (self.static_dir / 'bundles/app.js').read_text()
+        self.assertLess(js.index('jquery'), js.index('bootstrap.bundle.min.js'))
+
+    def test_missing_vendor_file_skips_its_bundle_without_downloading(self):
+        (self.static_dir / 'vendor/jquery/jquery.min.js').unlink()
+
+        with patch('todoBoard.management.commands.build_assets.urllib.request.urlopen') as urlopen:
+            self.build()
+        urlopen.assert_not_called()
+        self.assertTrue((self.static_dir / 'bundles/app.css').exists())
+        self.assertFalse((self.static_dir / 'bundles/app.js').exists())
+
+    def test_minify_css(self):
+        self.assertEqual(minify_css('/* note */\n.a,\n.b > .c {\n  margin: 0 auto;\n  color: red;\n}\n'),
+                         '.a,.b > .c{margin:0 auto;color:red}')
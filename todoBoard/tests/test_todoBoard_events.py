@@ -0,0 +1,193 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+from unittest.mock import patch
+
+import uvicorn
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import TestCase, SimpleTestCase, TransactionTestCase, Client
+from django.urls import reverse
+
+from todoBoard import events
+from todoBoard.events import InProcessBroker
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.views import BoardEventsView
+from todoPlanner.asgi import application
+from users.models import CustomUser
+
+
+class InProcessBrokerTest(SimpleTestCase):
+    async def test_publish_from_other_thread(self):
+        broker = InProcessBroker()
+        async with broker.subscribe(1) as queue:
+            publisher = threading.Thread(target=broker.publish, args=(1, {'type': 'task_deleted', 'task_id': 5}))
+            publisher.start()
+            publisher.join()
+            broker.publish(2, {'type': 'task_deleted', 'task_id': 6})
+
+            self.assertEqual(await asyncio.wait_for(queue.get(), 1), {'type': 'task_deleted', 'task_id': 5})
+            self.assertTrue(queue.empty())
+
+        self.assertEqual(broker._subscribers, {})
+
+    async def test_slow_subscriber_resyncs(self):
+        broker = InProcessBroker()
+        broker.queue_size = 2
+        async with broker.subscribe(1) as queue:
+            for task_id in range(3):
+                broker.publish(1, {'type': 'task_deleted', 'task_id': task_id})
+            await asyncio.sleep(0)
+
+            self.assertEqual(queue.get_nowait(), {'type': 'resync'})
+            self.assertTrue(queue.empty())
+
+
+class TaskEventsTest(TestCase):
+    def setUp(self):
+        self.password = 'testing123456'
+        self.user = CustomUser.objects.create_user(username='testUser321', password=self.password)
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.task = TodoItem.objects.create(name='Foo', author=self.user, board=self.board)
+        self.client = Client()
+        self.client.login(username=self.user.username, password=self.password)
+
+        patcher = patch('todoBoard.events.get_broker')
+        self.broker = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+
+    def published(self):
+        return [(call.args[0], call.args[1]['type']) for call in self.broker.publish.call_args_list]
+
+    def test_change_status_publishes_move(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_change_status', args=(self.task.pk,)), {'new_status': 'PR'})
+
+        self.assertEqual(self.published(), [(self.board.pk, 'tasks_moved')])
+        move = self.broker.publish.call_args.args[1]['moves'][0]
+        self.assertEqual((move['task_id'], move['status']), (self.task.pk, 'PR'))
+
+    def test_batch_move_publishes_moves(self):
+        moves = {'moves': [{'task_id': self.task.pk, 'new_status': 'DN'}]}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_batch_move'), json.dumps(moves), content_type='application/json')
+
+        self.assertEqual(self.published(), [(self.board.pk, 'tasks_moved')])
+
+    def test_update_publishes_card(self):
+        data = {'taskName': 'Bar', 'taskAssignee': 'unassigned', 'taskStatus': 'NS', 'taskDescription': ''}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_update', args=(self.task.pk,)), json.dumps(data),
+                             content_type='application/json')
+
+        self.assertEqual(self.published(), [(self.board.pk, 'task_saved')])
+        self.assertIn('Bar', self.broker.publish.call_args.args[1]['html'])
+
+    def test_delete_publishes_removal(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('task_delete', args=(self.task.pk,)))
+
+        self.assertEqual(self.published(), [(self.board.pk, 'task_deleted')])
+
+    def test_nothing_published_without_commit(self):
+        self.client.post(reverse('task_delete', args=(self.task.pk,)))
+        self.assertEqual(self.published(), [])
+
+
+class BoardEventsViewTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.other_user = CustomUser.objects.create_user(username='otherUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+
+    @patch.object(BoardEventsView, 'heartbeat_interval', 0.1)
+    @patch.object(BoardEventsView, 'max_duration', 0.5)
+    async def test_stream_delivers_board_events(self):
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(reverse('board_events', args=(self.board.pk,)))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        stream = response.streaming_content
+        self.assertEqual(await anext(stream), b'retry: 5000\n\n')
+        events.get_broker().publish(self.board.pk, {'type': 'task_deleted', 'task_id': 1})
+        self.assertEqual(await anext(stream), b'data: {"type": "task_deleted", "task_id": 1}\n\n')
+
+        # Heartbeats follow until the stream ends and unsubscribes
+        rest = [chunk async for chunk in stream]
+        self.assertIn(b': keep-alive\n\n', rest)
+        self.assertNotIn(self.board.pk, events.get_broker()._subscribers)
+
+    async def test_stream_user_not_allowed(self):
+        await sync_to_async(self.async_client.force_login)(self.other_user)
+        response = await self.async_client.get(reverse('board_events', args=(self.board.pk,)))
+        self.assertEqual(response.status_code, 403)
+
+    def test_wsgi_request_gets_no_stream(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('board_events', args=(self.board.pk,)))
+        self.assertEqual(response.status_code, 204)
+
+
+@patch.object(BoardEventsView, 'heartbeat_interval', 0.1)
+@patch.object(BoardEventsView, 'max_duration', 1)
+class BoardEventsServerTest(TransactionTestCase):
+    """
+    The stream as served in production, by the ASGI application
+    """
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.client.force_login(self.user)
+        self.cookie = f'{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        self.path = reverse('board_events', args=(self.board.pk,))
+
+    async def test_asgi_application_sends_live_events(self):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': self.path, 'raw_path': self.path.encode(), 'query_string': b'', 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'cookie', self.cookie.encode())],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        received = asyncio.Queue()
+        received.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+        sent = asyncio.Queue()
+
+        request = asyncio.create_task(application(scope, received.get, sent.put))
+        try:
+            start = await asyncio.wait_for(sent.get(), 5)
+            self.assertEqual((start['type'], start['status']), ('http.response.start', 200))
+            self.assertEqual((await asyncio.wait_for(sent.get(), 5))['body'], b'retry: 5000\n\n')
+
+            events.get_broker().publish(self.board.pk, {'type': 'task_deleted', 'task_id': 1})
+            message = await asyncio.wait_for(sent.get(), 5)
+            # Delivered while the response is still open
+            self.assertEqual(message['body'], b'data: {"type": "task_deleted", "task_id": 1}\n\n')
+            self.assertTrue(message['more_body'])
+        finally:
+            received.put_nowait({'type': 'http.disconnect'})
+            await asyncio.wait_for(request, 5)
+
+    def test_uvicorn_sends_live_events(self):
+        listener = socket.create_server(('127.0.0.1', 0))
+        server = uvicorn.Server(uvicorn.Config(application, lifespan='off', log_level='warning'))
+        thread = threading.Thread(target=server.run, kwargs={'sockets': [listener]}, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join, 5)
+        self.addCleanup(setattr, server, 'should_exit', True)
+
+        connection = http.client.HTTPConnection(*listener.getsockname(), timeout=5)
+        self.addCleanup(connection.close)
+        connection.request('GET', self.path, headers={'Host': 'testserver', 'Cookie': self.cookie})
+        response = connection.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.readline(), b'retry: 5000\n')
+        self.assertEqual(response.readline(), b'\n')
+
+        events.get_broker().publish(self.board.pk, {'type': 'task_deleted', 'task_id': 1})
+        line = response.readline()
+        # Heartbeats may come first
+        while line in (b': keep-alive\n', b'\n'):
+            line = response.readline()
+        self.assertEqual(line, b'data: {"type": "task_deleted", "task_id": 1}\n')
@@ -0,0 +1,168 @@
+import asyncio
+import csv
+import io
+import json
+import tempfile
+import zipfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from todoBoard import exports
+from todoBoard.exports import export_board
+from todoBoard.imports import import_tasks
+from todoBoard.models import TodoList, TodoItem
+from todoPlanner.asgi import application
+from users.models import CustomUser
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.member = CustomUser.objects.create_user(username='memberUser', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.board.allowed_users.add(self.member)
+        for i in range(5):
+            TodoItem.objects.create(name=f'Task {i}', board=self.board, author=self.user,
+                                    assignee=self.member if i % 2 else None, high_priority=i == 0)
+
+    def export(self, file_format) -> bytes:
+        return b''.join(export_board(self.board, file_format))
+
+
+class ExportBoardTest(ExportTestCase):
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export('csv').decode())))
+
+        self.assertEqual([row['name'] for row in rows], [f'Task {i}' for i in range(5)])
+        self.assertEqual(rows[1]['assignee'], 'memberUser')
+        self.assertEqual(rows[0]['assignee'], '')
+
+    def test_jsonl(self):
+        tasks = [json.loads(line) for line in self.export('jsonl').splitlines()]
+
+        self.assertEqual(len(tasks), 5)
+        self.assertIs(tasks[0]['high_priority'], True)
+        self.assertEqual(tasks[0]['author'], 'testUser321')
+
+    def test_zip(self):
+        with zipfile.ZipFile(io.BytesIO(self.export('zip'))) as archive:
+            self.assertEqual(json.loads(archive.read('board.json'))['title'], 'test_board')
+            members = json.loads(archive.read('members.json'))
+            self.assertEqual([member['username'] for member in members], ['testUser321', 'memberUser'])
+            self.assertEqual(len(archive.read('tasks.jsonl').splitlines()), 5)
+
+    def test_zip_includes_avatars(self):
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            self.member.profile.avatar.save('member.png', ContentFile(b'avatar'))
+
+            with zipfile.ZipFile(io.BytesIO(self.export('zip'))) as archive:
+                members = {member['username']: member for member in json.loads(archive.read('members.json'))}
+                self.assertIsNone(members['testUser321']['avatar'])
+                self.assertEqual(archive.read(members['memberUser']['avatar']), b'avatar')
+
+    def test_export_can_be_imported(self):
+        other_board = TodoList.objects.create(title='other_board', owner=self.user)
+        other_board.allowed_users.add(self.member)
+
+        report = import_tasks(other_board, self.user, io.BytesIO(self.export('csv')))
+
+        self.assertEqual(report.error_count, 0)
+        self.assertEqual(list(other_board.todoitem_set.order_by('rank').values_list('name', 'assignee')),
+                         list(self.board.todoitem_set.order_by('rank').values_list('name', 'assignee')))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_board(self.board, 'xlsx')
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.jsonl'
+            call_command('export_tasks', self.board.pk, str(path), format='jsonl', stdout=StringIO())
+
+            self.assertEqual(len(path.read_bytes().splitlines()), 5)
+
+
+class BoardExportViewTest(ExportTestCase):
+    def get(self, file_format):
+        return self.client.get(reverse('board_export', kwargs={'pk': self.board.pk}), {'format': file_format})
+
+    def test_streams_export(self):
+        self.client.force_login(self.member)
+        response = self.get('zip')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        self.assertIn(f'board-{self.board.pk}.zip', response['Content-Disposition'])
+        with zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content))) as archive:
+            self.assertIn('tasks.jsonl', archive.namelist())
+
+    def test_unknown_format(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.get('xlsx').status_code, 400)
+
+    def test_outsider_is_forbidden(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.client.force_login(outsider)
+
+        response = self.get('csv')
+        self.assertFalse(response.streaming)
+        self.assertTemplateUsed(response, 'forbidden.html')
+
+
+@patch.object(exports, 'BUFFER_SIZE', 256)
+class BoardExportAsgiTest(TransactionTestCase):
+    """
+    Exports served by the ASGI application, as in production
+    """
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        TodoItem.objects.bulk_create([TodoItem(name=f'Task {i}', board=self.board, author=self.user, rank=f'{i + 1:06d}')
+                                      for i in range(50)])
+        self.client.force_login(self.user)
+        self.cookie = f'{settings.SESSION_COOKIE_NAME}={self.client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+    async def test_export_is_streamed_in_chunks(self):
+        path = reverse('board_export', kwargs={'pk': self.board.pk})
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': b'format=csv', 'root_path': '',
+            'headers': [(b'host', b'testserver'), (b'cookie', self.cookie.encode())],
+            'client': ('127.0.0.1', 50000), 'server': ('testserver', 80),
+        }
+        received = asyncio.Queue()
+        received.put_nowait({'type': 'http.request', 'body': b'', 'more_body': False})
+
+        exported = []
+        # Chunks the export generator produced before each body message was sent
+        produced_when_sent = []
+
+        def export(board, file_format):
+            for chunk in export_board(board, file_format):
+                exported.append(chunk)
+                yield chunk
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+            if message.get('body'):
+                produced_when_sent.append(len(exported))
+
+        with patch('todoBoard.views.export_board', export):
+            await asyncio.wait_for(application(scope, received.get, send), 10)
+
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertGreater(len(exported), 2)
+        # Every chunk goes out as soon as it is produced, not once the whole export is built
+        self.assertEqual(produced_when_sent, list(range(1, len(exported) + 1)))
+        body = b''.join(message.get('body', b'') for message in sent[1:])
+        self.assertEqual(body, b''.join(exported))
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(body.decode())))), 50)
@@ -1,5 +1,7 @@
 from django.test import TestCase
 from todoBoard.forms import CreateTaskForm
+from todoBoard.models import TodoList
+from users.models import CustomUser
 
 class TodoBoardFormsTest(TestCase):
     def test_create_task_form_missing_init_board_id(self):
@@ -12,4 +14,17 @@ class TodoBoardFormsTest(TestCase):
         with self.assertRaises(ValueError) as context:
             CreateTaskForm(init_board_id=1, user_id=None)  # pass dummy board value
 
-        self.assertEqual(str(context.exception), "Missing required argument 'init_board_id' or 'user_id'")
\ No newline at end of file
+        self.assertEqual(str(context.exception), "Missing required argument 'init_board_id' or 'user_id'")
+    def test_create_task_form_limits_choices_to_board(self):
+        owner = CustomUser.objects.create_user(username='owner', password='testing123456')
+        member = CustomUser.objects.create_user(username='member', password='testing123456')
+        CustomUser.objects.create_user(username='outsider', password='testing123456')
+        board = TodoList.objects.create(title='test_board', owner=owner)
+        board.allowed_users.add(member)
+        TodoList.objects.create(title='other_board', owner=owner)
+
+        form = CreateTaskForm(init_board_id=board.pk, user_id=owner.pk, board=board)
+
+        self.assertCountEqual(form.fields['assignee'].queryset, [owner, member])
+        self.assertEqual(list(form.fields['board'].queryset), [board])
+        self.assertEqual(list(form.fields['author'].queryset), [owner])
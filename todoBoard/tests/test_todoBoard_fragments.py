@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.test import TestCase
+
+from todoBoard.fragments import render_task_fragments
+from todoBoard.models import TodoList, TodoItem
+from users.models import CustomUser
+
+
+class TaskFragmentsTest(TestCase):
+    def setUp(self):
+        caches['fragments'].clear()
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        TodoItem.objects.create(name='Foo', author=self.user, board=self.board)
+        TodoItem.objects.create(name='Bar', author=self.user, board=self.board, assignee=self.user)
+
+    def load_tasks(self):
+        return list(TodoItem.objects.select_related('assignee__profile').order_by('pk'))
+
+    def test_fragments_rendered(self):
+        tasks = render_task_fragments(self.load_tasks(), 'includes/task_card.html')
+        self.assertIn('Foo', tasks[0].html)
+        self.assertIn('draggable-card', tasks[0].html)
+        self.assertIn(self.user.username, tasks[1].html)
+
+    def test_warm_cache_skips_rendering(self):
+        render_task_fragments(self.load_tasks(), 'includes/task_card.html')
+
+        tasks = self.load_tasks()
+        with patch('todoBoard.fragments.get_template') as get_template, self.assertNumQueries(0):
+            render_task_fragments(tasks, 'includes/task_card.html')
+        get_template.assert_not_called()
+        self.assertIn('Foo', tasks[0].html)
+
+    def test_changed_task_rendered_again(self):
+        render_task_fragments(self.load_tasks(), 'includes/task_card.html')
+        task = TodoItem.objects.get(name='Foo')
+        task.name = 'Baz'
+        task.save()
+
+        tasks = render_task_fragments(self.load_tasks(), 'includes/task_card.html')
+        self.assertIn('Baz', tasks[0].html)
+
+    def test_context_is_part_of_key(self):
+        render_task_fragments(self.load_tasks(), 'includes/task_card.html')
+        tasks = render_task_fragments(self.load_tasks(), 'includes/task_card.html', readonly=True)
+        self.assertNotIn('draggable-card', tasks[0].html)
@@ -0,0 +1,157 @@
+import csv
+import tempfile
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from todoBoard.imports import import_tasks, format_of
+from todoBoard.models import TodoList, TodoItem
+from users.models import CustomUser
+
+CSV = b'''name,description,status,assignee,high_priority
+First,Some text,NS,memberUser,yes
+Second,,In progress,,
+,No name,,,
+Third,,unknown,,
+Fourth,,,outsider,
+Fifth,,DONE,testUser321,0
+'''
+
+
+class ImportTasksTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.member = CustomUser.objects.create_user(username='memberUser', password='testing123456')
+        CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.board.allowed_users.add(self.member)
+
+    def test_csv_import(self):
+        report = import_tasks(self.board, self.user, BytesIO(CSV))
+
+        self.assertEqual(report.created, 3)
+        self.assertEqual([line for line, _ in report.errors], [4, 5, 6])
+        first = TodoItem.objects.get(name='First')
+        self.assertEqual((first.status, first.assignee, first.high_priority), ('NS', self.member, True))
+        self.assertIsNone(TodoItem.objects.get(name='Second').description)
+        self.assertEqual(TodoItem.objects.get(name='Second').status, 'PR')
+        self.assertEqual(TodoItem.objects.get(name='Fifth').assignee, self.user)
+
+    def test_jsonl_import(self):
+        lines = b'{"name": "First", "high_priority": true}\nnot json\n\n[1]\n{"name": "Second", "status": "done"}\n'
+        report = import_tasks(self.board, self.user, BytesIO(lines), 'jsonl')
+
+        self.assertEqual(report.created, 2)
+        self.assertEqual([line for line, _ in report.errors], [2, 4])
+        self.assertTrue(TodoItem.objects.get(name='First').high_priority)
+
+    def test_tasks_are_appended_in_file_order(self):
+        TodoItem.objects.create(name='Existing', board=self.board, author=self.user, status='NS', rank='n')
+        rows = '\n'.join(f'Task {i},,ns,,' for i in range(50))
+        import_tasks(self.board, self.user, BytesIO(f'name,description,status,assignee,high_priority\n{rows}'.encode()),
+                     batch_size=7)
+
+        names = list(self.board.todoitem_set.order_by('rank').values_list('name', flat=True))
+        self.assertEqual(names, ['Existing'] + [f'Task {i}' for i in range(50)])
+
+    def test_bumps_board_version(self):
+        version = self.board.version
+        import_tasks(self.board, self.user, BytesIO(CSV))
+
+        self.board.refresh_from_db()
+        self.assertGreater(self.board.version, version)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            import_tasks(self.board, self.user, BytesIO(CSV), 'xlsx')
+
+    def test_file_that_is_not_utf8(self):
+        with self.assertRaisesMessage(ValueError, 'not UTF-8'):
+            import_tasks(self.board, self.user, BytesIO(b'name\nFirst\n\xff\xfe bad\n'))
+        self.assertFalse(self.board.todoitem_set.exists())
+
+    def test_invalid_csv(self):
+        field = 'x' * (csv.field_size_limit() + 1)
+        with self.assertRaisesMessage(ValueError, 'Line 3'):
+            import_tasks(self.board, self.user, BytesIO(f'name\nFirst\n"{field}"\n'.encode()))
+        self.assertFalse(self.board.todoitem_set.exists())
+
+    def test_nul_characters_rejected(self):
+        lines = b'{"name": "First\\u0000"}\n{"name": "Second", "description": "a\\u0000b"}\n{"name": "Third"}\n'
+        report = import_tasks(self.board, self.user, BytesIO(lines), 'jsonl')
+        self.assertEqual(report.created, 1)
+        self.assertEqual(report.errors, [(1, 'Values must not contain NUL characters.'),
+                                         (2, 'Values must not contain NUL characters.')])
+
+        report = import_tasks(self.board, self.user, BytesIO(b'name\nFo\x00o\n'))
+        self.assertEqual(report.created, 0)
+        self.assertEqual(report.error_count, 1)
+
+    def test_format_of(self):
+        self.assertEqual(format_of('tasks.CSV'), 'csv')
+        self.assertEqual(format_of('tasks.jsonl'), 'jsonl')
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'tasks.csv'
+            path.write_bytes(CSV)
+            out = StringIO()
+            call_command('import_tasks', self.board.pk, str(path), author='testUser321',
+                         stdout=out, stderr=StringIO())
+
+        self.assertIn('Imported 3 tasks', out.getvalue())
+        self.assertEqual(self.board.todoitem_set.count(), 3)
+
+
+class BoardImportViewTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.url = reverse('board_import', kwargs={'pk': self.board.pk})
+        self.client.force_login(self.user)
+
+    def upload(self, content, name='tasks.csv'):
+        return self.client.post(self.url, {'file': SimpleUploadedFile(name, content)})
+
+    def test_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'board_import.html')
+
+    def test_valid_upload_redirects_to_board(self):
+        response = self.upload(b'name\nFirst\nSecond\n')
+
+        self.assertRedirects(response, reverse('board_detail', kwargs={'pk': self.board.pk}))
+        self.assertEqual(self.board.todoitem_set.count(), 2)
+
+    def test_upload_with_errors_lists_them(self):
+        response = self.upload(b'{"name": "First"}\n{"status": "NS"}\n', name='tasks.jsonl')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Name is required.')
+        self.assertEqual(self.board.todoitem_set.count(), 1)
+
+    def test_unreadable_file_is_a_form_error(self):
+        response = self.upload(b'name\n\xff\xfe bad\n')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context['form'], 'file', 'The file is not UTF-8 encoded text.')
+        self.assertFalse(self.board.todoitem_set.exists())
+
+    def test_archived_board(self):
+        self.board.is_archived = True
+        self.board.save()
+
+        self.upload(b'name\nFirst\n')
+        self.assertFalse(self.board.todoitem_set.exists())
+
+    def test_outsider_is_forbidden(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.client.force_login(outsider)
+
+        self.upload(b'name\nFirst\n')
+        self.assertFalse(self.board.todoitem_set.exists())
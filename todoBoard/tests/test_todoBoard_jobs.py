@@ -0,0 +1,172 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from todoBoard import jobs
+from todoBoard.cloning import create_board_copy
+from todoBoard.jobs import close_board, run_queued_job, claim_jobs, requeue_stale_jobs, handler
+from todoBoard.models import TodoList, TodoItem, BackgroundJob
+from users.models import CustomUser
+
+
+class CloseBoardJobTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321',
+                                                   email='test@example.com',
+                                                   password='testing123456')
+        self.board = TodoList.objects.create(title='dummy board', owner=self.user)
+        TodoItem.objects.bulk_create([
+            TodoItem(name=f'Task {i}', author=self.user, board=self.board, status=['NS', 'BL', 'PR', 'DN'][i % 4])
+            for i in range(10)
+        ])
+
+    def test_close_board(self):
+        # savepoint, UPDATE tasks, UPDATE board, recount and upsert the board snapshot, release savepoint
+        with self.assertNumQueries(6):
+            updated = close_board(self.board)
+
+        self.board.refresh_from_db()
+        self.assertEqual(updated, 8)
+        self.assertTrue(self.board.is_archived)
+        self.assertFalse(self.board.todoitem_set.exclude(status='DN').exists())
+
+    def test_run_close_board_job(self):
+        job = BackgroundJob.objects.create(kind='board.close', board=self.board, created_by=self.user, total=8,
+                                           payload={'chunk_size': 3})
+
+        job = run_queued_job(job.pk)
+
+        self.board.refresh_from_db()
+        self.assertEqual(job.status, 'OK')
+        self.assertEqual(job.processed, 8)
+        self.assertEqual(job.progress, 100)
+        self.assertIsNotNone(job.finished_at)
+        self.assertTrue(self.board.is_archived)
+        self.assertFalse(self.board.todoitem_set.exclude(status='DN').exists())
+
+
+class CloneBoardJobTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='dummy board', owner=self.user)
+        TodoItem.objects.bulk_create([
+            TodoItem(name=f'Task {i}', author=self.user, board=self.board, status='NS', rank=f'a{i}')
+            for i in range(8)
+        ])
+
+    def test_run_clone_board_job(self):
+        clone = create_board_copy(self.board, self.user, 'Copy')
+        job = BackgroundJob.objects.create(kind='board.clone', board=clone, created_by=self.user, total=8,
+                                           payload={'source_id': self.board.pk, 'chunk_size': 3})
+
+        job = run_queued_job(job.pk)
+
+        clone.refresh_from_db()
+        self.assertEqual(job.status, 'OK')
+        self.assertEqual(job.processed, 8)
+        self.assertEqual(clone.todoitem_set.count(), 8)
+        self.assertEqual(clone.version, 4)  # created, then one bump per chunk
+
+    def test_retried_clone_starts_over(self):
+        clone = create_board_copy(self.board, self.user, 'Copy')
+        TodoItem.objects.create(name='Copied before the failure', author=self.user, board=clone)
+        job = BackgroundJob.objects.create(kind='board.clone', board=clone, created_by=self.user, total=8,
+                                           payload={'source_id': self.board.pk}, attempts=1, max_attempts=3)
+
+        run_queued_job(job.pk)
+
+        self.assertEqual(clone.todoitem_set.count(), 8)
+
+
+class DeleteBoardJobTest(TestCase):
+    def test_delete_board_job(self):
+        user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        board = TodoList.objects.create(title='dummy board', owner=user)
+        TodoItem.objects.bulk_create([TodoItem(name=f'Task {i}', author=user, board=board) for i in range(5)])
+
+        with self.captureOnCommitCallbacks():
+            job = jobs.start_delete_board_job(board, user, 5)
+        board.refresh_from_db()
+        self.assertTrue(board.is_archived)
+
+        job.payload['chunk_size'] = 2
+        job.save()
+        job = run_queued_job(job.pk)
+
+        self.assertEqual((job.status, job.processed), ('OK', 5))
+        self.assertFalse(TodoList.objects.filter(pk=board.pk).exists())
+        self.assertFalse(TodoItem.objects.exists())
+
+
+@handler('test.flaky', max_attempts=2)
+def flaky_job(job):
+    job.processed += 1
+    job.save(update_fields=['processed'])
+    if job.processed < job.total:
+        raise RuntimeError('Try again')
+
+
+@override_settings(JOBS_RUN_IN_WORKER=True, JOB_RETRY_DELAY=10)
+class JobQueueTest(TestCase):
+    def test_enqueue_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            jobs.enqueue('test.unknown')
+
+    def test_jobs_are_claimed_once_due(self):
+        first = jobs.enqueue('test.flaky')
+        later = jobs.enqueue('test.flaky')
+        BackgroundJob.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(minutes=1))
+
+        self.assertEqual(claim_jobs(5), [first.pk])
+        self.assertEqual(claim_jobs(5), [])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.attempts), ('RU', 1))
+
+    def test_failed_job_is_retried_with_backoff(self):
+        job = jobs.enqueue('test.flaky', total=2)
+
+        with self.assertLogs('todoBoard.jobs', 'ERROR'):
+            job = run_queued_job(job.pk)
+        self.assertEqual((job.status, job.error, job.attempts), ('QU', 'Try again', 1))
+        self.assertAlmostEqual((job.run_after - timezone.now()).total_seconds(), 10, delta=2)
+        self.assertIsNone(job.finished_at)
+
+        job = run_queued_job(job.pk)
+        self.assertEqual((job.status, job.error, job.attempts), ('OK', '', 2))
+
+    def test_job_fails_after_last_attempt(self):
+        job = jobs.enqueue('test.flaky', total=3)
+
+        with self.assertLogs('todoBoard.jobs', 'ERROR') as logs:
+            run_queued_job(job.pk)
+            job = run_queued_job(job.pk)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertEqual((job.status, job.attempts), ('ER', 2))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(jobs.retry_delay(3), 40)
+
+    def test_stale_jobs_are_queued_again(self):
+        retried = jobs.enqueue('test.flaky')
+        failed = jobs.enqueue('test.flaky')
+        claim_jobs(2)
+        BackgroundJob.objects.filter(pk=failed.pk).update(attempts=2)
+        BackgroundJob.objects.update(started_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(requeue_stale_jobs(3600), 2)
+
+        self.assertEqual(BackgroundJob.objects.get(pk=retried.pk).status, 'QU')
+        self.assertEqual(BackgroundJob.objects.get(pk=failed.pk).status, 'ER')
+
+    def test_run_jobs_command(self):
+        jobs.enqueue('test.flaky', total=1)
+        jobs.enqueue('test.flaky', total=1)
+        out = StringIO()
+
+        call_command('run_jobs', processes=0, once=True, stdout=out)
+
+        self.assertEqual(out.getvalue().count(': OK'), 2)
+        self.assertFalse(BackgroundJob.objects.exclude(status='OK').exists())
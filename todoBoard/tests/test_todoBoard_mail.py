@@ -0,0 +1,107 @@
+from django.core import mail
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.test import TestCase, override_settings
+
+from todoBoard import mail as queued_mail
+from todoBoard.debug_smtp import DebugSMTPServer
+from todoBoard.jobs import run_queued_job
+from todoBoard.models import BackgroundJob
+
+
+@override_settings(EMAIL_BACKEND='todoBoard.mail.QueuedEmailBackend', JOBS_RUN_IN_WORKER=True)
+class QueuedEmailBackendTest(TestCase):
+    def test_messages_are_queued(self):
+        message = EmailMultiAlternatives('Hello', 'Text', 'app@example.com', ['user@example.com'],
+                                         cc=['cc@example.com'], reply_to=['team@example.com'],
+                                         headers={'X-Board': '1'})
+        message.attach_alternative('<p>Text</p>', 'text/html')
+        message.attach('tasks.csv', 'name\nTask\n', 'text/csv')
+
+        self.assertEqual(message.send(), 1)
+
+        job = BackgroundJob.objects.get(kind='mail.send')
+        self.assertEqual(job.total, 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        queued = queued_mail.deserialize(job.payload['messages'][0])
+        self.assertEqual((queued.subject, queued.body, queued.from_email), ('Hello', 'Text', 'app@example.com'))
+        self.assertEqual((queued.to, queued.cc, queued.reply_to), (['user@example.com'], ['cc@example.com'],
+                                                                   ['team@example.com']))
+        self.assertEqual(queued.extra_headers, {'X-Board': '1'})
+        self.assertEqual(queued.alternatives, [('<p>Text</p>', 'text/html')])
+        self.assertEqual(queued.attachments, [('tasks.csv', 'name\nTask\n', 'text/csv')])
+
+    def test_send_mail_returns_immediately(self):
+        with self.assertNumQueries(1):
+            send_mail('Hello', 'Text', 'app@example.com', ['user@example.com', 'other@example.com'])
+
+        self.assertEqual(BackgroundJob.objects.get().payload['messages'][0]['to'],
+                         ['user@example.com', 'other@example.com'])
+
+    @override_settings(QUEUED_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_job_sends_messages(self):
+        send_mail('Hello', 'Text', 'app@example.com', ['user@example.com'])
+
+        job = run_queued_job(BackgroundJob.objects.get().pk)
+
+        self.assertEqual((job.status, job.processed, job.payload), ('OK', 1, {}))
+        self.assertEqual([message.subject for message in mail.outbox], ['Hello'])
+
+
+class SMTPConnectionTest(TestCase):
+    def setUp(self):
+        self.server = DebugSMTPServer().start()
+        self.addCleanup(self.server.stop)
+        self.addCleanup(queued_mail.connection.close)
+        settings = override_settings(EMAIL_BACKEND='todoBoard.mail.QueuedEmailBackend', JOBS_RUN_IN_WORKER=True,
+                                     QUEUED_EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+                                     EMAIL_HOST='127.0.0.1', EMAIL_PORT=self.server.port, EMAIL_USE_TLS=False,
+                                     EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='')
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def send_queued(self, *subjects):
+        for subject in subjects:
+            send_mail(subject, 'Text', 'app@example.com', ['user@example.com'])
+        for job in BackgroundJob.objects.filter(status='QU'):
+            self.assertEqual(run_queued_job(job.pk).status, 'OK')
+
+    def subjects(self):
+        return [message['Subject'] for _, _, message in self.server.messages]
+
+    def test_connection_is_reused_by_jobs(self):
+        self.send_queued('First', 'Second', 'Third')
+
+        self.assertEqual(self.subjects(), ['First', 'Second', 'Third'])
+        self.assertEqual(self.server.messages[0][:2], ('app@example.com', ['user@example.com']))
+        self.assertEqual(self.server.connections, 1)
+
+    def test_dropped_connection_is_opened_again(self):
+        self.send_queued('First')
+        # The server hung up while idle
+        queued_mail.connection.connection.connection.close()
+
+        self.send_queued('Second')
+
+        self.assertEqual(self.subjects(), ['First', 'Second'])
+        self.assertEqual(self.server.connections, 2)
+
+    def test_retry_skips_sent_messages(self):
+        messages = [queued_mail.serialize(EmailMultiAlternatives(subject, 'Text', 'app@example.com',
+                                                                 ['user@example.com']))
+                    for subject in ('Sent', 'Not sent')]
+        job = BackgroundJob.objects.create(kind='mail.send', total=2, processed=1, payload={'messages': messages})
+
+        run_queued_job(job.pk)
+
+        self.assertEqual(self.subjects(), ['Not sent'])
+
+    def test_failed_send_is_retried(self):
+        self.server.stop()
+        send_mail('Hello', 'Text', 'app@example.com', ['user@example.com'])
+
+        with self.assertLogs('todoBoard.jobs', 'ERROR'):
+            job = run_queued_job(BackgroundJob.objects.get().pk)
+
+        self.assertEqual((job.status, job.attempts, job.max_attempts), ('QU', 1, 5))
+        self.assertTrue(job.payload['messages'])
@@ -0,0 +1,148 @@
+import datetime
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from todoBoard import metrics
+from todoBoard.models import TodoList, TodoItem, BoardSnapshot, TaskActivity
+from users.models import CustomUser
+
+
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.today = timezone.localdate()
+        self.addCleanup(cache.clear)
+
+    def snapshot(self, date=None):
+        return dict(BoardSnapshot.objects.filter(board=self.board, date=date or self.today)
+                    .values_list('status', 'count'))
+
+
+class SnapshotTest(MetricsTestCase):
+    def test_first_change_of_the_day_recounts_the_board(self):
+        TodoItem.objects.create(name='Task', board=self.board, author=self.user, status='PR')
+
+        metrics.record_transition(self.board.pk, 'NS', 'PR')
+
+        self.assertEqual(self.snapshot(), {'NS': 0, 'BL': 0, 'PR': 1, 'DN': 0})
+
+    def test_later_changes_apply_deltas(self):
+        metrics.refresh_snapshot(self.board.pk)
+
+        with self.assertNumQueries(1):
+            metrics.record_transition(self.board.pk, new_status='NS')
+        metrics.record_transition(self.board.pk, 'NS', 'DN')
+        metrics.apply_status_deltas(self.board.pk, {'BL': 2, 'DN': -1})
+
+        self.assertEqual(self.snapshot(), {'NS': 0, 'BL': 2, 'PR': 0, 'DN': 0})
+
+    def test_views_keep_snapshot_up_to_date(self):
+        self.client.force_login(self.user)
+        task = TodoItem.objects.create(name='Task', board=self.board, author=self.user)
+        metrics.refresh_snapshot(self.board.pk)
+
+        self.client.post(reverse('task_change_status', kwargs={'pk': task.pk}), {'new_status': 'PR'})
+        self.assertEqual(self.snapshot(), {'NS': 0, 'BL': 0, 'PR': 1, 'DN': 0})
+
+        self.client.post(reverse('task_delete', kwargs={'pk': task.pk}))
+        self.assertEqual(self.snapshot(), {'NS': 0, 'BL': 0, 'PR': 0, 'DN': 0})
+
+
+class CumulativeFlowTest(MetricsTestCase):
+    def add_snapshot(self, days_ago, **counts):
+        BoardSnapshot.objects.bulk_create([
+            BoardSnapshot(board=self.board, date=self.today - timedelta(days=days_ago), status=status, count=count)
+            for status, count in counts.items()
+        ])
+
+    def test_days_without_snapshot_repeat_the_day_before(self):
+        self.add_snapshot(40, NS=5)
+        self.add_snapshot(2, NS=3, DN=2)
+
+        flow = metrics.cumulative_flow(self.board, days=4)
+
+        self.assertEqual([date for date, _ in flow], [self.today - timedelta(days=i) for i in (3, 2, 1, 0)])
+        self.assertEqual([counts['NS'] for _, counts in flow], [5, 3, 3, 3])
+        self.assertEqual(flow[-1][1], {'NS': 3, 'BL': 0, 'PR': 0, 'DN': 2})
+
+    def test_flow_starts_with_the_first_snapshot(self):
+        self.add_snapshot(1, NS=1)
+
+        self.assertEqual(len(metrics.cumulative_flow(self.board, days=30)), 2)
+
+    def test_chart(self):
+        self.add_snapshot(1, NS=1, DN=1)
+
+        bands = metrics.cumulative_flow_chart(metrics.cumulative_flow(self.board), width=100, height=10)
+
+        self.assertEqual([band['status'] for band in bands], ['DN', 'PR', 'BL', 'NS'])
+        self.assertEqual(bands[0]['points'], '0.0,5.0 100.0,5.0 100.0,10.0 0.0,10.0')
+
+
+class CycleTimeTest(MetricsTestCase):
+    def add_task(self, created, started, done):
+        task = TodoItem.objects.create(name='Task', board=self.board, author=self.user, status='DN')
+        TodoItem.objects.filter(pk=task.pk).update(created_at=created)
+        TaskActivity.objects.bulk_create([
+            TaskActivity(board=self.board, task=task, action='updated', field='status', old_value=old,
+                         new_value=new, created_at=time)
+            for old, new, time in (('NS', 'PR', started), ('PR', 'DN', done)) if time
+        ])
+        return task
+
+    def test_percentiles(self):
+        self.assertEqual(metrics.percentiles([1, 2, 3, 4], (0, 50, 100)), [1, 2.5, 4])
+        self.assertEqual(metrics.percentiles([], (50,)), [None])
+
+    def test_percentiles_match_numpy(self):
+        values = np.random.default_rng(7).exponential(40, 501)
+        self.assertEqual(metrics.percentiles(values), list(np.percentile(values, metrics.PERCENTILES)))
+
+    def test_cycle_and_lead_times(self):
+        midnight = datetime.datetime.combine(self.today, datetime.time(), tzinfo=timezone.get_current_timezone())
+        for days in (1, 2, 3):
+            done = midnight - timedelta(days=1)
+            self.add_task(done - timedelta(days=days * 2), done - timedelta(days=days), done)
+        # Never started, no cycle time
+        self.add_task(midnight - timedelta(hours=121), None, midnight - timedelta(hours=1))
+        # Finished today, only counted from tomorrow on
+        self.add_task(midnight, midnight, timezone.now())
+
+        stats = metrics.cycle_time_stats(self.board)
+
+        self.assertEqual(stats['tasks'], 4)
+        self.assertEqual(stats['cycle_time'][0], 48)
+        self.assertEqual(stats['lead_time'][0], 108)
+        self.assertEqual(stats['cycle_time'], list(np.percentile([24, 48, 72], metrics.PERCENTILES)))
+        self.assertEqual(stats['lead_time'], list(np.percentile([48, 96, 120, 144], metrics.PERCENTILES)))
+
+    def test_results_are_cached_for_the_day(self):
+        metrics.cycle_time_stats(self.board)
+
+        with self.assertNumQueries(0):
+            metrics.cycle_time_stats(self.board)
+
+
+class BoardMetricsViewTest(MetricsTestCase):
+    def test_get(self):
+        metrics.refresh_snapshot(self.board.pk)
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('board_metrics', kwargs={'pk': self.board.pk}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['flow']), 1)
+        self.assertContains(response, 'flow-band')
+
+    def test_outsider_is_forbidden(self):
+        outsider = CustomUser.objects.create_user(username='outsider', password='testing123456')
+        self.client.force_login(outsider)
+
+        response = self.client.get(reverse('board_metrics', kwargs={'pk': self.board.pk}))
+        self.assertTemplateUsed(response, 'forbidden.html')
@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.pagination import encode_cursor
+from todoBoard.views import MyTasksView
+from users.models import CustomUser
+
+
+class MyTasksViewTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.other_user = CustomUser.objects.create_user(username='otherUser321', password='testing123456')
+        self.first_board = TodoList.objects.create(title='First board', owner=self.other_user)
+        self.second_board = TodoList.objects.create(title='Second board', owner=self.other_user)
+        self.archived_board = TodoList.objects.create(title='Archived board', owner=self.other_user,
+                                                      is_archived=True)
+        for board in (self.second_board, self.first_board, self.archived_board):
+            TodoItem.objects.create(name=f'{board.title} task', board=board, author=self.other_user,
+                                    assignee=self.user, status='PR')
+        TodoItem.objects.create(name='Done task', board=self.first_board, author=self.other_user,
+                                assignee=self.user, status='DN')
+        TodoItem.objects.create(name='Not mine', board=self.first_board, author=self.other_user,
+                                assignee=self.other_user, status='PR')
+        self.client.force_login(self.user)
+
+    def test_tasks_are_grouped_by_board(self):
+        response = self.client.get(reverse('my_tasks'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['status'], 'PR')
+        self.assertEqual([task.name for task in response.context['tasks']],
+                         ['First board task', 'Second board task'])
+        self.assertEqual(response.context['statuses'],
+                         [('NS', 'Not started', 0), ('BL', 'Blocked', 0), ('PR', 'In Progress', 2), ('DN', 'Done', 1)])
+        self.assertContains(response, 'Second board')
+        self.assertNotContains(response, 'Archived board')
+
+    def test_status(self):
+        response = self.client.get(reverse('my_tasks'), {'status': 'DN'})
+
+        self.assertEqual([task.name for task in response.context['tasks']], ['Done task'])
+
+    def test_pages(self):
+        page_size = MyTasksView.page_size
+        MyTasksView.page_size = 1
+        self.addCleanup(setattr, MyTasksView, 'page_size', page_size)
+
+        response = self.client.get(reverse('my_tasks'))
+        self.assertEqual([task.name for task in response.context['tasks']], ['First board task'])
+
+        # Session, user, status counts, the page and the navbar avatar
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('my_tasks'), {'status': 'PR', 'cursor': response.context['next_cursor']})
+        self.assertEqual([task.name for task in response.context['tasks']], ['Second board task'])
+        self.assertIsNone(response.context['next_cursor'])
+
+    def test_invalid_cursor(self):
+        for cursor in ('nope', encode_cursor(['board', None])):
+            response = self.client.get(reverse('my_tasks'), {'cursor': cursor})
+
+            self.assertEqual(response.status_code, 400)
+
+    def test_user_not_logged_in(self):
+        self.client.logout()
+
+        response = self.client.get(reverse('my_tasks'))
+        self.assertEqual(response.status_code, 302)
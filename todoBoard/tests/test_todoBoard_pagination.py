@@ -0,0 +1,60 @@
+from django.test import TestCase, SimpleTestCase
+
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.pagination import encode_cursor, decode_cursor, keyset_page
+from users.models import CustomUser
+
+
+class CursorTest(SimpleTestCase):
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(['2023-05-01T10:00:00.123456', 7])),
+                         ['2023-05-01T10:00:00.123456', 7])
+
+    def test_invalid_cursor(self):
+        for cursor in ('not a cursor', encode_cursor([1])[:-2], 'eyJhIjogMX0='):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+class KeysetPageTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        for i in range(7):
+            TodoItem.objects.create(name=f'Task {i}', author=self.user, board=self.board)
+        self.tasks = TodoItem.objects.filter(board=self.board)
+
+    def test_pages_cover_all_rows_once(self):
+        seen = []
+        cursor = None
+        while True:
+            rows, cursor = keyset_page(self.tasks, ('created_at', 'id'), cursor, page_size=3)
+            seen += [row.pk for row in rows]
+            if cursor is None:
+                break
+
+        expected = list(self.tasks.order_by('created_at', 'id').values_list('pk', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_descending_pages(self):
+        rows, cursor = keyset_page(self.tasks, ('created_at', 'id'), page_size=4, descending=True)
+        more_rows, cursor = keyset_page(self.tasks, ('created_at', 'id'), cursor, page_size=4, descending=True)
+
+        expected = list(self.tasks.order_by('-created_at', '-id').values_list('pk', flat=True))
+        self.assertEqual([row.pk for row in rows + more_rows], expected)
+        self.assertIsNone(cursor)
+
+    def test_last_page_has_no_cursor(self):
+        rows, cursor = keyset_page(self.tasks, ('created_at', 'id'), page_size=7)
+        self.assertEqual(len(rows), 7)
+        self.assertIsNone(cursor)
+
+    def test_cursor_for_other_ordering_rejected(self):
+        _, cursor = keyset_page(self.tasks, ('created_at', 'id'), page_size=3)
+        with self.assertRaises(ValueError):
+            keyset_page(self.tasks, ('id',), cursor)
+
+    def test_cursor_with_values_of_wrong_type_rejected(self):
+        for values in (['yesterday', 1], ['2023-05-01T10:00:00', 'one'], [5, 1], [['nested'], {}], [None, 1]):
+            with self.subTest(values=values), self.assertRaises(ValueError):
+                keyset_page(self.tasks, ('created_at', 'id'), encode_cursor(values))
@@ -0,0 +1,54 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import TestCase, RequestFactory
+
+from todoBoard.models import TodoList
+from todoBoard.permissions import BoardAccessResolver, board_access
+from users.models import CustomUser
+
+
+class BoardAccessResolverTest(TestCase):
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user('boardOwner', 'owner@example.com', 'testing123456')
+        self.member = CustomUser.objects.create_user('boardMember', 'member@example.com', 'testing123456')
+        self.outsider = CustomUser.objects.create_user('outsider', 'outsider@example.com', 'testing123456')
+        self.board = TodoList.objects.create(title='shared board', owner=self.owner)
+        self.board.allowed_users.add(self.member)
+        self.other_board = TodoList.objects.create(title='private board', owner=self.outsider)
+
+    def test_owner_is_resolved_without_query(self):
+        resolver = BoardAccessResolver(self.owner)
+        with self.assertNumQueries(0):
+            self.assertTrue(resolver.can_access(self.board))
+
+    def test_member_answer_is_memoized(self):
+        resolver = BoardAccessResolver(self.member)
+        with self.assertNumQueries(1):
+            self.assertTrue(resolver.can_access(self.board.pk))
+            self.assertTrue(resolver.can_access(self.board))
+
+    def test_outsider_not_allowed(self):
+        self.assertFalse(BoardAccessResolver(self.outsider).can_access(self.board))
+
+    def test_anonymous_user_not_allowed(self):
+        with self.assertNumQueries(0):
+            self.assertFalse(BoardAccessResolver(AnonymousUser()).can_access(self.board.pk))
+
+    def test_superuser_allowed(self):
+        admin = CustomUser.objects.create_superuser('testAdmin321', 'admin@example.com', 'testing123456')
+        with self.assertNumQueries(0):
+            self.assertTrue(BoardAccessResolver(admin).can_access(self.board.pk))
+
+    def test_accessible_board_ids_single_query(self):
+        resolver = BoardAccessResolver(self.member)
+        with self.assertNumQueries(1):
+            allowed_ids = resolver.accessible_board_ids([self.board.pk, self.other_board.pk])
+            # Answers of the bulk lookup are reused
+            self.assertFalse(resolver.can_access(self.other_board))
+
+        self.assertEqual(allowed_ids, {self.board.pk})
+
+    def test_board_access_is_bound_to_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.member
+
+        self.assertIs(board_access(request), board_access(request))
@@ -0,0 +1,114 @@
+import re
+import unittest
+
+from django.db import connection
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from todoBoard.models import TodoList, TodoItem
+from users.models import CustomUser
+
+# Tables that grow with usage, reading any of them without an index is a regression
+HOT_TABLES = ('todoBoard_todoitem', 'todoBoard_todolist', 'todoBoard_todolist_allowed_users')
+
+
+class QueryRecorder:
+    """
+    Records every SELECT (with its parameters) a block of code sends to the database
+    """
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith('SELECT'):
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def full_scans(sql, params) -> list:
+    """
+    Return names of the hot tables the database would read in full to run the query
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            # "SCAN table" is a full table read, "SCAN table USING (COVERING) INDEX" is not
+            pattern = re.compile(r'^SCAN (\w+)$')
+            plan = [row[-1] for row in cursor.fetchall()]
+        else:
+            # Tiny test tables are cheaper to scan, so ask the planner to use an index whenever it can
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            pattern = re.compile(r'Seq Scan on "?(\w+)"?')
+            plan = [row[0] for row in cursor.fetchall()]
+
+    scans = []
+    for line in plan:
+        match = pattern.search(line.strip())
+        if match and match.group(1) in HOT_TABLES:
+            scans.append(match.group(1))
+    return scans
+
+
+@unittest.skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'EXPLAIN output is parsed for SQLite and PostgreSQL')
+class QueryPlanTest(TestCase):
+    """
+    Renders the busiest pages against a seeded database and checks the plan of every query they run
+    """
+    def setUp(self):
+        self.password = 'testing123456'
+        self.user = CustomUser.objects.create_user(username='testUser321', password=self.password)
+        self.other_user = CustomUser.objects.create_user(username='otherUser321', password=self.password)
+
+        for i in range(20):
+            owner = self.user if i % 2 else self.other_user
+            board = TodoList.objects.create(title=f'Board {i}', owner=owner, is_archived=i % 5 == 0)
+            board.allowed_users.add(self.other_user if owner == self.user else self.user)
+            for j in range(10):
+                TodoItem.objects.create(name=f'Task {i}.{j}', author=owner, board=board,
+                                        status=TodoItem.taskStatus[j % 4][0], high_priority=j % 3 == 0,
+                                        assignee=self.user if j % 2 else None)
+
+        self.board = TodoList.objects.filter(owner=self.user, is_archived=False).first()
+        self.task = self.board.todoitem_set.first()
+        self.client = Client()
+        self.client.login(username=self.user.username, password=self.password)
+
+    def assertNoFullScans(self, url, data=None):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.client.get(url, data)
+        self.assertEqual(response.status_code, 200)
+
+        for sql, params in recorder.queries:
+            self.assertEqual(full_scans(sql, params), [], f'Full table scan while rendering {url}:\n{sql}')
+
+    def test_full_scan_is_detected(self):
+        sql, params = TodoItem.objects.filter(name='Task 1.1').query.sql_with_params()
+        self.assertEqual(full_scans(sql, params), ['todoBoard_todoitem'])
+
+    def test_user_boards(self):
+        self.assertNoFullScans(reverse('boards_list'))
+
+    def test_archived_boards(self):
+        self.assertNoFullScans(reverse('archived_boards'))
+
+    def test_board_detail(self):
+        self.assertNoFullScans(reverse('board_detail', args=(self.board.pk,)))
+
+    def test_board_backlog(self):
+        url = reverse('board_backlog', args=(self.board.pk,))
+        self.assertNoFullScans(url)
+        self.assertNoFullScans(url, {'status': 'PR'})
+        self.assertNoFullScans(url, {'assignee': self.user.pk})
+        self.assertNoFullScans(url, {'high_priority': 'on'})
+
+    def test_task_detail(self):
+        self.assertNoFullScans(reverse('task_detail', args=(self.task.pk,)))
+
+    def test_my_tasks(self):
+        self.assertNoFullScans(reverse('my_tasks'))
+        self.assertNoFullScans(reverse('my_tasks'), {'status': 'DN'})
+
+    def test_user_profile(self):
+        self.assertNoFullScans(reverse('user_profile', args=(self.user.profile.pk,)))
@@ -0,0 +1,95 @@
+import importlib
+import random
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.test import TestCase, SimpleTestCase
+
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.ranking import rank_between, rank_after, rank_before, rank_for_position, rank_sequence, \
+    rebalance_column
+from users.models import CustomUser
+
+
+class RankKeysTest(SimpleTestCase):
+    def test_rank_between(self):
+        self.assertTrue('a' < rank_between('a', 'b') < 'b')
+        self.assertTrue('a' < rank_between('a', 'a1') < 'a1')
+        self.assertTrue(rank_between('', 'a') < 'a')
+        self.assertTrue(rank_between('zz', '') > 'zz')
+
+    def test_rank_between_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            rank_between('b', 'a')
+
+    def test_random_inserts_keep_order(self):
+        random.seed(42)
+        ranks = [rank_after()]
+        for _ in range(2000):
+            position = random.randint(0, len(ranks))
+            above = ranks[position - 1] if position > 0 else ''
+            below = ranks[position] if position < len(ranks) else ''
+            ranks.insert(position, rank_for_position(above, below))
+
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(set(ranks)), len(ranks))
+        self.assertFalse(any(rank.endswith('0') for rank in ranks))
+
+    def test_rank_after_and_before(self):
+        self.assertTrue(rank_after('i') > 'i')
+        self.assertTrue(rank_before('i') < 'i')
+        self.assertTrue(rank_before('0001') < '0001')
+
+    def test_rank_sequence(self):
+        for before, after in (('', ''), ('i', ''), ('i', 'j'), ('', 'a')):
+            ranks = rank_sequence(500, before, after)
+            self.assertEqual(len(ranks), 500)
+            self.assertEqual(ranks, sorted(ranks))
+            self.assertEqual(len(set(ranks)), 500)
+            self.assertTrue(ranks[0] > before)
+            if after:
+                self.assertTrue(ranks[-1] < after)
+
+
+class RankedTasksTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('testUser321', 'test@example.com', 'testing123456')
+        self.board = TodoList.objects.create(title='dummy board', owner=self.user)
+
+    def test_new_tasks_are_appended_to_column(self):
+        first = TodoItem.objects.create(name='Foo', author=self.user, board=self.board)
+        second = TodoItem.objects.create(name='Boo', author=self.user, board=self.board)
+
+        self.assertTrue(first.rank < second.rank)
+
+    def test_rebalance_column_keeps_order(self):
+        TodoItem.objects.bulk_create([
+            TodoItem(name='Foo', author=self.user, board=self.board, rank='a' * 60),
+            TodoItem(name='Boo', author=self.user, board=self.board, rank='b'),
+        ])
+
+        rebalance_column(TodoItem.objects.filter(board=self.board, status='NS'))
+
+        tasks = list(TodoItem.objects.filter(board=self.board).order_by('rank'))
+        self.assertEqual([task.name for task in tasks], ['Foo', 'Boo'])
+        self.assertTrue(all(len(task.rank) <= 6 for task in tasks))
+
+    def test_ranks_are_validated(self):
+        task = TodoItem(name='Foo', author=self.user, board=self.board, rank='Hello')
+        with self.assertRaises(ValidationError) as context:
+            task.full_clean()
+        self.assertIn('rank', context.exception.message_dict)
+
+    def test_migration_repairs_invalid_ranks(self):
+        TodoItem.objects.bulk_create([
+            TodoItem(name='Foo', author=self.user, board=self.board, rank='b'),
+            TodoItem(name='Typed', author=self.user, board=self.board, rank='Hello'),
+            TodoItem(name='Boo', author=self.user, board=self.board, rank='c'),
+        ])
+
+        migration = importlib.import_module('todoBoard.migrations.0033_todoitem_rank_not_editable')
+        migration.repair_ranks(apps, None)
+
+        tasks = list(TodoItem.objects.filter(board=self.board).order_by('rank'))
+        self.assertEqual([task.name for task in tasks], ['Foo', 'Boo', 'Typed'])
+        TodoItem.objects.create(name='Next', author=self.user, board=self.board)
@@ -0,0 +1,87 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from todoBoard.models import TodoList, TodoItem
+from todoBoard.search import search_tasks, fts_match_expression
+from users.models import CustomUser
+
+
+class SearchTasksTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        self.in_name = TodoItem.objects.create(name='Fix login redirect', author=self.user, board=self.board)
+        self.in_description = TodoItem.objects.create(name='Session bug', description='Login fails after redirect',
+                                                      author=self.user, board=self.board)
+        TodoItem.objects.create(name='Write docs', author=self.user, board=self.board)
+
+    def search(self, query):
+        return list(search_tasks(TodoItem.objects.all(), query))
+
+    def test_name_matches_rank_first(self):
+        self.assertEqual(self.search('login'), [self.in_name, self.in_description])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search('login docs'), [])
+        self.assertEqual(self.search('session login'), [self.in_description])
+
+    def test_prefix_match(self):
+        self.assertEqual(self.search('redir'), [self.in_name, self.in_description])
+
+    def test_update_and_delete_keep_index_in_sync(self):
+        self.in_name.name = 'Fix logout'
+        self.in_name.save()
+        self.assertEqual(self.search('logout'), [self.in_name])
+        self.assertEqual(self.search('login'), [self.in_description])
+
+        self.in_description.delete()
+        self.assertEqual(self.search('login'), [])
+
+    def test_bulk_queries_keep_index_in_sync(self):
+        created = TodoItem.objects.bulk_create([
+            TodoItem(name='Bulk login task', author=self.user, board=self.board, rank='a'),
+        ])
+        self.assertEqual(self.search('bulk'), created)
+
+        TodoItem.objects.filter(pk=created[0].pk).update(name='Renamed in bulk')
+        self.assertEqual(self.search('renamed'), created)
+
+        TodoItem.objects.filter(pk=created[0].pk).delete()
+        self.assertEqual(self.search('bulk'), [])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(fts_match_expression('"login" OR (bug*'), '"login" "OR" "bug"*')
+        self.assertEqual(fts_match_expression('-- *'), '')
+        self.assertEqual(self.search('-- *'), [])
+
+
+class TaskSearchViewTest(TestCase):
+    def setUp(self):
+        self.password = 'testing123456'
+        self.user = CustomUser.objects.create_user(username='testUser321', password=self.password)
+        other_user = CustomUser.objects.create_user(username='otherUser321', password=self.password)
+        self.board = TodoList.objects.create(title='test_board', owner=self.user)
+        other_board = TodoList.objects.create(title='other_board', owner=other_user)
+        TodoItem.objects.create(name='Visible report', author=self.user, board=self.board)
+        TodoItem.objects.create(name='Hidden report', author=other_user, board=other_board)
+        self.client = Client()
+        self.client.login(username=self.user.username, password=self.password)
+
+    def test_results_scoped_to_accessible_boards(self):
+        response = self.client.get(reverse('task_search'), {'q': 'report'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'search_results.html')
+        self.assertEqual([task.name for task in response.context['tasks']], ['Visible report'])
+
+    def test_results_paginated(self):
+        for i in range(30):
+            TodoItem.objects.create(name=f'Report {i}', author=self.user, board=self.board)
+
+        response = self.client.get(reverse('task_search'), {'q': 'report', 'page': 2})
+        self.assertEqual(response.context['page_obj'].number, 2)
+        self.assertEqual(len(response.context['tasks']), 6)
+
+    def test_empty_query(self):
+        response = self.client.get(reverse('task_search'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['tasks']), [])
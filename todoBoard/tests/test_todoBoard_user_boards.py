@@ -0,0 +1,67 @@
+from django.core.cache import cache
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from todoBoard.models import TodoList
+from todoBoard.user_boards import accessible_boards
+from users.models import CustomUser
+
+
+class AccessibleBoardsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.other_user = CustomUser.objects.create_user(username='otherUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='Own board', owner=self.user)
+        self.other_board = TodoList.objects.create(title='Other board', owner=self.other_user)
+
+    def test_list_cached(self):
+        self.assertEqual(accessible_boards(self.user), [(self.board.pk, 'Own board')])
+        with self.assertNumQueries(0):
+            self.assertEqual(accessible_boards(self.user), [(self.board.pk, 'Own board')])
+
+    def test_invalidated_by_members_change(self):
+        accessible_boards(self.user)
+
+        self.other_board.allowed_users.add(self.user)
+        self.assertEqual(accessible_boards(self.user), [(self.other_board.pk, 'Other board'), (self.board.pk, 'Own board')])
+
+        self.user.allowed_boards.remove(self.other_board)
+        self.assertEqual(accessible_boards(self.user), [(self.board.pk, 'Own board')])
+
+        self.other_board.allowed_users.add(self.user)
+        accessible_boards(self.user)
+        self.other_board.allowed_users.clear()
+        self.assertEqual(accessible_boards(self.user), [(self.board.pk, 'Own board')])
+
+    def test_invalidated_by_board_change(self):
+        self.other_board.allowed_users.add(self.user)
+        accessible_boards(self.user)
+
+        self.other_board.title = 'Renamed board'
+        self.other_board.save()
+        self.assertIn((self.other_board.pk, 'Renamed board'), accessible_boards(self.user))
+
+        self.other_board.delete()
+        self.assertEqual(accessible_boards(self.user), [(self.board.pk, 'Own board')])
+
+    def test_other_users_not_affected(self):
+        accessible_boards(self.other_user)
+        TodoList.objects.create(title='New board', owner=self.user)
+
+        with self.assertNumQueries(0):
+            accessible_boards(self.other_user)
+
+
+class SidebarBoardsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.board = TodoList.objects.create(title='Own board', owner=self.user)
+        self.client = Client()
+        self.client.login(username='testUser321', password='testing123456')
+
+    def test_sidebar_lists_boards(self):
+        response = self.client.get(reverse('boards_list'))
+        self.assertContains(response, 'Your boards')
+        self.assertContains(response, reverse('board_detail', args=(self.board.pk,)))
@@ -57,3 +57,19 @@ class TodoItemTest(TestCase):
 
         test_object.board.allowed_users.add(user)
         self.assertTrue(test_object.is_user_allowed(user))
+
+    def test_group_by_status(self):
+        user = CustomUser.objects.create_user('testUser321', 'test@example.com', 'testing123456')
+        test_board = TodoList.objects.create(title='test', description=None, owner=user)
+        tasks = TodoItem.objects.bulk_create([
+            TodoItem(name='Foo', author=user, board=test_board),
+            TodoItem(name='Boo', author=user, board=test_board, status='DN'),
+            TodoItem(name='Woo', author=user, board=test_board, status='DN'),
+        ])
+
+        grouped = TodoItem.group_by_status(tasks)
+
+        self.assertEqual(list(grouped), ['NS', 'BL', 'PR', 'DN'])
+        self.assertEqual([task.name for task in grouped['NS']], ['Foo'])
+        self.assertEqual(grouped['BL'], [])
+        self.assertEqual(len(grouped['DN']), 2)
@@ -1,6 +1,9 @@
+import re
 from json import dumps as json_dumps
 
+from django.db import connection
 from django.test import TestCase, Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.messages import get_messages
 
@@ -70,6 +73,19 @@ class TodoItemViewTest(TestCase):
         self.assertRedirects(response, f'/boards/{self.board.id}')
         self.assertTrue(created_task.exists(), 'Error! Task was not created')
 
+    def test_task_create_view_ignores_posted_rank(self):
+        self.login_user()
+        form_url = reverse('task_create', args=(self.board.id,))
+        form_data = {'name': 'foo', 'author': self.user.id, 'board': self.board.id, 'status': 'NS', 'rank': 'Hello'}
+
+        self.client.post(form_url, form_data)
+        response = self.client.post(form_url, {**form_data, 'name': 'boo'})
+
+        self.assertRedirects(response, f'/boards/{self.board.id}')
+        foo, boo = TodoItem.objects.get(name='foo'), TodoItem.objects.get(name='boo')
+        self.assertNotEqual(foo.rank, 'Hello')
+        self.assertLess(foo.rank, boo.rank)
+
     def test_task_create_view_board_id_not_present(self):
         """
         Raises value error due to omitted board_id in url
@@ -104,6 +120,17 @@ class TodoItemViewTest(TestCase):
         self.assertEqual(response.json()['success'], True)
         self.assertEqual(self.test_object.status, 'DN')
 
+    def test_task_views_bump_board_version(self):
+        self.login_user()
+
+        self.client.post(reverse('task_change_status', kwargs={'pk': self.test_object.pk}), {'new_status': 'PR'})
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 2)
+
+        self.client.post(reverse('task_delete', args=(self.test_object.pk,)))
+        self.board.refresh_from_db()
+        self.assertEqual(self.board.version, 3)
+
     def test_task_change_status_view_get_method(self):
         self.create_test_superuser()
         self.login_user(is_superuser=True)
@@ -113,6 +140,111 @@ class TodoItemViewTest(TestCase):
         self.assertEqual(response.status_code, 405)
         self.assertEqual(response.json()['error'], 'GET method is not allowed for this action')
 
+    def test_task_batch_move_view(self):
+        self.login_user()
+        other_task = TodoItem.objects.create(name='other_task', author=self.user, board=self.board)
+
+        moves = [
+            {'task_id': self.test_object.pk, 'new_status': 'PR'},
+            {'task_id': other_task.pk, 'new_status': 'BL'},
+            {'task_id': self.test_object.pk, 'new_status': 'DN'},
+        ]
+        response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                    content_type='application/json')
+
+        self.test_object.refresh_from_db()
+        other_task.refresh_from_db()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'success': True, 'moved': 2})
+        self.assertEqual(self.test_object.status, 'DN')
+        self.assertEqual(other_task.status, 'BL')
+
+    def test_task_batch_move_view_reorder(self):
+        self.login_user()
+        second = TodoItem.objects.create(name='second', author=self.user, board=self.board)
+        third = TodoItem.objects.create(name='third', author=self.user, board=self.board)
+
+        # Drag the last card to the top and the first card between the other two
+        moves = [
+            {'task_id': third.pk, 'new_status': 'NS', 'prev_id': None, 'next_id': self.test_object.pk},
+            {'task_id': self.test_object.pk, 'new_status': 'NS', 'prev_id': third.pk, 'next_id': second.pk},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        column = TodoItem.objects.filter(board=self.board, status='NS').order_by('rank')
+        self.assertEqual([task.name for task in column], ['third', 'test_task', 'second'])
+        # Only the moved cards were written
+        updates = [query for query in queries if query['sql'].startswith('UPDATE "todoBoard_todoitem"')]
+        self.assertEqual(len(updates), 1)
+        second_rank = second.rank
+        second.refresh_from_db()
+        self.assertEqual(second.rank, second_rank)
+
+    def test_task_batch_move_view_keys_never_exceed_rank_length(self):
+        self.login_user()
+        TodoItem.objects.filter(pk=self.test_object.pk).update(rank='a')
+        last = TodoItem.objects.create(name='last', author=self.user, board=self.board, rank='a' + '0' * 46 + '1')
+        dropped = [TodoItem.objects.create(name=f'task {i}', author=self.user, board=self.board, status='DN')
+                   for i in range(100)]
+
+        # Every card is dropped right below the first one, halving the same gap again and again
+        moves = []
+        below = last
+        for task in dropped:
+            moves.append({'task_id': task.pk, 'new_status': 'NS', 'prev_id': self.test_object.pk, 'next_id': below.pk})
+            below = task
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                        content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        column = list(TodoItem.objects.filter(board=self.board, status='NS').order_by('rank'))
+        self.assertEqual([task.pk for task in column],
+                         [self.test_object.pk] + [task.pk for task in reversed(dropped)] + [last.pk])
+        # SQLite does not enforce max_length, look at the keys actually written
+        max_length = TodoItem._meta.get_field('rank').max_length
+        written = [key for query in queries.captured_queries if query['sql'].startswith('UPDATE')
+                   for key in re.findall(r"'([0-9a-z]+)'", query['sql'])]
+        self.assertTrue(written)
+        self.assertLessEqual(max(len(key) for key in written), max_length)
+
+    def test_task_batch_move_view_user_not_allowed(self):
+        self.create_not_allowed_user()
+
+        moves = [{'task_id': self.test_object.pk, 'new_status': 'DN'}]
+        response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                    content_type='application/json')
+
+        self.test_object.refresh_from_db()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.test_object.status, 'NS')
+
+    def test_task_batch_move_view_invalid_status(self):
+        self.login_user()
+
+        moves = [{'task_id': self.test_object.pk, 'new_status': 'XX'}]
+        response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                    content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Invalid status "XX".')
+
+    def test_task_batch_move_view_board_archived(self):
+        self.login_user()
+        self.board.is_archived = True
+        self.board.save()
+
+        moves = [{'task_id': self.test_object.pk, 'new_status': 'DN'}]
+        response = self.client.post(reverse('task_batch_move'), data=json_dumps({'moves': moves}),
+                                    content_type='application/json')
+
+        self.test_object.refresh_from_db()
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.test_object.status, 'NS')
+
     def test_task_detail_view_user_not_allowed(self):
         self.create_not_allowed_user()
 
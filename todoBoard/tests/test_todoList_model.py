@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.db import IntegrityError
 
-from todoBoard.models import TodoList
+from todoBoard.models import TodoList, TodoItem
 from users.models import CustomUser
 
 
@@ -49,3 +49,27 @@ class TodoListModelTest(TestCase):
     def test_is_user_allowed_for_not_allowed_user(self):
         self.create_not_allowed_user()
         self.assertFalse(self.test_object.is_user_allowed(self.user))
+
+    def test_with_task_stats(self):
+        TodoItem.objects.bulk_create([
+            TodoItem(name='Foo', author=self.user, board=self.test_object),
+            TodoItem(name='Boo', author=self.user, board=self.test_object, status='BL'),
+            TodoItem(name='Woo', author=self.user, board=self.test_object, status='DN'),
+            TodoItem(name='Zoo', author=self.user, board=self.test_object, status='DN'),
+        ])
+        # Membership join must not multiply the counts
+        self.test_object.allowed_users.add(self.user)
+
+        board = TodoList.objects.filter(allowed_users=self.user).with_task_stats().get()
+
+        self.assertEqual(board.task_count, 4)
+        self.assertEqual(board.ns_count, 1)
+        self.assertEqual(board.bl_count, 1)
+        self.assertEqual(board.pr_count, 0)
+        self.assertEqual(board.dn_count, 2)
+
+    def test_bump_version(self):
+        version = self.test_object.version
+        TodoList.objects.filter(pk=self.test_object.pk).bump_version()
+        self.test_object.refresh_from_db()
+        self.assertEqual(self.test_object.version, version + 1)
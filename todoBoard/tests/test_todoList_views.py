@@ -1,8 +1,14 @@
+import re
 from json import dumps as json_dumps
+from unittest.mock import patch
 
-from django.test import TestCase, Client
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from todoBoard.models import TodoList, TodoItem
+from todoBoard.models import TodoList, TodoItem, BackgroundJob
+from todoBoard.pagination import encode_cursor
+from todoBoard.views import BoardBacklogView
 from users.models import CustomUser
 
 from django.contrib.messages import get_messages
@@ -35,9 +41,10 @@ class TodoListViewTest(TestCase):
         """
         Test that a board cannot be displayed if there is no user logged in
         """
-        response = self.client.get(reverse('board_detail', args=(self.test_object.id,)))
-        self.assertTemplateUsed(response, 'forbidden.html')
-        self.assertEqual(response.status_code, 200)
+        for url_name in ('board_detail', 'board_backlog', 'board_metrics', 'board_export'):
+            url = reverse(url_name, args=(self.test_object.id,))
+            response = self.client.get(url)
+            self.assertRedirects(response, f"{reverse('user_login')}?next={url}", fetch_redirect_response=False)
 
     def test_board_detail_user_with_permissions(self):
         """
@@ -66,6 +73,82 @@ class TodoListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'forbidden.html')
 
+    def test_board_detail_tasks_grouped_by_status(self):
+        self.login_user()
+        TodoItem.objects.create(name='Foo', author=self.user, board=self.test_object)
+        TodoItem.objects.create(name='Boo', author=self.user, board=self.test_object, status='PR',
+                                assignee=self.user)
+
+        response = self.client.get(reverse('board_detail', args=(self.test_object.id,)))
+        self.assertEqual(response.status_code, 200)
+        tasks_by_status = response.context['tasks_by_status']
+        self.assertEqual(len(tasks_by_status['NS']), 1)
+        self.assertEqual(len(tasks_by_status['PR']), 1)
+        self.assertEqual(tasks_by_status['DN'], [])
+
+    def test_board_detail_query_count_does_not_depend_on_tasks(self):
+        self.login_user()
+        url = reverse('board_detail', args=(self.test_object.id,))
+        TodoItem.objects.create(name='Foo', author=self.user, board=self.test_object, assignee=self.user)
+        self.client.get(url)  # warm up session and content types
+
+        with CaptureQueriesContext(connection) as single_task_queries:
+            self.client.get(url)
+
+        for i in range(10):
+            assignee = CustomUser.objects.create_user(username=f'assignee{i}', password=self.password)
+            TodoItem.objects.create(name=f'Task {i}', author=self.user, board=self.test_object,
+                                    status=['NS', 'BL', 'PR', 'DN'][i % 4], assignee=assignee)
+
+        with CaptureQueriesContext(connection) as many_tasks_queries:
+            self.client.get(url)
+
+        self.assertEqual(len(many_tasks_queries), len(single_task_queries))
+
+    def test_board_detail_not_modified(self):
+        self.login_user()
+        TodoItem.objects.create(name='Foo', author=self.user, board=self.test_object)
+        url = reverse('board_detail', args=(self.test_object.id,))
+
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse([query for query in queries if 'todoBoard_todoitem' in query['sql']])
+
+    def test_board_detail_modified_after_board_change(self):
+        self.login_user()
+        url = reverse('board_detail', args=(self.test_object.id,))
+        etag = self.client.get(url)['ETag']
+
+        TodoList.objects.filter(pk=self.test_object.pk).bump_version()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_board_detail_modified_after_membership_change_on_other_board(self):
+        self.login_user()
+        url = reverse('board_detail', args=(self.test_object.id,))
+        etag = self.client.get(url)['ETag']
+
+        other_user = CustomUser.objects.create_user(username='otherUser', password=self.password)
+        other_board = TodoList.objects.create(title='other_board', owner=other_user)
+        other_board.allowed_users.add(self.user)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'other_board')
+
+    def test_board_backlog_etag_depends_on_user(self):
+        self.login_user()
+        url = reverse('board_backlog', args=(self.test_object.id,))
+        etag = self.client.get(url)['ETag']
+
+        self.create_test_superuser()
+        self.login_user(is_superuser=True)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
     def test_board_detail_backlog(self):
         self.login_user()
 
@@ -73,6 +156,53 @@ class TodoListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertTemplateUsed(response, 'board_backlog.html')
 
+    def test_board_backlog_filters(self):
+        self.login_user()
+        TodoItem.objects.create(name='Urgent', author=self.user, board=self.test_object, high_priority=True,
+                                assignee=self.user)
+        TodoItem.objects.create(name='Later', author=self.user, board=self.test_object, status='BL')
+
+        url = reverse('board_backlog', args=(self.test_object.id,))
+        response = self.client.get(url, {'high_priority': 'on'})
+        self.assertEqual([task.name for task in response.context['tasks']], ['Urgent'])
+
+        response = self.client.get(url, {'status': 'BL', 'assignee': 'unassigned'})
+        self.assertEqual([task.name for task in response.context['tasks']], ['Later'])
+
+        response = self.client.get(url, {'assignee': self.user.pk})
+        self.assertEqual([task.name for task in response.context['tasks']], ['Urgent'])
+
+    def test_board_backlog_pages(self):
+        self.login_user()
+        for i in range(5):
+            TodoItem.objects.create(name=f'Task {i}', author=self.user, board=self.test_object)
+
+        with patch.object(BoardBacklogView, 'page_size', 2):
+            response = self.client.get(reverse('board_backlog', args=(self.test_object.id,)))
+            names = [task.name for task in response.context['tasks']]
+            next_page_url = response.context['next_page_url']
+            while next_page_url:
+                response = self.client.get(next_page_url)
+                self.assertEqual(response.status_code, 200)
+                names += re.findall(r'task-row-title">(Task \d)<', response.json()['html'])
+                next_page_url = response.json()['next_page_url']
+
+        self.assertEqual(names, [f'Task {i}' for i in range(5)])
+
+    def test_board_backlog_invalid_cursor(self):
+        self.login_user()
+
+        for cursor in ('foo', encode_cursor(['yesterday', 'one'])):
+            response = self.client.get(reverse('board_backlog_rows', args=(self.test_object.id,)), {'cursor': cursor})
+            self.assertEqual(response.status_code, 400)
+
+    def test_board_backlog_rows_user_not_allowed(self):
+        CustomUser.objects.create_user(username='otherUser', password=self.password)
+        self.client.login(username='otherUser', password=self.password)
+
+        response = self.client.get(reverse('board_backlog_rows', args=(self.test_object.id,)))
+        self.assertTemplateUsed(response, 'forbidden.html')
+
     def test_board_detail_archived(self):
         # Archive the board
         self.test_object.is_archived = True
@@ -98,9 +228,9 @@ class TodoListViewTest(TestCase):
         self.test_object.is_archived = True
         self.test_object.save()
 
-        response = self.client.get(reverse('board_backlog', args=(self.test_object.pk,)))
-        self.assertEqual(response.status_code, 200)
-        self.assertTemplateUsed(response, 'forbidden.html')
+        url = reverse('board_backlog', args=(self.test_object.pk,))
+        response = self.client.get(url)
+        self.assertRedirects(response, f"{reverse('user_login')}?next={url}", fetch_redirect_response=False)
 
     def test_boards_list_view_user_logged_in(self):
         self.login_user()
@@ -110,6 +240,17 @@ class TodoListViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.context['boards']), 1)
 
+    def test_boards_list_view_task_stats(self):
+        self.login_user()
+        TodoItem.objects.create(name='Foo', author=self.user, board=self.test_object)
+        TodoItem.objects.create(name='Boo', author=self.user, board=self.test_object, status='DN')
+
+        response = self.client.get(reverse('boards_list'))
+        board = response.context['boards'][0]
+        self.assertEqual(board.task_count, 2)
+        self.assertEqual(board.dn_count, 1)
+        self.assertContains(response, '50% done')
+
     def test_all_boards_view_user_is_admin(self):
         """
         Test that all boards can be displayed for superuser
@@ -326,6 +467,49 @@ class TodoListViewTest(TestCase):
         # Verify task status was changed to done upon closing the board
         self.assertEqual(task.status, 'DN')
 
+    @override_settings(BOARD_CLOSE_BACKGROUND_THRESHOLD=1)
+    def test_board_close_view_big_board_in_background(self):
+        self.login_user()
+        TodoItem.objects.create(name='Foo', description='', author=self.user, board=self.test_object)
+        TodoItem.objects.create(name='Boo', description='', author=self.user, board=self.test_object)
+
+        response = self.client.post(reverse('board_close', kwargs={'pk': self.test_object.pk}))
+
+        self.assertEqual(response.status_code, 202)
+        job = BackgroundJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual(job.total, 2)
+        self.assertEqual(response.json()['status_url'], reverse('job_status', kwargs={'pk': job.pk}))
+
+        status_response = self.client.get(response.json()['status_url'])
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.json()['status'], 'QU')
+        self.assertEqual(status_response.json()['progress'], 0)
+
+    @override_settings(BOARD_DELETE_BACKGROUND_THRESHOLD=1)
+    def test_board_delete_view_big_board_in_background(self):
+        self.login_user()
+        TodoItem.objects.create(name='Foo', description='', author=self.user, board=self.test_object)
+        TodoItem.objects.create(name='Boo', description='', author=self.user, board=self.test_object)
+
+        response = self.client.post(reverse('board_delete', kwargs={'pk': self.test_object.pk}))
+
+        self.assertEqual(response.status_code, 202)
+        job = BackgroundJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual((job.kind, job.board, job.payload), ('board.delete', None, {'board_id': self.test_object.pk}))
+        self.test_object.refresh_from_db()
+        self.assertTrue(self.test_object.is_archived)
+
+        status_response = self.client.get(response.json()['status_url'])
+        self.assertEqual(status_response.json()['status'], 'QU')
+
+    def test_job_status_view_user_not_allowed(self):
+        job = BackgroundJob.objects.create(kind='board.close', board=self.test_object, created_by=self.user)
+        CustomUser.objects.create_user(username='johnDoe', email='johnDoe@example.com', password=self.password)
+        self.client.login(username='johnDoe', password=self.password)
+
+        response = self.client.get(reverse('job_status', kwargs={'pk': job.pk}))
+        self.assertEqual(response.status_code, 403)
+
     def test_board_close_view_user_not_editor(self):
         # Create different user that is used as board owner
         self.user = CustomUser.objects.create_user(username='johnDoe',
@@ -419,3 +603,19 @@ class TodoListViewTest(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, f'/')
         self.assertFalse(self.test_object.allowed_users.filter(pk=new_user.pk).exists())
+
+    def test_board_close_view_owner_of_other_board(self):
+        """
+        Owning some board must not grant access to boards of other users
+        """
+        self.user = CustomUser.objects.create_user(username='johnDoe',
+                                                   email='johnDoe@example.com',
+                                                   password=self.password)
+        TodoList.objects.create(title='johnDoe board', owner=self.user)
+        self.client.login(username='johnDoe', password=self.password)
+
+        response = self.client.post(reverse('board_close', kwargs={'pk': f'{self.test_object.pk}'}))
+
+        self.assertTemplateUsed(response, 'forbidden.html')
+        self.test_object.refresh_from_db()
+        self.assertFalse(self.test_object.is_archived)
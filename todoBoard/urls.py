@@ -2,11 +2,12 @@ from django.urls import path
 
 # Board views
 from .views import IndexView, AllBoardsListView, UserBoardsListView, ArchivedBoardsList, BoardDetailView, \
-    BoardBacklogView, BoardCreateView, BoardUpdateView, BoardDeleteView, BoardCloseView, BoardRepoenView, \
-    BoardManageView
+    BoardBacklogView, BoardBacklogRowsView, BoardMetricsView, BoardCreateView, BoardUpdateView, BoardDeleteView, BoardCloseView, BoardRepoenView, \
+    BoardManageView, BoardCloneView, BoardImportView, BoardExportView, BoardEventsView, JobStatusView
 
 # Task views
-from .views import TaskCreateView, TaskChangeStatusView, TaskDetailView, TaskUpdateView, TaskDeleteView
+from .views import TaskCreateView, TaskChangeStatusView, TaskBatchMoveView, TaskDetailView, TaskActivityRowsView, \
+    TaskUpdateView, TaskDeleteView, TaskSearchView, MyTasksView
 
 urlpatterns = [
     path('', IndexView.as_view(), name='index'),
@@ -17,15 +18,27 @@ urlpatterns = [
     path('addBoard/', BoardCreateView.as_view(), name='board_create'),
     path('boards/<int:pk>', BoardDetailView.as_view(), name='board_detail'),
     path('boards/<int:pk>/backlog/', BoardBacklogView.as_view(), name='board_backlog'),
+    path('boards/<int:pk>/backlog/rows/', BoardBacklogRowsView.as_view(), name='board_backlog_rows'),
+    path('boards/<int:pk>/metrics/', BoardMetricsView.as_view(), name='board_metrics'),
     path('boards/<int:pk>/update', BoardUpdateView.as_view(), name='board_update'),
     path('boards/<int:pk>/delete', BoardDeleteView.as_view(), name='board_delete'),
     path('boards/<int:pk>/close', BoardCloseView.as_view(), name='board_close'),
     path('boards/<int:pk>/open', BoardRepoenView.as_view(), name='board_reopen'),
     path('boards/<int:pk>/manage', BoardManageView.as_view(), name='board_manage'),
+    path('boards/<int:pk>/clone', BoardCloneView.as_view(), name='board_clone'),
+    path('boards/<int:pk>/saveTemplate', BoardCloneView.as_view(as_template=True), name='board_save_template'),
+    path('boards/<int:pk>/import', BoardImportView.as_view(), name='board_import'),
+    path('boards/<int:pk>/export', BoardExportView.as_view(), name='board_export'),
+    path('boards/<int:pk>/events', BoardEventsView.as_view(), name='board_events'),
+    path('jobs/<int:pk>', JobStatusView.as_view(), name='job_status'),
     # Tasks
     path('boards/<int:board_id>/addTask/', TaskCreateView.as_view(), name='task_create'),
     path('task/<int:pk>/changeTaskStatus/', TaskChangeStatusView.as_view(), name='task_change_status'),
+    path('task/moveTasks/', TaskBatchMoveView.as_view(), name='task_batch_move'),
     path('task/<int:pk>', TaskDetailView.as_view(), name='task_detail'),
+    path('task/<int:pk>/activity', TaskActivityRowsView.as_view(), name='task_activity'),
     path('taskUpdate/<int:pk>', TaskUpdateView.as_view(), name='task_update'),
     path('taskDelete/<int:pk>', TaskDeleteView.as_view(), name='task_delete'),
+    path('search/', TaskSearchView.as_view(), name='task_search'),
+    path('myTasks/', MyTasksView.as_view(), name='my_tasks'),
 ]
@@ -0,0 +1,48 @@
+"""
+Cached list of boards each user can access.
+
+Every user has a version number in the cache which is part of the list's key. Changing a board
+or its members bumps the versions of affected users (see signals.py), so their next read misses.
+"""
+import time
+
+from django.core.cache import cache
+
+from .models import TodoList
+
+USER_BOARDS_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(user_id) -> str:
+    return f'user_boards_version:{user_id}'
+
+
+def version(user_id):
+    """
+    Version of the user's board list, bumped whenever the list may have changed
+    """
+    # A version lost from the cache restarts from the current time, so it never matches an older list
+    return cache.get_or_set(_version_key(user_id), time.time_ns, timeout=None)
+
+
+def accessible_boards(user) -> list:
+    """
+    Return (id, title) of boards owned by or shared with the user
+    """
+    key = f'user_boards:{user.pk}:{version(user.pk)}'
+    boards = cache.get(key)
+    if boards is None:
+        # Sorted here, ordering in SQL would stop the database from reading only the user's boards from indexes
+        boards = sorted(TodoList.objects.accessible_to(user).values_list('pk', 'title'),
+                        key=lambda board: (board[1].lower(), board[0]))
+        cache.set(key, boards, USER_BOARDS_TIMEOUT)
+    return boards
+
+
+def invalidate_user_boards(user_ids):
+    for user_id in set(user_ids):
+        try:
+            cache.incr(_version_key(user_id))
+        except ValueError:
+            # Nothing cached for this user yet
+            pass
@@ -1,25 +1,50 @@
+import asyncio
 import json
+from collections import Counter
 
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
 from django.contrib import messages
+from django.core.exceptions import BadRequest
+from django.core.handlers.asgi import ASGIRequest
 from django.db import transaction
-from django.db.models import Q
-from django.http import JsonResponse
+from django.db.models import Q, Count
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404, HttpResponseRedirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.utils.functional import cached_property
 
 # Views
-from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, View, DeleteView
+from django.views.generic import TemplateView, ListView, DetailView, CreateView, UpdateView, View, DeleteView, \
+    FormView
+from django.views.generic.detail import SingleObjectMixin
 
 # Mixins
 from django.contrib.auth.mixins import LoginRequiredMixin
-from .mixins import BoardAdminRequiredMixin, BoardEditorRequiredMixin, UserAllowedRequiredMixin
+from .mixins import BoardAdminRequiredMixin, BoardEditorRequiredMixin, BoardViewerRequiredMixin, \
+    BoardConditionalGetMixin, UserAllowedRequiredMixin, SingleObjectCacheMixin
+from .permissions import board_access
 
 # Models
-from .models import TodoList, TodoItem
+from .models import TodoList, TodoItem, TaskActivity, BackgroundJob
 from users.models import CustomUser
 
 # Forms
-from .forms import CreateTaskForm, CreateBoardForm, ManageBoardForm
+from .forms import CreateTaskForm, CreateBoardForm, CloneBoardForm, ManageBoardForm, BacklogFilterForm, TaskImportForm
+
+from . import activity, events, metrics
+from .fragments import render_task_fragments
+from .cloning import clone_board, create_board_copy
+from .exports import export_board, export_filename, CONTENT_TYPES
+from .imports import import_tasks, format_of
+from .jobs import close_board, start_close_board_job, start_clone_board_job, start_delete_board_job
+from .pagination import keyset_page
+from .ranking import rank_for_position, respace, REBALANCE_LENGTH
+from .search import search_tasks
+from .user_boards import accessible_boards
 
 
 class IndexView(TemplateView):
@@ -38,9 +63,10 @@ class AllBoardsListView(LoginRequiredMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().with_task_stats()
+        allowed_ids = board_access(self.request).accessible_board_ids(queryset)
         for board in queryset:
-            board.show_delete_button = board.show_delete_button(self.request.user)
+            board.show_delete_button = board.pk in allowed_ids
 
         return queryset
 
@@ -56,17 +82,17 @@ class UserBoardsListView(LoginRequiredMixin, ListView):
     template_name = 'boards.html'
 
     def get_queryset(self):
-        boards = super().get_queryset()
-        user = self.request.user
-        return boards.filter(Q(allowed_users__in=[user]) | Q(owner=user)).distinct()
+        board_ids = [board_id for board_id, _ in accessible_boards(self.request.user)]
+        return super().get_queryset().filter(pk__in=board_ids).with_task_stats()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         context['page_header'] = f"{user} boards: "
 
+        # Only accessible boards are listed here
         for board in context['boards']:
-            board.show_delete_button = board.show_delete_button(user)
+            board.show_delete_button = True
 
         return context
 
@@ -77,7 +103,7 @@ class ArchivedBoardsList(LoginRequiredMixin, ListView):
     template_name = 'archived_boards.html'
 
     def get_queryset(self):
-        boards = super().get_queryset()
+        boards = super().get_queryset().with_task_stats()
         user = self.request.user
 
         if user.is_superuser:
@@ -87,41 +113,105 @@ class ArchivedBoardsList(LoginRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        user = self.request.user
 
+        allowed_ids = board_access(self.request).accessible_board_ids(context['boards'])
         for board in context['boards']:
-            board.show_delete_button = board.show_delete_button(user)
+            board.show_delete_button = board.pk in allowed_ids
 
         return context
 
 
-class BoardDetailView(LoginRequiredMixin, DetailView):
+class BoardDetailView(BoardViewerRequiredMixin, BoardConditionalGetMixin, DetailView):
     model = TodoList
     context_object_name = 'board'
     template_name = 'board_detail.html'
 
-    def dispatch(self, request, *args, **kwargs):
-        response = super().dispatch(request, *args, **kwargs)
-        board = self.get_object()
-        if not board.is_user_allowed(request.user):
-            return render(request, 'forbidden.html')
-        return response
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['tasks'] = TodoItem.objects.filter(board=self.object)
+        tasks = list(TodoItem.objects.filter(board=self.object)
+                     .select_related('assignee__profile')
+                     .order_by('status', 'rank', 'pk'))
+        render_task_fragments(tasks, 'includes/task_card.html', readonly=self.object.is_archived)
+        context['tasks'] = tasks
+        context['tasks_by_status'] = TodoItem.group_by_status(tasks)
         return context
 
     def get_template_names(self):
-        board = self.get_object()
+        board = self.object
         if board.is_archived:
             return ['board_detail_archive.html']
         return [self.template_name]
 
 
-class BoardBacklogView(BoardDetailView):
-    def get_template_names(self):
-        return ['board_backlog.html']
+class BoardBacklogView(BoardViewerRequiredMixin, BoardConditionalGetMixin, DetailView):
+    model = TodoList
+    context_object_name = 'board'
+    template_name = 'board_backlog.html'
+    page_size = 50
+
+    def get_backlog_page(self):
+        filter_form = BacklogFilterForm(self.request.GET, board=self.object)
+        tasks = filter_form.filter_tasks(TodoItem.objects.filter(board=self.object).select_related('assignee__profile'))
+        try:
+            tasks, next_cursor = keyset_page(tasks, ('created_at', 'id'), self.request.GET.get('cursor'),
+                                             self.page_size)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        render_task_fragments(tasks, 'includes/task_row.html')
+        return filter_form, tasks, next_cursor
+
+    def get_next_page_url(self, next_cursor):
+        if next_cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query['cursor'] = next_cursor
+        return f"{reverse('board_backlog_rows', kwargs={'pk': self.object.pk})}?{query.urlencode()}"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        filter_form, tasks, next_cursor = self.get_backlog_page()
+        context['filter_form'] = filter_form
+        context['tasks'] = tasks
+        context['next_page_url'] = self.get_next_page_url(next_cursor)
+        return context
+
+
+class BoardMetricsView(BoardViewerRequiredMixin, DetailView):
+    """
+    Cumulative flow of the last days and cycle/lead time percentiles of a board
+    """
+    model = TodoList
+    context_object_name = 'board'
+    template_name = 'board_metrics.html'
+    flow_days = 30
+    cycle_time_days = 90
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        flow = metrics.cumulative_flow(self.object, self.flow_days)
+        stats = metrics.cycle_time_stats(self.object, self.cycle_time_days)
+        context['flow'] = flow
+        context['flow_chart'] = metrics.cumulative_flow_chart(flow)
+        context['cycle_time_days'] = self.cycle_time_days
+        context['finished_tasks'] = stats['tasks']
+        # Hours in days
+        context['cycle_times'] = [
+            (percentile, *(None if hours is None else hours / 24 for hours in (lead_time, cycle_time)))
+            for percentile, lead_time, cycle_time in zip(stats['percentiles'], stats['lead_time'],
+                                                         stats['cycle_time'])
+        ]
+        return context
+
+
+class BoardBacklogRowsView(BoardBacklogView):
+    """
+    Following backlog pages as HTML fragments, loaded incrementally by the backlog page
+    """
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        _, tasks, next_cursor = self.get_backlog_page()
+        html = render_to_string('includes/task_rows.html', {'tasks': tasks}, request=request)
+        return JsonResponse({'html': html, 'next_page_url': self.get_next_page_url(next_cursor)})
 
 
 class BoardCreateView(LoginRequiredMixin, CreateView):
@@ -165,6 +255,7 @@ class BoardUpdateView(BoardEditorRequiredMixin, View):
 
         with transaction.atomic():
             board.save()
+            TodoList.objects.filter(pk=board.pk).bump_version()
 
         return JsonResponse({'success': True, 'message': 'Board updated successfully.'})
 
@@ -174,6 +265,11 @@ class BoardManageView(BoardAdminRequiredMixin, UpdateView):
     template_name = 'manage_board.html'
     context_object_name = 'board'
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        TodoList.objects.filter(pk=self.object.pk).bump_version()
+        return response
+
     def get_success_url(self):
         return reverse_lazy('board_detail', kwargs={'pk': self.object.pk})
 
@@ -185,6 +281,19 @@ class BoardDeleteView(BoardAdminRequiredMixin, DeleteView):
         # Prevent accidental deletion through GET requests
         return HttpResponseRedirect('/')
 
+    def form_valid(self, form):
+        # Huge boards are deleted in the background
+        task_count = self.object.todoitem_set.count()
+        if task_count > settings.BOARD_DELETE_BACKGROUND_THRESHOLD:
+            job = start_delete_board_job(self.object, self.request.user, task_count)
+            return JsonResponse({
+                'success': True,
+                'message': 'Board is being deleted.',
+                'job_id': job.pk,
+                'status_url': reverse('job_status', kwargs={'pk': job.pk}),
+            }, status=202)
+        return super().form_valid(form)
+
 
 class BoardCloseView(BoardEditorRequiredMixin, View):
     model = TodoList
@@ -196,13 +305,18 @@ class BoardCloseView(BoardEditorRequiredMixin, View):
         board_id = kwargs.pop("pk", None)
         board = get_object_or_404(TodoList, pk=board_id)
 
-        # Mark all tasks as done when board is closed
-        for task in board.todoitem_set.all():
-            if task.status != "DN":
-                task.status = "DN"
-                task.save()
-        board.is_archived = True
-        board.save()
+        # Mark all tasks as done when board is closed. Huge boards are closed in the background.
+        open_tasks = board.todoitem_set.exclude(status="DN").count()
+        if open_tasks > settings.BOARD_CLOSE_BACKGROUND_THRESHOLD:
+            job = start_close_board_job(board, request.user, open_tasks)
+            return JsonResponse({
+                'success': True,
+                'message': 'Board is being closed.',
+                'job_id': job.pk,
+                'status_url': reverse('job_status', kwargs={'pk': job.pk}),
+            }, status=202)
+
+        close_board(board)
         return JsonResponse({'success': True, 'message': 'Board closed successfully.'})
 
 
@@ -214,18 +328,185 @@ class BoardRepoenView(BoardEditorRequiredMixin, View):
         board = get_object_or_404(TodoList, pk=board_id)
         board.is_archived = False
         board.save()
+        TodoList.objects.filter(pk=board_id).bump_version()
         return redirect('board_detail', pk=board_id)
 
 
+class BoardCloneView(BoardEditorRequiredMixin, FormView):
+    """
+    Copy a board with its members and tasks into a new board, or into a template when as_template is set
+    """
+    model = TodoList
+    form_class = CloneBoardForm
+    template_name = 'board_clone.html'
+    as_template = False
+
+    @cached_property
+    def board(self):
+        return get_object_or_404(TodoList, pk=self.kwargs['pk'])
+
+    def get_initial(self):
+        if self.as_template:
+            return {'title': f'{self.board.title} template', 'reset_status': True, 'clear_assignees': True}
+        if self.board.is_template:
+            return {'title': self.board.title, 'reset_status': True, 'clear_assignees': True}
+        return {'title': f'Copy of {self.board.title}'}
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['board'] = self.board
+        context['as_template'] = self.as_template
+        return context
+
+    def form_valid(self, form):
+        user = self.request.user
+        options = {
+            'reset_status': form.cleaned_data['reset_status'],
+            'clear_assignees': form.cleaned_data['clear_assignees'],
+        }
+        task_count = self.board.todoitem_set.count()
+
+        if task_count > settings.BOARD_CLONE_BACKGROUND_THRESHOLD:
+            with transaction.atomic():
+                clone = create_board_copy(self.board, user, form.cleaned_data['title'], self.as_template)
+                start_clone_board_job(self.board, clone, user, **options)
+            messages.info(self.request, f'{task_count} tasks are being copied, they will show up here shortly.')
+        else:
+            clone = clone_board(self.board, user, form.cleaned_data['title'], self.as_template, **options)
+            messages.success(self.request, 'Template has been saved.' if self.as_template else 'Board has been cloned.')
+        return redirect('board_detail', pk=clone.pk)
+
+
+class BoardImportView(BoardEditorRequiredMixin, FormView):
+    """
+    Create tasks from an uploaded CSV or JSON Lines file
+    """
+    model = TodoList
+    form_class = TaskImportForm
+    template_name = 'board_import.html'
+
+    @cached_property
+    def board(self):
+        return get_object_or_404(TodoList, pk=self.kwargs['pk'])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['board'] = self.board
+        return context
+
+    def form_valid(self, form):
+        if self.board.is_archived:
+            messages.warning(self.request, 'You cannot import tasks into archived boards.')
+            return redirect('board_detail', pk=self.board.pk)
+
+        upload = form.cleaned_data['file']
+        file_format = form.cleaned_data['file_format'] or format_of(upload.name)
+        try:
+            report = import_tasks(self.board, self.request.user, upload.file, file_format)
+        except ValueError as e:
+            form.add_error('file', str(e))
+            return self.form_invalid(form)
+
+        messages.success(self.request, f'{report.created} tasks have been imported.')
+        if not report.error_count:
+            return redirect('board_detail', pk=self.board.pk)
+        # Show which rows were skipped
+        return self.render_to_response(self.get_context_data(form=self.form_class(), report=report))
+
+
+class BoardExportView(BoardViewerRequiredMixin, SingleObjectMixin, View):
+    """
+    Download the tasks of a board as CSV, JSON Lines or a zip archive of the whole board (?format=)
+    """
+    model = TodoList
+
+    def get(self, request, *args, **kwargs):
+        board = self.get_object()
+        file_format = request.GET.get('format', 'csv')
+        if file_format not in CONTENT_TYPES:
+            raise BadRequest(f'Unknown export format "{file_format}".')
+
+        response = StreamingHttpResponse(export_board(board, file_format), content_type=CONTENT_TYPES[file_format])
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(board, file_format)}"'
+        return response
+
+
+class JobStatusView(LoginRequiredMixin, View):
+    def get(self, request, pk, *args, **kwargs):
+        job = get_object_or_404(BackgroundJob, pk=pk)
+        # Jobs of deleted boards are only visible to who started them
+        if job.created_by_id != request.user.pk and (job.board_id is None
+                                                     or not board_access(request).can_access(job.board_id)):
+            return JsonResponse({'error': 'You are not allowed to see this job.'}, status=403)
+
+        return JsonResponse({
+            'id': job.pk,
+            'kind': job.kind,
+            'status': job.status,
+            'processed': job.processed,
+            'total': job.total,
+            'progress': job.progress,
+            'attempts': job.attempts,
+            'error': job.error,
+        })
+
+
+class BoardEventsView(View):
+    """
+    Server-sent event stream of task changes on a board, applied in place by the board page.
+    Needs the ASGI application (see Procfile), a WSGI worker would be held by every open board.
+    """
+    heartbeat_interval = 25
+    # Streams are ended from time to time (the browser reconnects on its own),
+    # so a stream of a viewer that silently went away doesn't live forever
+    max_duration = 300
+
+    async def get(self, request, pk, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            # WSGI servers (e.g. runserver) would buffer the whole stream, 204 stops the browser from reconnecting
+            return HttpResponse(status=204)
+        board = await sync_to_async(get_object_or_404)(TodoList, pk=pk)
+        if not await sync_to_async(board_access(request).can_access)(board):
+            return JsonResponse({'error': 'You are not allowed to see this board.'}, status=403)
+
+        response = StreamingHttpResponse(self.stream(board.pk), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        # Stop nginx from buffering the stream
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def stream(self, board_id):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_duration
+        async with events.get_broker().subscribe(board_id) as queue:
+            yield 'retry: 5000\n\n'
+            while True:
+                timeout = min(self.heartbeat_interval, deadline - loop.time())
+                if timeout <= 0:
+                    return
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    # Comments keep proxies from closing an idle connection
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f'data: {json.dumps(event)}\n\n'
+
+
 # Task views
 class TaskCreateView(LoginRequiredMixin, CreateView):
     model = TodoItem
     form_class = CreateTaskForm
     template_name = "create_task.html"
 
+    def get_board(self):
+        if not hasattr(self, '_board'):
+            self._board = get_object_or_404(TodoList, pk=self.kwargs.get('board_id'))
+        return self._board
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['board'] = get_object_or_404(TodoList, pk=self.kwargs.get('board_id'))
+        context['board'] = self.get_board()
         return context
 
     def get_form_kwargs(self):
@@ -235,6 +516,7 @@ class TaskCreateView(LoginRequiredMixin, CreateView):
         kwargs.update({
             'init_board_id': board_id,
             'user_id': self.request.user.id,
+            'board': self.get_board(),
         })
 
         return kwargs
@@ -247,6 +529,10 @@ class TaskCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         response = super().form_valid(form)
+        TodoList.objects.filter(pk=self.object.board_id).bump_version()
+        metrics.record_transition(self.object.board_id, new_status=self.object.status)
+        events.task_saved(self.object)
+        activity.record_created(self.object, self.request.user)
         task_name = form.cleaned_data['name']
         messages.success(self.request, f'Task "{task_name}" has been created.')
         return response
@@ -259,9 +545,16 @@ class TaskChangeStatusView(UserAllowedRequiredMixin, UpdateView):
         task = self.get_object()
         new_status = request.POST.get("new_status")
         if not task.board.is_archived:
-            task.status = new_status
+            before = activity.snapshot(task, ['status'])
+            if task.status != new_status:
+                task.status = new_status
+                task.move_to_column_end()
             with transaction.atomic():
                 task.save()
+                TodoList.objects.filter(pk=task.board_id).bump_version()
+                metrics.record_transition(task.board_id, before['status'], task.status)
+            events.tasks_moved(task.board_id, [task])
+            activity.record_changes(task, request.user, before)
 
         return JsonResponse({'success': True})
 
@@ -269,28 +562,160 @@ class TaskChangeStatusView(UserAllowedRequiredMixin, UpdateView):
         return JsonResponse({'error': 'GET method is not allowed for this action'}, status=405)
 
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+class TaskBatchMoveView(LoginRequiredMixin, View):
+    """
+    Apply a queue of kanban moves in one transaction. Each move is
+    {task_id, new_status, prev_id, next_id} where prev_id/next_id are the cards
+    right above and below the drop position (optional).
+    """
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse({'error': 'GET method is not allowed for this action'}, status=405)
+
+    def post(self, request, *args, **kwargs):
+        try:
+            moves = json.loads(request.body.decode("utf-8")).get('moves')
+        except (json.JSONDecodeError, AttributeError):
+            return JsonResponse({'success': False, 'error': 'Invalid JSON format'}, status=400)
+
+        if not isinstance(moves, list) or not moves:
+            return JsonResponse({'success': False, 'error': 'No moves provided.'}, status=400)
+
+        valid_statuses = {status for status, _ in TodoItem.taskStatus}
+        parsed_moves = []
+        for move in moves:
+            try:
+                task_id = int(move['task_id'])
+                new_status = move['new_status']
+                prev_id = int(move['prev_id']) if move.get('prev_id') else None
+                next_id = int(move['next_id']) if move.get('next_id') else None
+            except (KeyError, TypeError, ValueError):
+                return JsonResponse({'success': False, 'error': 'Invalid move.'}, status=400)
+            if new_status not in valid_statuses:
+                return JsonResponse({'success': False, 'error': f'Invalid status "{new_status}".'}, status=400)
+            parsed_moves.append((task_id, new_status, prev_id, next_id))
+
+        moved_ids = {task_id for task_id, *_ in parsed_moves}
+        neighbour_ids = {task_id for move in parsed_moves for task_id in move[2:] if task_id}
+
+        with transaction.atomic():
+            tasks = {task.pk: task for task in
+                     TodoItem.objects.select_for_update().filter(pk__in=moved_ids | neighbour_ids).order_by('pk')}
+            board_ids = {tasks[task_id].board_id for task_id in moved_ids if task_id in tasks}
+            allowed_ids = board_access(request).accessible_board_ids(board_ids)
+            if not moved_ids <= tasks.keys() or allowed_ids != board_ids:
+                return JsonResponse({'success': False, 'error': "You don't have permissions to edit tasks. "
+                                                                "Please contact board administrator."}, status=403)
+
+            if TodoList.objects.filter(pk__in=board_ids, is_archived=True).exists():
+                return JsonResponse({'success': False, 'error': 'You cannot update tasks in archived boards.'},
+                                    status=400)
+
+            before = {task_id: activity.snapshot(tasks[task_id], ['status']) for task_id in moved_ids}
+            # Moves are applied in order, so a card moved earlier in the batch can be a neighbour later on
+            changed = {}
+            now = timezone.now()
+            for task_id, new_status, prev_id, next_id in parsed_moves:
+                task = tasks[task_id]
+                task.status = new_status
+                task.rank = rank_for_position(self.get_neighbour_rank(tasks, task, prev_id),
+                                              self.get_neighbour_rank(tasks, task, next_id))
+                task.updated_at = now
+                changed[task.pk] = task
+
+            # Columns whose keys grew too long are rebalanced before anything is written,
+            # so no key ever exceeds the rank column
+            crowded_columns = {(task.board_id, task.status) for task in changed.values()
+                               if len(task.rank) > REBALANCE_LENGTH}
+            rebalanced = []
+            for board_id, status in crowded_columns:
+                column = list(TodoItem.objects.filter(board_id=board_id, status=status)
+                              .exclude(pk__in=changed.keys()).only('pk', 'rank', 'board', 'status'))
+                column += [task for task in changed.values() if (task.board_id, task.status) == (board_id, status)]
+                rebalanced += [task for task in respace(column) if task.pk not in changed]
+            TodoItem.objects.bulk_update(changed.values(), ['status', 'rank', 'updated_at'])
+            TodoItem.objects.bulk_update(rebalanced, ['rank'], batch_size=1000)
+            changed.update((task.pk, task) for task in rebalanced)
+            TodoList.objects.filter(pk__in=board_ids).bump_version()
+            deltas = {board_id: Counter() for board_id in board_ids}
+            for task_id in moved_ids:
+                task = tasks[task_id]
+                deltas[task.board_id][before[task_id]['status']] -= 1
+                deltas[task.board_id][task.status] += 1
+            for board_id, board_deltas in deltas.items():
+                metrics.apply_status_deltas(board_id, board_deltas)
+
+            for board_id in board_ids:
+                events.tasks_moved(board_id, [task for task in changed.values() if task.board_id == board_id])
+            for task_id in moved_ids:
+                activity.record_changes(tasks[task_id], request.user, before[task_id])
+
+        return JsonResponse({'success': True, 'moved': len(changed)})
+
+    @staticmethod
+    def get_neighbour_rank(tasks, task, neighbour_id):
+        neighbour = tasks.get(neighbour_id)
+        # Ignore neighbours that are stale on the client side
+        if neighbour is None or neighbour.pk == task.pk or neighbour.board_id != task.board_id \
+                or neighbour.status != task.status:
+            return ''
+        return neighbour.rank
+
+
+class TaskDetailView(LoginRequiredMixin, SingleObjectCacheMixin, DetailView):
     model = TodoItem
     context_object_name = 'task'
     template_name = 'task_detail.html'
 
+    def get_queryset(self):
+        return super().get_queryset().select_related('board', 'author__profile', 'assignee__profile')
+
     def dispatch(self, request, *args, **kwargs):
-        response = super().dispatch(request, *args, **kwargs)
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
         task = self.get_object()
-        if not task.is_user_allowed(request.user):
+        if not board_access(request).can_access(task.board):
             messages.warning(self.request, f'That task does not exist or you are not allowed to see it.')
             return redirect('boards_list')
-        return response
+        return super().dispatch(request, *args, **kwargs)
+
+    activity_page_size = 20
+
+    def get_activity_page(self):
+        # Entries still waiting in the buffer would be missing from the page
+        activity.buffer.flush()
+        entries = TaskActivity.objects.filter(task=self.object).select_related('actor')
+        try:
+            entries, next_cursor = keyset_page(entries, ('created_at', 'id'), self.request.GET.get('cursor'),
+                                               self.activity_page_size, descending=True)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        next_page_url = None
+        if next_cursor is not None:
+            next_page_url = f"{reverse('task_activity', kwargs={'pk': self.object.pk})}?cursor={next_cursor}"
+        return entries, next_page_url
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        board = self.get_object().board
-        assignees = CustomUser.objects.filter(Q(allowed_boards=board) | Q(pk=board.owner.pk)).distinct()
+        board = self.object.board
+        assignees = CustomUser.objects.filter(Q(allowed_boards=board) | Q(pk=board.owner_id)).distinct()
         context['assignees'] = assignees
+        context['activity'], context['activity_next_page_url'] = self.get_activity_page()
 
         return context
 
 
+class TaskActivityRowsView(TaskDetailView):
+    """
+    Older task activity as HTML fragments, loaded incrementally by the task page
+    """
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        entries, next_page_url = self.get_activity_page()
+        html = render_to_string('includes/task_activity_rows.html', {'activity': entries}, request=request)
+        return JsonResponse({'html': html, 'next_page_url': next_page_url})
+
+
 class TaskUpdateView(UserAllowedRequiredMixin, UpdateView):
     model = TodoItem
 
@@ -312,6 +737,7 @@ class TaskUpdateView(UserAllowedRequiredMixin, UpdateView):
             body_unicode = request.body.decode("utf-8")
             json_data = json.loads(body_unicode)
             if not task.board.is_archived:
+                before = activity.snapshot(task)
                 task_name = json_data.get('taskName')
                 task_assignee = json_data.get('taskAssignee')
                 self.set_task_assignee(task, task_assignee)
@@ -322,12 +748,19 @@ class TaskUpdateView(UserAllowedRequiredMixin, UpdateView):
                 # Update task data
                 if (task.name != task_name or task.status != task_status or
                         task.description != task_description):
+                    if task.status != task_status:
+                        task.status = task_status
+                        task.move_to_column_end()
                     task.name = task_name
                     task.status = task_status
                     task.description = task_description
 
                     with transaction.atomic():
                         task.save()
+                        metrics.record_transition(task.board_id, before['status'], task.status)
+                TodoList.objects.filter(pk=task.board_id).bump_version()
+                events.task_saved(task)
+                activity.record_changes(task, request.user, before)
 
                 return JsonResponse({'success': True, 'message': 'Task updated successfully.'})
             else:
@@ -349,7 +782,73 @@ class TaskDeleteView(UserAllowedRequiredMixin, DeleteView):
         task_name = task.name
         board_id = task.board.id
 
+        task_id = task.pk
+        activity.record_deleted(task, request.user)
         task.delete()
+        TodoList.objects.filter(pk=board_id).bump_version()
+        metrics.record_transition(board_id, old_status=task.status)
+        events.task_deleted(board_id, task_id)
         messages.info(self.request, f'Task {task_name} has been deleted')
 
         return JsonResponse({'success': True, 'message': f'Task {task_name} has been deleted', 'board_id': board_id})
+
+
+class TaskSearchView(LoginRequiredMixin, ListView):
+    context_object_name = 'tasks'
+    template_name = 'search_results.html'
+    paginate_by = 25
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        if not self.query:
+            return TodoItem.objects.none()
+
+        user = self.request.user
+        tasks = TodoItem.objects.select_related('board', 'assignee__profile')
+        if not user.is_superuser:
+            tasks = tasks.filter(board__in=TodoList.objects.accessible_to(user))
+        return search_tasks(tasks, self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
+
+class MyTasksView(LoginRequiredMixin, TemplateView):
+    """
+    Tasks assigned to the current user on all active boards, one status at a time, grouped by board.
+    Counts and pages are range scans of the (assignee, status, board) index.
+    """
+    template_name = 'my_tasks.html'
+    page_size = 50
+
+    def get_tasks(self):
+        return TodoItem.objects.filter(assignee=self.request.user, board__is_archived=False)
+
+    def get_status(self, counts):
+        status = self.request.GET.get('status')
+        if status in counts:
+            return status
+        # The first column with any tasks, "Not started" for users without tasks
+        return next((code for code, count in counts.items() if count), TodoItem.taskStatus[0][0])
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        tasks = self.get_tasks()
+        counts = dict(tasks.order_by().values_list('status').annotate(Count('pk')))
+        counts = {code: counts.get(code, 0) for code, _ in TodoItem.taskStatus}
+        status = self.get_status(counts)
+
+        try:
+            page, next_cursor = keyset_page(tasks.filter(status=status).select_related('board', 'assignee__profile'),
+                                            ('board_id', 'id'), self.request.GET.get('cursor'), self.page_size)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        render_task_fragments(page, 'includes/task_row.html')
+
+        context['status'] = status
+        context['statuses'] = [(code, label, counts[code]) for code, label in TodoItem.taskStatus]
+        context['tasks'] = page
+        context['next_cursor'] = next_cursor
+        return context
@@ -0,0 +1,33 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+
+
+class AsyncStreamingMiddleware:
+    """
+    Under ASGI, Django reads a streaming response with a sync iterator into memory before sending it.
+    Board exports and static files (WhiteNoise) are such responses, their chunks are pulled one by one
+    in a thread instead, so they keep streaming in constant memory. WSGI responses are left alone.
+    Must come before WhiteNoiseMiddleware.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if isinstance(request, ASGIRequest) and response.streaming and not response.is_async:
+            response.streaming_content = iter_async(response.streaming_content)
+        return response
+
+
+async def iter_async(chunks):
+    """
+    Async iterator over a sync iterator, every chunk is read in the request's sync thread
+    """
+    chunks = iter(chunks)
+    done = object()
+    try:
+        while (chunk := await sync_to_async(next)(chunks, done)) is not done:
+            yield chunk
+    finally:
+        if hasattr(chunks, 'close'):
+            await sync_to_async(chunks.close)()
@@ -62,6 +62,8 @@ AUTHENTICATION_BACKENDS = (
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    # Streams exports and static files under ASGI, must stay above WhiteNoiseMiddleware
+    'todoPlanner.middleware.AsyncStreamingMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -83,9 +85,12 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'todoBoard.context_processors.sidebar_boards',
             ],
             'libraries': {
                 'filter': 'templatetags.custom_filters',
+                'avatars': 'templatetags.avatars',
+                'assets': 'templatetags.assets',
             }
         },
     },
@@ -101,6 +106,18 @@ DATABASES = {
     "default": env.dj_db_url("DATABASE_URL")
 }
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    # Local memory by default (development). In production point CACHE_URL at a shared backend,
+    # e.g. file:///var/tmp/todoapp_cache or redis://host:6379/0 (needs the redis package).
+    "default": env.dj_cache_url("CACHE_URL", default="locmem://default"),
+    # Rendered task cards and rows. Local memory evicts least recently used entries above MAX_ENTRIES,
+    # set FRAGMENT_CACHE_URL (e.g. redis:// or memcached://) to share the cache between processes.
+    "fragments": env.dj_cache_url("FRAGMENT_CACHE_URL", default="locmem://fragments?max_entries=20000"),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -144,7 +161,8 @@ STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),
 ]
 STATIC_ROOT = BASE_DIR / "staticfiles"
-# STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
+# Build with `python manage.py build_assets && python manage.py collectstatic`
+STATICFILES_STORAGE = "todoPlanner.storage.StaticFilesStorage"
 
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
@@ -158,11 +176,50 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = '/login/'
 
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Sessions and messages
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/#configuring-the-session-engine
+# e.g. django.contrib.sessions.backends.cached_db (reads served by CACHES["default"]) or
+# django.contrib.sessions.backends.signed_cookies (no session table at all).
+# Compare them with `python manage.py bench_requests`.
+
+SESSION_ENGINE = env.str('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
+MESSAGE_STORAGE = env.str('MESSAGE_STORAGE', default='django.contrib.messages.storage.fallback.FallbackStorage')
+
+# Mail is queued and sent by background jobs with QUEUED_EMAIL_BACKEND over a persistent connection
+# (see todoBoard.mail). `python manage.py debug_smtp` is a local stand-in for the mail relay.
+EMAIL_BACKEND = env.str('EMAIL_BACKEND', default='todoBoard.mail.QueuedEmailBackend')
+QUEUED_EMAIL_BACKEND = env.str('QUEUED_EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
 EMAIL_HOST = env.str('EMAIL_HOST')
 EMAIL_PORT = env.str('EMAIL_PORT')
 EMAIL_HOST_USER = env.str('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = env.str('EMAIL_HOST_PASSWORD')
-EMAIL_USE_TLS = True
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
+# Seconds to wait for the mail relay, a failed send is retried by the job
+EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=30)
 
 CSRF_TRUSTED_ORIGINS = ['https://*.railway.app',]
+
+# Boards with more unfinished tasks than this are closed by a background job
+BOARD_CLOSE_BACKGROUND_THRESHOLD = env.int('BOARD_CLOSE_BACKGROUND_THRESHOLD', default=2000)
+# Boards with more tasks than this are cloned by a background job
+BOARD_CLONE_BACKGROUND_THRESHOLD = env.int('BOARD_CLONE_BACKGROUND_THRESHOLD', default=10000)
+# Boards with more tasks than this are deleted by a background job
+BOARD_DELETE_BACKGROUND_THRESHOLD = env.int('BOARD_DELETE_BACKGROUND_THRESHOLD', default=2000)
+
+# Background jobs (see todoBoard.jobs) start in a thread of the web process, or with JOBS_RUN_IN_WORKER
+# wait for `python manage.py run_jobs`, which runs them in JOB_WORKER_PROCESSES processes
+JOBS_RUN_IN_WORKER = env.bool('JOBS_RUN_IN_WORKER', default=False)
+JOB_WORKER_PROCESSES = env.int('JOB_WORKER_PROCESSES', default=2)
+# Failed jobs are retried after this many seconds, twice as long after every further failure
+JOB_RETRY_DELAY = env.int('JOB_RETRY_DELAY', default=30)
+# Jobs running for longer than this many seconds are assumed lost with their worker and run again
+JOB_TIMEOUT = env.int('JOB_TIMEOUT', default=3600)
+
+# Task activity is buffered in memory and written once this many entries are waiting,
+# or the oldest of them is this many seconds old (see todoBoard.activity)
+ACTIVITY_FLUSH_SIZE = env.int('ACTIVITY_FLUSH_SIZE', default=100)
+ACTIVITY_FLUSH_INTERVAL = env.float('ACTIVITY_FLUSH_INTERVAL', default=5.0)
+
+# Live board updates. The in-process broker only reaches viewers served by the same process,
+# use todoBoard.events.PostgresBroker when running several processes or nodes.
+BOARD_EVENTS_BROKER = env.str('BOARD_EVENTS_BROKER', default='todoBoard.events.InProcessBroker')
@@ -21,6 +21,7 @@ from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/v1/', include("todoBoard.api.urls")),
     path('', include("todoBoard.urls")),
     path('', include("users.urls")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -2,6 +2,7 @@ from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
 from django import forms
 from django.utils.translation import gettext_lazy as _
 from .models import CustomUser, Profile
+from .thumbnails import generate_thumbnails
 
 
 class RegistrationForm(UserCreationForm):
@@ -25,3 +26,11 @@ class ProfileImageForm(forms.ModelForm):
         labels = {
             'avatar': _('Change avatar'),
         }
+
+    def save(self, commit=True):
+        profile = super().save(commit)
+        # Thumbnails are made from the stored file, so only once the profile is saved
+        if commit and 'avatar' in self.changed_data:
+            profile.has_thumbnails = generate_thumbnails(profile.avatar.name)
+            profile.save(update_fields=['has_thumbnails'])
+        return profile
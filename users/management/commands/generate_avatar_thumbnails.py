@@ -0,0 +1,36 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from users.models import Profile
+from users.thumbnails import generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnails of existing avatars in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Number of worker processes')
+        parser.add_argument('--all', action='store_true', help='Regenerate thumbnails which already exist')
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.all()
+        if not options['all']:
+            profiles = profiles.filter(has_thumbnails=False)
+        # Users who never uploaded an avatar share the default one, each file is processed once
+        names = sorted(set(profiles.values_list('avatar', flat=True)))
+        if not names:
+            self.stdout.write('No avatars without thumbnails')
+            return
+
+        # Workers only read and write files, they never touch the database connection they inherit
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            results = dict(zip(names, executor.map(generate_thumbnails, names, chunksize=16)))
+
+        done = [name for name, ok in results.items() if ok]
+        Profile.objects.filter(avatar__in=done).update(has_thumbnails=True)
+        self.stdout.write(f'Generated thumbnails of {len(done)} avatars')
+        failed = len(names) - len(done)
+        if failed:
+            self.stderr.write(f'{failed} avatars are missing or are not images, see the log')
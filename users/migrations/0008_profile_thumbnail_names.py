@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2026-10-18 22:40
+
+from django.db import migrations
+
+
+def reset_thumbnails(apps, schema_editor):
+    # Thumbnail names now keep the avatar's extension, the ones generated so far are no longer found.
+    # Avatars show the original until `manage.py generate_avatar_thumbnails` has run again.
+    Profile = apps.get_model('users', 'Profile')
+    Profile.objects.filter(has_thumbnails=True).update(has_thumbnails=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_profile_has_thumbnails'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_thumbnails, migrations.RunPython.noop),
+    ]
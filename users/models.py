@@ -1,6 +1,8 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
+from .thumbnails import thumbnail_name, thumbnail_size
+
 
 class CustomUser(AbstractUser):
     def __str__(self):
@@ -13,6 +15,15 @@ class CustomUser(AbstractUser):
 class Profile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='profile')
     avatar = models.ImageField(default='avatars/default.png', upload_to='avatars/')
+    has_thumbnails = models.BooleanField(default=False, editable=False)
 
     def __str__(self):
         return self.user.username
+
+    def avatar_url(self, width, extension='png'):
+        """
+        URL of the smallest avatar thumbnail covering width pixels, the original until thumbnails exist
+        """
+        if not self.has_thumbnails:
+            return self.avatar.url
+        return self.avatar.storage.url(thumbnail_name(self.avatar.name, thumbnail_size(width), extension))
@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+
+from PIL import Image
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from users.forms import ProfileImageForm
+from users.models import CustomUser
+from users.thumbnails import SIZES, thumbnail_name, thumbnail_size, generate_thumbnails
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_file(size=(300, 200), image_format='JPEG', color='yellow'):
+    content = BytesIO()
+    Image.new('RGB', size, color=color).save(content, image_format)
+    return ContentFile(content.getvalue(), name='avatar.jpg')
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class ThumbnailsTest(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username='testUser321', password='testing123456')
+        self.profile = self.user.profile
+
+    def test_thumbnail_name(self):
+        self.assertEqual(thumbnail_name('avatars/photo.jpeg', 64, 'webp'), 'avatars/thumbnails/photo_jpeg_64.webp')
+
+    def test_avatars_differing_by_extension_have_their_own_thumbnails(self):
+        jpg = default_storage.save('avatars/same.jpg', image_file())
+        png = default_storage.save('avatars/same.png', image_file(image_format='PNG', color='blue'))
+        self.assertNotEqual(thumbnail_name(jpg, 32, 'png'), thumbnail_name(png, 32, 'png'))
+
+        generate_thumbnails(jpg)
+        generate_thumbnails(png)
+        with default_storage.open(thumbnail_name(jpg, 32, 'png')) as file:
+            self.assertNotEqual(Image.open(file).convert('RGB').getpixel((16, 16)), (0, 0, 255))
+        with default_storage.open(thumbnail_name(png, 32, 'png')) as file:
+            self.assertEqual(Image.open(file).convert('RGB').getpixel((16, 16)), (0, 0, 255))
+
+    def test_thumbnail_size(self):
+        self.assertEqual(thumbnail_size(24), 32)
+        self.assertEqual(thumbnail_size(64), 64)
+        self.assertEqual(thumbnail_size(500), 128)
+
+    def test_generate_thumbnails(self):
+        name = default_storage.save('avatars/photo.jpg', image_file())
+
+        self.assertTrue(generate_thumbnails(name))
+        for size in SIZES:
+            for extension in ('webp', 'png'):
+                with default_storage.open(thumbnail_name(name, size, extension)) as file:
+                    self.assertEqual(Image.open(file).size, (size, size))
+
+    def test_generate_thumbnails_of_missing_avatar(self):
+        with self.assertLogs('users.thumbnails', 'WARNING'):
+            self.assertFalse(generate_thumbnails('avatars/missing.jpg'))
+
+    def test_form_generates_thumbnails(self):
+        form = ProfileImageForm(files={'avatar': image_file()}, instance=self.profile)
+        self.assertTrue(form.is_valid())
+        form.save()
+
+        self.profile.refresh_from_db()
+        self.assertTrue(self.profile.has_thumbnails)
+        self.assertEqual(self.profile.avatar_url(24),
+                         default_storage.url(thumbnail_name(self.profile.avatar.name, 32, 'png')))
+        self.assertTrue(default_storage.exists(thumbnail_name(self.profile.avatar.name, 128, 'webp')))
+
+    def test_avatar_url_without_thumbnails(self):
+        self.assertEqual(self.profile.avatar_url(24), self.profile.avatar.url)
+
+    def test_backfill_command(self):
+        self.profile.avatar = default_storage.save('avatars/old.jpg', image_file())
+        self.profile.save()
+        other = CustomUser.objects.create_user(username='otherUser', password='testing123456').profile
+        other.avatar = 'avatars/missing.jpg'
+        other.save()
+
+        out, err = StringIO(), StringIO()
+        call_command('generate_avatar_thumbnails', workers=1, stdout=out, stderr=err)
+
+        self.profile.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(self.profile.has_thumbnails)
+        self.assertFalse(other.has_thumbnails)
+        self.assertTrue(default_storage.exists(thumbnail_name('avatars/old.jpg', 32, 'webp')))
+        self.assertIn('avatars are missing', err.getvalue())
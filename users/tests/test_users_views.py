@@ -1,5 +1,8 @@
-from django.test import TestCase, Client
+from django.core import mail
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
+from todoBoard.jobs import run_queued_job
+from todoBoard.models import BackgroundJob
 from users.models import CustomUser, Profile
 
 from django.contrib.auth import get_user_model
@@ -181,3 +184,23 @@ class ProfileViewTest(TestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, '/')
+
+
+@override_settings(EMAIL_BACKEND='todoBoard.mail.QueuedEmailBackend',
+                   QUEUED_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class PasswordResetViewTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user('testUser321', 'test@example.com', 'testing123456')
+
+    def test_reset_mail_is_sent_by_a_job(self):
+        with self.captureOnCommitCallbacks():
+            response = self.client.post(reverse('password_reset'), {'email': 'test@example.com'})
+
+        self.assertRedirects(response, reverse('password_reset_done'))
+        self.assertEqual(len(mail.outbox), 0)
+        job = BackgroundJob.objects.get(kind='mail.send')
+        self.assertEqual(job.payload['messages'][0]['to'], ['test@example.com'])
+
+        run_queued_job(job.pk)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn('/resetPassword/', mail.outbox[0].body)
@@ -0,0 +1,65 @@
+"""
+Fixed-size avatar thumbnails.
+
+Every avatar gets square thumbnails in each of SIZES, as WebP and as PNG for browsers without WebP.
+They are stored next to the original, avatars/<name>.jpg -> avatars/thumbnails/<name>_jpg_<size>.<format>.
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+SIZES = (32, 64, 128)
+
+# File extension -> Pillow format and save options
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'png': ('PNG', {'optimize': True}),
+}
+
+
+def thumbnail_name(name, size, extension) -> str:
+    root, source_extension = posixpath.splitext(name)
+    directory, filename = posixpath.split(root)
+    # The source extension stays in the name, a.jpg and a.png must not share thumbnails
+    if source_extension:
+        filename += f'_{source_extension[1:]}'
+    return posixpath.join(directory, 'thumbnails', f'{filename}_{size}.{extension}')
+
+
+def thumbnail_size(width) -> int:
+    """
+    Return the smallest thumbnail size covering width pixels, or the largest one
+    """
+    return next((size for size in SIZES if size >= width), SIZES[-1])
+
+
+def generate_thumbnails(name) -> bool:
+    """
+    Write all thumbnails of the avatar stored under name, replacing existing ones.
+    Return False when the avatar is missing or is not an image.
+    Takes and returns plain values only, so it can run in a worker process.
+    """
+    try:
+        with default_storage.open(name) as file:
+            image = ImageOps.exif_transpose(Image.open(file))
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError):
+        logger.warning('Cannot generate thumbnails of avatar %s', name)
+        return False
+
+    image = image.convert('RGBA')
+    for size in SIZES:
+        thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        for extension, (image_format, options) in FORMATS.items():
+            content = BytesIO()
+            thumbnail.save(content, image_format, **options)
+            path = thumbnail_name(name, size, extension)
+            default_storage.delete(path)
+            default_storage.save(path, ContentFile(content.getvalue()))
+    return True
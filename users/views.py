@@ -44,7 +44,7 @@ def user_logout(request):
 @login_required
 def user_profile(request, id):
     profile = get_object_or_404(Profile, pk=id)
-    user_boards = profile.user.allowed_boards.all()
+    user_boards = profile.user.allowed_boards.with_task_stats()
 
     if request.method == 'POST':
         if request.user != profile.user: